@@ -1,12 +1,65 @@
+import asyncio
 from abc import ABC, abstractmethod
 
+from ..config import AI_CONFIG
+
 
 class AIBackend(ABC):
+    @property
+    def model_name(self) -> str:
+        """Identifies the model answering requests (part of response cache keys)."""
+        return type(self).__name__
+
+    @property
+    def endpoint(self) -> str:
+        """Where requests go; the scheduler limits concurrency per endpoint and model."""
+        return type(self).__name__
+
+    @property
+    def host_count(self) -> int:
+        """Model hosts behind the endpoint; the scheduler allows that many times the requests."""
+        return 1
+
+    def with_model(self, model):
+        """
+        This backend answering with `model` (see routing.py). The default
+        serves one model only and returns the backend itself.
+        """
+        return self
+
     @abstractmethod
     def get_chat_completion(self, messages):
         pass
 
+    async def get_chat_completion_async(self, messages, timeout=None, schema=None):
+        """
+        Non-blocking chat completion, safe to await from game coroutines.
+        The default runs the synchronous call in a worker thread; backends with
+        a native async client override this. Raises TimeoutError after
+        `timeout` seconds (default: AI_CONFIG["request_timeout"]).
+        `schema` (a JSON schema) asks for a JSON reply in that shape; backends
+        without a structured output mode ignore it (see structured.py).
+        """
+        if timeout is None:
+            timeout = AI_CONFIG["request_timeout"]
+        return await asyncio.wait_for(
+            asyncio.to_thread(self.get_chat_completion, messages), timeout
+        )
+
+    async def stream_chat_completion_async(self, messages, timeout=None):
+        """
+        Yield the reply text in fragments as the model produces them.
+        The default yields the whole reply at once; backends that can stream
+        tokens override this to cut the time to the first word.
+        """
+        response = await self.get_chat_completion_async(messages, timeout)
+        yield response["message"]["content"]
+
     @abstractmethod
     def is_available(self):
         """Check if the backend is available (API key set, service running, etc)"""
         pass
+
+    def is_known_available(self):
+        """is_available() as used to pick a backend for a new session."""
+        return self.is_available()
@@ -0,0 +1,303 @@
+"""Two-tier cache for LLM replies.
+
+Many prompts repeat across sessions: the same NPC system prompt with a common
+player line, or the same event string for an intrusive thought. Replies are
+cached under a hash of the normalized message list plus the model name, in an
+in-memory LRU (with TTL) backed by the `llm_cache` table in neoncore.db, so
+the cache survives restarts.
+
+Caching is opt-in per call site (AI_CONFIG["cache_sites"]). Each key keeps up
+to AI_CONFIG["cache_variants"] replies; until a key has that many,
+lookups miss so the model is asked again, and hits pick one of the variants at
+random so repeated lines don't feel canned.
+
+The AI service uses get_async()/put_async(): disk reads run on AsyncSQLite's
+reader threads and inserts go through the database's shared writer, so the
+event loop never waits on the game's writes.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+
+from ..config import AI_CONFIG
+from ..core.async_sqlite import AsyncSQLite
+
+# Project root, next to the DatabaseManager's default database
+DEFAULT_DB_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "neoncore.db",
+)
+
+
+def normalize_messages(messages):
+    """Reduce a message list to (role, content) pairs that ignore case and spacing."""
+    return [
+        (m.get("role", "user"), " ".join(str(m.get("content", "")).split()).casefold())
+        for m in messages
+    ]
+
+
+def cache_key(messages, model, schema=None):
+    """Stable hash of the normalized messages and the model that answers them."""
+    key = {"model": model, "messages": normalize_messages(messages)}
+    if schema is not None:
+        key["schema"] = schema  # A structured reply is a different answer
+    raw = json.dumps(key, ensure_ascii=False)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _variants(conn, key, since):
+    """The unexpired replies stored for `key`, as (response, latency, created_at) rows."""
+    return conn.execute(
+        "SELECT response, latency, created_at FROM llm_cache WHERE key = ? AND created_at >= ? ORDER BY variant",
+        (key, since),
+    ).fetchall()
+
+
+def _insert_variant(conn, key, model, text, latency, now, since):
+    # Expired rows of the key are dropped on the way (reads only skip them)
+    conn.execute("DELETE FROM llm_cache WHERE key = ? AND created_at < ?", (key, since))
+    # Next free variant number (older variants may have expired)
+    conn.execute(
+        "INSERT INTO llm_cache (key, variant, model, response, latency, created_at) "
+        "SELECT ?, COALESCE(MAX(variant) + 1, 0), ?, ?, ?, ? FROM llm_cache WHERE key = ?",
+        (key, model, text, latency, now, key),
+    )
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    memory_hits: int = 0
+    disk_hits: int = 0
+    saved_seconds: float = 0.0  # Generation time of the replies served from cache
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def snapshot(self):
+        return {**asdict(self), "hit_rate": self.hit_rate}
+
+
+class _Entry:
+    __slots__ = ("created", "variants")
+
+    def __init__(self, created, variants=None):
+        self.created = created
+        self.variants = variants or []  # [(text, latency_seconds)]
+
+
+class ResponseCache:
+    """In-memory LRU in front of a SQLite table, shared by every session."""
+
+    _shared = None
+    _lock = threading.Lock()
+
+    def __init__(
+        self,
+        db_path: str = None,
+        sites=None,
+        ttl: float = None,
+        max_entries: int = None,
+        variants: int = None,
+        clock=time.time,
+    ):
+        self.db_path = db_path or DEFAULT_DB_PATH
+        self.sites = set(AI_CONFIG["cache_sites"] if sites is None else sites)
+        self.ttl = AI_CONFIG["cache_ttl"] if ttl is None else ttl
+        self.max_entries = AI_CONFIG["cache_size"] if max_entries is None else max_entries
+        self.variants = AI_CONFIG["cache_variants"] if variants is None else variants
+        self.clock = clock
+        self.stats = CacheStats()
+        self._memory = OrderedDict()
+        self._db_lock = threading.Lock()
+        self._store = None
+        self.connection = self._connect()
+
+    @classmethod
+    def shared(cls) -> "ResponseCache":
+        """Return the process-wide cache, opening it on first use."""
+        if cls._shared is None:
+            with cls._lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    def _connect(self):
+        try:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT NOT NULL,
+                    variant INTEGER NOT NULL,
+                    model TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    latency REAL,  -- Seconds the original generation took
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (key, variant)
+                )
+            ''')
+            conn.commit()
+            return conn
+        except sqlite3.Error as e:
+            # Still useful as a memory-only cache
+            logging.error(f"LLM cache database unavailable: {e}")
+            return None
+
+    def close(self):
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+        if self._store is not None:
+            self._store.release()
+            self._store = None
+
+    def enabled_for(self, site: str) -> bool:
+        return site in self.sites
+
+    def key_for(self, backend, site, messages, schema=None):
+        """Cache key for a call, or None when `site` did not opt in."""
+        if not self.enabled_for(site):
+            return None
+        return cache_key(messages, backend.model_name, schema)
+
+    # --- Lookup / Store ---
+
+    def get(self, key):
+        """Return a cached reply for `key`, or None on a miss."""
+        now = self.clock()
+        entry = self._cached(key, now)
+        if entry is not None:
+            return self._serve(entry, "memory")
+        return self._serve(self._loaded(key, self._read(_variants, key, now - self.ttl)), "disk")
+
+    async def get_async(self, key):
+        """get() for the event loop: the disk tier is read on a worker thread."""
+        now = self.clock()
+        entry = self._cached(key, now)
+        if entry is not None:
+            return self._serve(entry, "memory")
+        return self._serve(self._loaded(key, await self._read_async(_variants, key, now - self.ttl)), "disk")
+
+    def put(self, key, model, text, latency):
+        """Store one more reply variant for `key` (ignored once the key is full)."""
+        if not text:
+            return
+        now = self.clock()
+        entry = self._cached(key, now) or self._loaded(key, self._read(_variants, key, now - self.ttl))
+        if self._add(key, entry, text, latency, now):
+            self._write(_insert_variant, key, model, text, latency, now, now - self.ttl)
+
+    async def put_async(self, key, model, text, latency):
+        """put() for the event loop: the row is written by the database's shared writer."""
+        if not text:
+            return
+        now = self.clock()
+        entry = self._cached(key, now) or self._loaded(key, await self._read_async(_variants, key, now - self.ttl))
+        if self._add(key, entry, text, latency, now):
+            await self._write_async(_insert_variant, key, model, text, latency, now, now - self.ttl)
+
+    def _cached(self, key, now):
+        entry = self._memory.get(key)
+        if entry is not None and now - entry.created > self.ttl:
+            del self._memory[key]
+            entry = None
+        if entry is not None:
+            self._memory.move_to_end(key)
+        return entry
+
+    def _loaded(self, key, rows):
+        if not rows:
+            return None
+        entry = _Entry(min(r[2] for r in rows), [(r[0], r[1]) for r in rows])
+        self._remember(key, entry)
+        return entry
+
+    def _serve(self, entry, tier):
+        # Keep asking the model until the key has its full set of variants
+        if entry is None or len(entry.variants) < self.variants:
+            self.stats.misses += 1
+            return None
+
+        text, latency = random.choice(entry.variants)
+        self.stats.hits += 1
+        self.stats.saved_seconds += latency or 0.0
+        if tier == "memory":
+            self.stats.memory_hits += 1
+        else:
+            self.stats.disk_hits += 1
+        return text
+
+    def _add(self, key, entry, text, latency, now):
+        """Add a variant in memory; False if the key already has all of them."""
+        if entry is None:
+            entry = _Entry(now)
+        if len(entry.variants) >= self.variants:
+            return False
+        entry.variants.append((text, latency))
+        self._remember(key, entry)
+        return True
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    # --- Disk tier ---
+
+    @property
+    def store(self) -> AsyncSQLite:
+        """Reader threads and the shared writer of the database (used by the *_async methods)."""
+        if self._store is None:
+            self._store = AsyncSQLite.acquire(self.db_path)
+        return self._store
+
+    def _read(self, fn, *args):
+        if self.connection is None:
+            return None
+        try:
+            with self._db_lock:
+                return fn(self.connection, *args)
+        except sqlite3.Error as e:
+            logging.error(f"LLM cache read failed: {e}")
+            return None
+
+    def _write(self, fn, *args):
+        if self.connection is None:
+            return
+        try:
+            with self._db_lock:
+                fn(self.connection, *args)
+                self.connection.commit()
+        except sqlite3.Error as e:
+            self.connection.rollback()
+            logging.error(f"LLM cache write failed: {e}")
+
+    async def _read_async(self, fn, *args):
+        if self.connection is None:
+            return None
+        try:
+            return await self.store.read(fn, *args)
+        except sqlite3.Error as e:
+            logging.error(f"LLM cache read failed: {e}")
+            return None
+
+    async def _write_async(self, fn, *args):
+        if self.connection is None:
+            return
+        try:
+            await self.store.write(fn, *args)
+        except sqlite3.Error as e:
+            logging.error(f"LLM cache write failed: {e}")
@@ -0,0 +1,150 @@
+"""Multi-turn LLM conversations with a stable prompt prefix.
+
+While a model stays loaded, Ollama keeps the evaluated prompt (KV cache) of
+recent requests and only evaluates the tokens after the longest prefix it has
+already seen. Rebuilding the prompt from scratch every turn loses that as
+soon as anything near the top changes, so every turn pays for the whole
+system prompt again.
+
+A Conversation freezes its prefix (the system prompts) when it starts and
+only ever appends: earlier turns, then the new message. Context that changes
+mid-conversation (e.g. the NPC becoming a fan) is appended as a system note
+instead of rewriting the prefix. Requests also carry `keep_alive` (see
+OllamaBackend) so the model, and with it the cache, is not unloaded between
+turns.
+
+History is bounded by a token budget (AI_CONFIG["history_budget"]). Once the
+verbatim turns exceed it, the oldest ones are folded into a running summary
+in the background and only the most recent turns stay verbatim, so prompt
+size (and latency) stays flat however long the conversation runs. The
+prompt prefix changes once per compaction, not once per turn.
+"""
+
+import asyncio
+import logging
+
+from ..config import AI_CONFIG
+
+
+def estimate_tokens(messages) -> int:
+    """Rough token count of a message list (~4 characters per token)."""
+    return sum(len(m["content"]) // 4 + 1 for m in messages)
+
+
+class Conversation:
+    def __init__(self, prefix, key=None, budget=None):
+        self.key = key  # What the conversation is with (e.g. an NPC handle)
+        self.prefix = list(prefix)
+        self.turns = []
+        self.context = {}
+        self.summary = ""  # Turns compacted out of `turns`
+        self.lore_looked_up = False  # Lore context is looked up once, on the first line
+        # Token budget for the verbatim turns; 0 keeps everything
+        self.budget = AI_CONFIG["history_budget"] if budget is None else budget
+        self._compaction = None
+
+    def update_context(self, name, content):
+        """Set context that may change between turns; appended only when it changes."""
+        if self.context.get(name, "") == (content or ""):
+            return
+        self.context[name] = content or ""
+        if content:
+            self.turns.append({"role": "system", "content": content})
+
+    def messages(self, content, role="user"):
+        """Message list for the next request: prefix, history, then the new message."""
+        summary = []
+        if self.summary:
+            summary = [{"role": "system", "content": f"Earlier in this conversation: {self.summary}"}]
+        return self.prefix + summary + self.turns + [{"role": role, "content": content}]
+
+    def record(self, content, reply, role="user"):
+        """Append a completed exchange, so the next request extends this one."""
+        self.turns.append({"role": role, "content": content})
+        self.turns.append({"role": "assistant", "content": reply})
+
+    # --- Budget ---
+
+    def history_tokens(self) -> int:
+        return estimate_tokens(self.turns)
+
+    def _split(self):
+        """Index of the first turn kept verbatim: the newest exchanges within half the budget."""
+        kept = 0
+        split = len(self.turns)
+        exchange = False  # The latest exchange is always kept
+        for i in range(len(self.turns) - 1, -1, -1):
+            if self.turns[i]["role"] == "system":
+                continue
+            kept += estimate_tokens([self.turns[i]])
+            if kept > self.budget // 2 and exchange:
+                break
+            split = i
+            exchange = exchange or self.turns[i]["role"] == "user"
+        # Never split an exchange: start the verbatim part at a user line
+        while split < len(self.turns) and self.turns[split]["role"] != "user":
+            split += 1
+        return split
+
+    def needs_compaction(self) -> bool:
+        return bool(self.budget) and self.history_tokens() > self.budget and self._split() > 0
+
+    def compact_soon(self, summarize):
+        """Start compacting in the background if the turns are over budget."""
+        if not self.needs_compaction() or (self._compaction and not self._compaction.done()):
+            return None
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+        self._compaction = loop.create_task(self.compact(summarize))
+        return self._compaction
+
+    async def compact(self, summarize):
+        """
+        Fold the oldest turns into the summary. `summarize(conversation, summary, turns)`
+        returns the new summary text. Turns recorded while it runs are kept.
+        """
+        split = self._split()
+        old = self.turns[:split]
+        dialogue = [m for m in old if m["role"] != "system"]
+        if not dialogue:
+            return
+        try:
+            summary = await summarize(self, self.summary, dialogue)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Keep the turns; the next turn tries again
+            logging.warning(f"Conversation {self.key}: summarization failed: {e}")
+            return
+        # Context notes that are still current survive the compaction
+        current = set(self.context.values())
+        carried = [m for m in old if m["role"] == "system" and m["content"] in current]
+        # Turns are only ever appended, so the first `split` are still the old ones
+        self.turns = carried + self.turns[split:]
+        self.summary = summary.strip()
+
+    def close(self):
+        if self._compaction and not self._compaction.done():
+            self._compaction.cancel()
+
+
+class DialogueStore:
+    """A session's conversations, one per (NPC, player) pair."""
+
+    def __init__(self, budget=None):
+        self.budget = budget
+        self.conversations = {}
+
+    def conversation(self, key, prefix) -> Conversation:
+        """The conversation for `key`, started with `prefix()` on first use."""
+        conversation = self.conversations.get(key)
+        if conversation is None:
+            conversation = self.conversations[key] = Conversation(prefix(), key=key, budget=self.budget)
+        return conversation
+
+    def close(self):
+        """Cancel pending summarizations (the session is over)."""
+        for conversation in self.conversations.values():
+            conversation.close()
@@ -0,0 +1,110 @@
+"""Text embeddings and a small vector index for retrieval.
+
+Prompts that carried every memory of a character grew with its age. A
+VectorIndex keeps one unit vector per text in a NumPy matrix, so picking the
+k texts most similar to a query is one matrix-vector product, whatever the
+number of texts.
+
+Embedders are pluggable: anything with a `dim` and an `embed(texts)` that
+returns an (n, dim) array will do. HashingEmbedder runs locally with no model
+(feature hashing of words and word pairs), which is enough to match memories
+that mention the same people, places and things.
+"""
+
+import hashlib
+import re
+import threading
+
+import numpy as np
+
+from ..config import AI_CONFIG
+
+# Words that say nothing about what a memory is about
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from had has have he her him his i if in into is it its "
+    "me my no not of on or our she so that the their them then there they this to was we were "
+    "what when where which who will with you your".split()
+)
+
+
+class HashingEmbedder:
+    """Bag of words and word pairs, hashed into `dim` signed buckets (no model needed)."""
+
+    def __init__(self, dim=None):
+        self.dim = dim or AI_CONFIG["embedding_dim"]
+
+    def _features(self, text):
+        words = [w for w in re.findall(r"[a-z0-9]+", text.lower()) if len(w) > 1 and w not in STOPWORDS]
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def embed(self, texts) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                # Stable across processes (hash() is salted per run)
+                h = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+                vectors[row, h % self.dim] += 1.0 if h >> 63 else -1.0
+        return vectors
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+_shared_embedder = None
+_lock = threading.Lock()
+
+
+def shared_embedder():
+    """The process-wide embedder (replace with set_embedder())."""
+    global _shared_embedder
+    if _shared_embedder is None:
+        with _lock:
+            if _shared_embedder is None:
+                _shared_embedder = HashingEmbedder()
+    return _shared_embedder
+
+
+def set_embedder(embedder):
+    """Use `embedder` for indexes created from now on."""
+    global _shared_embedder
+    _shared_embedder = embedder
+
+
+class VectorIndex:
+    """Texts and their unit vectors; rows are added in place (capacity doubles)."""
+
+    def __init__(self, embedder=None):
+        self.embedder = embedder or shared_embedder()
+        self.texts = []
+        self._vectors = np.zeros((8, self.embedder.dim), dtype=np.float32)
+
+    def __len__(self):
+        return len(self.texts)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._vectors[: len(self.texts)]
+
+    def add(self, texts):
+        texts = list(texts)
+        if not texts:
+            return
+        needed = len(self.texts) + len(texts)
+        if needed > len(self._vectors):
+            grown = np.zeros((max(needed, 2 * len(self._vectors)), self.embedder.dim), dtype=np.float32)
+            grown[: len(self.texts)] = self.vectors
+            self._vectors = grown
+        self._vectors[len(self.texts):needed] = normalize(self.embedder.embed(texts))
+        self.texts.extend(texts)
+
+    def search(self, query, k) -> list:
+        """Up to `k` (text, score) pairs most similar to `query`, best first; unrelated texts are left out."""
+        if not self.texts or k <= 0:
+            return []
+        scores = self.vectors @ normalize(self.embedder.embed([query]))[0]
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self.texts[i], float(scores[i])) for i in top if scores[i] > 0]
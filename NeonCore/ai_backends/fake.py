@@ -0,0 +1,176 @@
+"""Offline stand-in for a model server.
+
+FakeBackend answers like a real backend without a GPU or a network: load
+tests, benchmarks and CI can run the AI paths (scheduler, cache, streaming,
+deadlines, structured output) at realistic timings. Replies are canned lines,
+a template or a function of the messages. Given the same seed, the same
+prompt gets the same reply and the same delays, whatever the order of calls.
+
+Latency (AI_CONFIG["fake_latency"]):
+
+- "fixed:S": the reply after S seconds,
+- "lognormal:MEDIAN,SIGMA": time to the first token drawn from a lognormal
+  distribution (the long tail of a loaded model server),
+- "per_token:FIRST,PER_TOKEN": first token after FIRST seconds, then one
+  token every PER_TOKEN seconds (generation speed).
+
+Failure injection: a `failure_rate` share of calls fail with ConnectionError
+after their first-token delay, like a dropped connection.
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass
+
+from .base import AIBackend
+from ..config import AI_CONFIG
+
+CANNED = [
+    "Eddies first, then we talk.",
+    "Keep your voice down, choom. Walls have ears in this part of town.",
+    "I've seen worse. Not much worse, though.",
+    "You're not from around here, are you?",
+    "Preem. Now get out of my face.",
+    "The Net remembers everything. I'd rather not.",
+]
+
+
+@dataclass
+class Latency:
+    kind: str = "fixed"  # fixed, lognormal or per_token
+    first: float = 0.0  # Seconds (fixed), median (lognormal) or seconds to the first token (per_token)
+    spread: float = 0.0  # Sigma (lognormal) or seconds per further token (per_token)
+
+    @classmethod
+    def parse(cls, spec: str) -> "Latency":
+        """Parse "kind:a,b" (see the module docstring)."""
+        kind, _, params = spec.partition(":")
+        kind = kind.strip() or "fixed"
+        if kind not in ("fixed", "lognormal", "per_token"):
+            raise ValueError(f"Unknown latency distribution: {kind}")
+        values = [float(v) for v in params.split(",") if v.strip()] + [0.0, 0.0]
+        return cls(kind, values[0], values[1])
+
+    def first_token(self, rng) -> float:
+        if self.kind == "lognormal" and self.first > 0:
+            return rng.lognormvariate(math.log(self.first), self.spread)
+        return self.first
+
+    def per_token(self) -> float:
+        return self.spread if self.kind == "per_token" else 0.0
+
+
+def sample_value(schema, rng):
+    """A small value that is valid under `schema` (the subset structured.py validates)."""
+    kind = schema.get("type")
+    if kind == "object":
+        return {name: sample_value(s, rng) for name, s in schema.get("properties", {}).items()}
+    if kind == "array":
+        return []
+    if kind in ("integer", "number"):
+        low, high = schema.get("minimum", 0), schema.get("maximum", 0)
+        return rng.randint(int(low), int(max(low, high)))
+    if kind == "boolean":
+        return False
+    return rng.choice(CANNED)
+
+
+class FakeBackend(AIBackend):
+    def __init__(self, reply=None, latency=None, failure_rate=None, seed=None, model="fake"):
+        # None: a canned line; str: a template ({last} is the player's line,
+        # {n} the call number); callable: (messages) -> text
+        self.reply = reply
+        latency = AI_CONFIG["fake_latency"] if latency is None else latency
+        self.latency = Latency.parse(latency) if isinstance(latency, str) else latency
+        self.failure_rate = AI_CONFIG["fake_failure_rate"] if failure_rate is None else failure_rate
+        self.seed = AI_CONFIG["fake_seed"] if seed is None else seed
+        self.model = model
+        self.timeout = AI_CONFIG["request_timeout"]
+        self.available = True  # Set False to simulate an outage
+        self.calls = 0
+        self.failures = 0
+        self._seen = Counter()  # Prompt digest -> calls with that prompt
+
+    @property
+    def model_name(self):
+        return f"fake/{self.model}"
+
+    def is_available(self):
+        return self.available
+
+    def _plan(self, messages, schema=None):
+        """Reply text, first-token delay and whether the call fails, all decided up front."""
+        digest = hashlib.sha256(json.dumps([messages, schema], sort_keys=True).encode()).hexdigest()
+        # Keyed by prompt and its repeat count, not global call order, so
+        # concurrent callers get the same answers in any interleaving
+        rng = random.Random(f"{self.seed}:{digest}:{self._seen[digest]}")
+        self._seen[digest] += 1
+        self.calls += 1
+
+        if schema is not None:
+            text = json.dumps(sample_value(schema, rng))
+        elif callable(self.reply):
+            text = self.reply(messages)
+        elif self.reply is not None:
+            last = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+            text = self.reply.format_map({"last": last, "n": self.calls})
+        else:
+            text = rng.choice(CANNED)
+        fails = rng.random() < self.failure_rate
+        return text, self.latency.first_token(rng), fails
+
+    def _response(self, text):
+        return {
+            "model": self.model,
+            "message": {"role": "assistant", "content": text},
+            "done": True,
+            "eval_count": len(re.findall(r"\S+\s*", text)),
+        }
+
+    def _fail(self):
+        self.failures += 1
+        raise ConnectionError("Injected failure (fake backend)")
+
+    async def _sleep(self, seconds, timeout):
+        """Sleep like a request that takes `seconds`; raises TimeoutError past `timeout`."""
+        if seconds > timeout:
+            await asyncio.sleep(timeout)
+            raise asyncio.TimeoutError()
+        await asyncio.sleep(seconds)
+
+    def get_chat_completion(self, messages):
+        text, first, fails = self._plan(messages)
+        time.sleep(first)
+        if fails:
+            self._fail()
+        tokens = re.findall(r"\S+\s*", text)
+        time.sleep(self.latency.per_token() * max(0, len(tokens) - 1))
+        return self._response(text)
+
+    async def get_chat_completion_async(self, messages, timeout=None, schema=None):
+        timeout = self.timeout if timeout is None else timeout
+        text, first, fails = self._plan(messages, schema)
+        tokens = re.findall(r"\S+\s*", text)
+        total = first + self.latency.per_token() * max(0, len(tokens) - 1)
+        await self._sleep(first if fails else total, timeout)
+        if fails:
+            self._fail()
+        return self._response(text)
+
+    async def stream_chat_completion_async(self, messages, timeout=None):
+        """Yield the reply word by word; `timeout` applies to each wait, as with Ollama."""
+        timeout = self.timeout if timeout is None else timeout
+        text, first, fails = self._plan(messages)
+        await self._sleep(first, timeout)
+        if fails:
+            self._fail()
+        for i, token in enumerate(re.findall(r"\S+\s*", text)):
+            if i:
+                await self._sleep(self.latency.per_token(), timeout)
+            yield token
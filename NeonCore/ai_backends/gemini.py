@@ -1,58 +1,178 @@
+import asyncio
 import os
+import threading
+from collections import OrderedDict
+
 import google.generativeai as genai
 from .base import AIBackend
 from ..config import AI_CONFIG
 
+MODEL_NAME = "gemini-2.5-flash"
+MAX_MODELS = 32  # System instructions with a model kept (one per NPC, plus thoughts and reflections)
+MAX_CHATS = 64  # Open chat sessions per backend
+
+
+def split_messages(messages):
+    """
+    (system instruction, contents) for role-based messages. The leading system
+    messages are the instruction; system notes added later in a conversation
+    (see ai_backends/conversation.py) go in as user context, so the
+    instruction, and the model built for it, stays the same all conversation.
+    Consecutive messages of one role are merged into one content.
+    """
+    system_parts = []
+    contents = []
+    for msg in messages:
+        role = msg.get("role", "user")
+        content = msg.get("content", "")
+
+        if role == "system":
+            if not content:
+                continue
+            if not contents:
+                system_parts.append(content)
+                continue
+            content = f"[Context] {content}"
+        # Map 'assistant' to 'model' for Gemini history
+        role = "model" if role == "assistant" else "user"
+        if contents and contents[-1]["role"] == role:
+            contents[-1]["parts"].append(content)
+        else:
+            contents.append({"role": role, "parts": [content]})
+    return "\n".join(system_parts) or None, contents
+
+
+def _history_key(contents):
+    return tuple((c["role"], tuple(c["parts"])) for c in contents)
+
 
 class GeminiBackend(AIBackend):
+    # A model only holds its system instruction, so all backends share them
+    _models = OrderedDict()
+    _models_lock = threading.Lock()
+
     def __init__(self):
         self.api_key = AI_CONFIG.get("gemini_api_key")
         if self.api_key:
             genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel("gemini-2.5-flash")
+            self.model = self._model_for(None)
         else:
             self.model = None
+        # (instruction, history the chat holds) -> ChatSession, least recently used first
+        self._chats = OrderedDict()
+        self._chats_lock = threading.Lock()
+
+    @property
+    def model_name(self):
+        return f"gemini/{MODEL_NAME}"
 
     def is_available(self):
         return self.api_key is not None
 
-    def get_chat_completion(self, messages):
+    @classmethod
+    def _model_for(cls, instruction):
+        """The model for a system instruction, built on first use."""
+        with cls._models_lock:
+            model = cls._models.get(instruction)
+            if model is None:
+                model = genai.GenerativeModel(MODEL_NAME, system_instruction=instruction)
+                cls._models[instruction] = model
+                if len(cls._models) > MAX_MODELS:
+                    cls._models.popitem(last=False)
+            else:
+                cls._models.move_to_end(instruction)
+            return model
+
+    def _prepare(self, messages):
         if not self.is_available():
             raise Exception("Gemini API key not found")
+        return split_messages(messages)
 
-        # Gemini 1.5 Flash supports system instructions in the model init.
-        # We need to separate system prompt from the conversation history.
-        system_instruction = None
-        history = []
-        last_user_message = ""
-
-        # Simple robust parsing of role-based messages
-        for msg in messages:
-            role = msg.get("role", "user")
-            content = msg.get("content", "")
-
-            if role == "system":
-                system_instruction = content
-            elif role == "user":
-                last_user_message = content
-            elif role == "assistant":
-                # Map 'assistant' to 'model' for Gemini history
-                history.append({"role": "model", "parts": [content]})
+    def _take_chat(self, instruction, contents):
+        """
+        The chat session holding everything before the last message, taken out
+        of the pool while in use. A conversation's next turn finds the chat of
+        its previous one; anything else (a new conversation, a summarized
+        history, a reply that did not come from this backend) starts a chat
+        with the earlier messages as its history.
+        """
+        with self._chats_lock:
+            chat = self._chats.pop((instruction, _history_key(contents[:-1])), None)
+        if chat is None:
+            chat = self._model_for(instruction).start_chat(history=contents[:-1])
+        return chat
 
+    def _keep_chat(self, instruction, contents, reply, chat):
+        """Return a chat to the pool once it holds the reply too."""
+        key = (instruction, _history_key(contents + [{"role": "model", "parts": [reply]}]))
+        with self._chats_lock:
+            self._chats[key] = chat
+            if len(self._chats) > MAX_CHATS:
+                self._chats.popitem(last=False)
+
+    def get_chat_completion(self, messages):
+        instruction, contents = self._prepare(messages)
+        chat = self._take_chat(instruction, contents)
         try:
-            # Re-instantiate model with system instruction if present (stateless optimization)
-            model = genai.GenerativeModel(
-                "gemini-2.5-flash", system_instruction=system_instruction
-            )
+            text = chat.send_message(contents[-1]["parts"]).text
+        except Exception as e:
+            raise Exception(f"Gemini API request failed: {str(e)}")
+        self._keep_chat(instruction, contents, text, chat)
+        return {"message": {"content": text}}
+
+    async def get_chat_completion_async(self, messages, timeout=None, schema=None):
+        """Use the SDK's async transport so the event loop stays free."""
+        instruction, contents = self._prepare(messages)
+        if timeout is None:
+            timeout = AI_CONFIG["request_timeout"]
+        try:
+            if schema is not None:
+                # JSON mode constrained to the schema; one-off requests (repairs
+                # re-ask with a different schema), so no chat is kept
+                generation_config = {"response_mime_type": "application/json", "response_schema": schema}
+                response = await asyncio.wait_for(
+                    self._model_for(instruction).generate_content_async(
+                        contents, generation_config=generation_config
+                    ),
+                    timeout,
+                )
+                return {"message": {"content": response.text}}
+
+            chat = self._take_chat(instruction, contents)
+            response = await asyncio.wait_for(chat.send_message_async(contents[-1]["parts"]), timeout)
+            text = response.text
 
-            # TODO: If we want real multi-turn history, we would use start_chat(history=...)
-            # But the current game loop seems to send the full context each time?
-            # For now, we generate content based on the last message, assuming context is handled elsewhere
-            # or integrated into the system prompt.
-            # Reviewing do_talk: it sends a list with system + user. It's single turn.
+        except asyncio.TimeoutError:
+            raise
+        except Exception as e:
+            raise Exception(f"Gemini API request failed: {str(e)}")
+        self._keep_chat(instruction, contents, text, chat)
+        return {"message": {"content": text}}
 
-            response = model.generate_content(last_user_message)
-            return {"message": {"content": response.text}}
+    async def stream_chat_completion_async(self, messages, timeout=None):
+        """Stream partial text from the SDK; `timeout` bounds the wait for each chunk."""
+        instruction, contents = self._prepare(messages)
+        if timeout is None:
+            timeout = AI_CONFIG["request_timeout"]
+        chat = self._take_chat(instruction, contents)
+        parts = []
+        try:
+            response = await asyncio.wait_for(
+                chat.send_message_async(contents[-1]["parts"], stream=True), timeout
+            )
+            chunks = aiter(response)
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(anext(chunks), timeout)
+                except StopAsyncIteration:
+                    break
+                if chunk.text:
+                    parts.append(chunk.text)
+                    yield chunk.text
 
+        except asyncio.TimeoutError:
+            raise
         except Exception as e:
             raise Exception(f"Gemini API request failed: {str(e)}")
+        # Only a chat that received the whole reply is kept (not an abandoned stream)
+        self._keep_chat(instruction, contents, "".join(parts), chat)
@@ -0,0 +1,169 @@
+"""Cached health state and circuit breaker for AI backend endpoints.
+
+`is_available()` used to make a blocking HTTP round trip every time a
+session was set up. A HealthMonitor instead answers from the last known
+state and refreshes it in the background, so checking a backend costs
+nothing on the hot path.
+
+The same state works as a circuit breaker: after AI_CONFIG["breaker_threshold"]
+consecutive failures (or a failed probe) the circuit opens and requests fail
+fast for AI_CONFIG["breaker_cooldown"] seconds instead of each waiting out a
+timeout. After the cooldown one trial request is let through (half-open) and
+the others are still rejected; its outcome closes or re-opens the circuit. A
+trial that never reports back (cancelled, or failed in a way that says nothing
+about the endpoint) is given up after another cooldown.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from enum import Enum
+
+from ..config import AI_CONFIG
+
+
+class BackendUnavailable(Exception):
+    """Raised instead of sending a request while an endpoint's circuit is open."""
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"  # Healthy, requests flow
+    OPEN = "open"  # Failing, requests are rejected
+    HALF_OPEN = "half_open"  # Cooldown over, one trial request allowed
+
+
+class HealthMonitor:
+    """Health of one endpoint, shared by every backend instance that uses it."""
+
+    _monitors = {}
+    _lock = threading.Lock()
+
+    def __init__(self, endpoint, probe=None, threshold=None, cooldown=None, interval=None, clock=time.monotonic):
+        self.endpoint = endpoint
+        self.probe = probe  # async callable, raises if the endpoint is down
+        self.threshold = threshold or AI_CONFIG["breaker_threshold"]
+        self.cooldown = AI_CONFIG["breaker_cooldown"] if cooldown is None else cooldown
+        self.interval = AI_CONFIG["health_interval"] if interval is None else interval
+        self.clock = clock
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.trial_started = None  # Half-open trial request in flight
+        self.checked_at = None  # Last background probe
+        self._probe_task = None
+
+    @classmethod
+    def for_endpoint(cls, endpoint, probe=None) -> "HealthMonitor":
+        """Return the process-wide monitor for `endpoint`."""
+        with cls._lock:
+            monitor = cls._monitors.get(endpoint)
+            if monitor is None:
+                monitor = cls._monitors[endpoint] = cls(endpoint, probe)
+            elif monitor.probe is None:
+                monitor.probe = probe
+            return monitor
+
+    # --- Circuit breaker ---
+
+    def allow_request(self) -> bool:
+        if self.state is CircuitState.OPEN and self.clock() - self.opened_at >= self.cooldown:
+            self.state = CircuitState.HALF_OPEN
+        if self.state is CircuitState.HALF_OPEN:
+            if not self._trial_due():
+                return False
+            self.trial_started = self.clock()
+        return self.state is not CircuitState.OPEN
+
+    def _trial_due(self):
+        return self.trial_started is None or self.clock() - self.trial_started >= self.cooldown
+
+    def check_request(self):
+        """Raise BackendUnavailable if requests to the endpoint should not be sent."""
+        if not self.allow_request():
+            if self.state is CircuitState.HALF_OPEN:
+                raise BackendUnavailable(f"{self.endpoint} is unavailable (trial request in progress)")
+            retry_in = self.cooldown - (self.clock() - self.opened_at)
+            raise BackendUnavailable(
+                f"{self.endpoint} is unavailable (circuit open, retry in {retry_in:.0f}s)"
+            )
+
+    def record_success(self):
+        if self.state is not CircuitState.CLOSED:
+            logging.info(f"AI endpoint {self.endpoint} recovered")
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.trial_started = None
+
+    def record_failure(self, error=None):
+        self.failures += 1
+        if self.state is CircuitState.HALF_OPEN or self.failures >= self.threshold:
+            self._open(error)
+
+    def _open(self, error):
+        if self.state is not CircuitState.OPEN:
+            logging.warning(f"AI endpoint {self.endpoint} marked unavailable: {error}")
+        self.state = CircuitState.OPEN
+        self.opened_at = self.clock()
+        self.trial_started = None
+
+    # --- Cached availability ---
+
+    def is_available(self) -> bool:
+        """Last known availability; never waits on the network."""
+        self.refresh_soon()
+        return self.accepts_requests()
+
+    def is_known_available(self) -> bool:
+        """
+        Like is_available(), but only once a probe has answered and the circuit
+        is closed; used to pick a backend for a new session, which should not
+        land on an endpoint that is unknown or still owes its half-open trial.
+        """
+        self.refresh_soon()
+        return self.checked_at is not None and self.state is CircuitState.CLOSED
+
+    def accepts_requests(self) -> bool:
+        """Like is_available(), without scheduling a probe (used on every request)."""
+        if self.state is CircuitState.OPEN:
+            return self.clock() - self.opened_at >= self.cooldown
+        if self.state is CircuitState.HALF_OPEN:
+            return self._trial_due()
+        return True
+
+    def refresh_soon(self):
+        """Schedule a background probe if the cached state is stale."""
+        if self.probe is None or (self._probe_task and not self._probe_task.done()):
+            return
+        if self.checked_at is not None and self.clock() - self.checked_at < self.interval:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No event loop (e.g. a sync script): keep the cached state
+        self._probe_task = loop.create_task(self.check())
+
+    def cancel_probe(self):
+        """Stop a background probe still in flight (e.g. at server shutdown)."""
+        if self._probe_task and not self._probe_task.done():
+            self._probe_task.cancel()
+
+    async def check(self) -> bool:
+        """Probe the endpoint now and update the cached state."""
+        try:
+            await self.probe()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # A failed probe is conclusive, no need to wait for more failures
+            self.failures += 1
+            self._open(e)
+            return False
+        else:
+            self.record_success()
+            return True
+        finally:
+            self.checked_at = self.clock()
+
+    def snapshot(self):
+        return {"state": self.state.value, "failures": self.failures}
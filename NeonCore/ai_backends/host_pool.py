@@ -0,0 +1,113 @@
+"""Routing across several Ollama hosts.
+
+One GPU box caps LLM throughput for the whole server. With
+AI_CONFIG["ollama_hosts"] listing several hosts, every request is routed to
+one of them:
+
+- least outstanding requests: the host with the fewest requests in flight
+  (from every session in the process) gets the next one,
+- model affinity: a host that recently served the model has it loaded, so it
+  is preferred as long as it is at most `affinity_slack` requests busier
+  than the least loaded host (loading a model costs seconds),
+- health: each host keeps its own HealthMonitor; hosts whose circuit is open
+  are skipped, and a request that fails because its host is down is retried
+  on the next host (failover).
+
+Ties go to the host with the lower recent latency.
+"""
+
+import threading
+import time
+
+from .health import HealthMonitor
+from .http_client import AsyncHTTPClient
+from ..config import AI_CONFIG
+
+
+class Host:
+    """One Ollama server and its routing state."""
+
+    def __init__(self, url, health=None):
+        self.url = url
+        self.client = AsyncHTTPClient.shared(url)
+        self.health = health or HealthMonitor.for_endpoint(url, self.probe)
+        self.outstanding = 0
+        self.served = 0
+        self.latency = 0.0  # Moving average of request time, seconds
+        self.models = set()  # Models this host has served (likely still loaded)
+
+    async def probe(self):
+        """Round trip to /api/tags; raises if the host cannot be reached."""
+        await self.client.get("/api/tags", timeout=AI_CONFIG["health_timeout"])
+
+    def started(self):
+        self.outstanding += 1
+        return time.perf_counter()
+
+    def finished(self, started, model=None):
+        """Book a finished request; `model` is set when it succeeded."""
+        self.outstanding -= 1
+        if model is None:
+            return
+        elapsed = time.perf_counter() - started
+        self.latency = elapsed if not self.served else 0.8 * self.latency + 0.2 * elapsed
+        self.served += 1
+        self.models.add(model)
+
+    def failed(self, error):
+        """The host looks down: open its circuit sooner and forget its loaded models."""
+        self.health.record_failure(error)
+        self.models.clear()
+
+    def snapshot(self):
+        return {
+            "outstanding": self.outstanding,
+            "served": self.served,
+            "latency_seconds": round(self.latency, 4),
+            "models": sorted(self.models),
+            **self.health.snapshot(),
+        }
+
+
+class HostPool:
+    _shared = {}
+    _lock = threading.Lock()
+
+    def __init__(self, hosts, affinity_slack=1):
+        self.hosts = list(hosts)
+        self.affinity_slack = affinity_slack
+
+    @classmethod
+    def shared(cls, urls) -> "HostPool":
+        """Return the process-wide pool for `urls`, so load is counted across sessions."""
+        key = tuple(urls)
+        with cls._lock:
+            pool = cls._shared.get(key)
+            if pool is None:
+                pool = cls._shared[key] = cls([Host(url) for url in urls])
+            return pool
+
+    @property
+    def key(self) -> str:
+        return ",".join(host.url for host in self.hosts)
+
+    def is_available(self) -> bool:
+        return any(host.health.is_available() for host in self.hosts)
+
+    def is_known_available(self) -> bool:
+        return any(host.health.is_known_available() for host in self.hosts)
+
+    def choose(self, model, exclude=()):
+        """The host for the next request for `model`, or None if none is usable."""
+        candidates = [h for h in self.hosts if h not in exclude and h.health.accepts_requests()]
+        if not candidates:
+            return None
+        least = min(h.outstanding for h in candidates)
+        warm = [
+            h for h in candidates
+            if model in h.models and h.outstanding <= least + self.affinity_slack
+        ]
+        return min(warm or candidates, key=lambda h: (h.outstanding, h.latency))
+
+    def snapshot(self):
+        return {host.url: host.snapshot() for host in self.hosts}
@@ -0,0 +1,257 @@
+"""Minimal asyncio HTTP/1.1 client for the AI backends.
+
+urllib blocks the event loop, which freezes every connected player while one
+LLM request is in flight. This client only uses asyncio streams, so awaiting
+a reply yields to other sessions. Cancelling the awaiting task closes the
+socket, which aborts the request on the server side as well.
+
+Connections are kept alive and pooled per client, so consecutive requests to
+the same host skip the TCP (and TLS) handshake.
+"""
+
+import asyncio
+import json
+import ssl
+from urllib.parse import urlsplit
+
+
+class HTTPError(Exception):
+    def __init__(self, status, body=b""):
+        super().__init__(f"HTTP {status}: {body[:200]!r}")
+        self.status = status
+        self.body = body
+
+
+class HTTPResponse:
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body.decode())
+
+
+class _Connection:
+    __slots__ = ("reader", "writer", "loop")
+
+    def __init__(self, reader, writer, loop):
+        self.reader = reader
+        self.writer = writer
+        self.loop = loop
+
+    def usable(self, loop):
+        # Streams are bound to the loop that opened them
+        return self.loop is loop and not self.reader.at_eof() and not self.writer.is_closing()
+
+    def close(self):
+        try:
+            self.writer.close()
+        except RuntimeError:
+            pass  # Its event loop is already closed
+
+
+class AsyncHTTPClient:
+    """Talks HTTP/1.1 to a single base URL (e.g. an Ollama host) over pooled connections."""
+
+    _shared = {}
+
+    @classmethod
+    def shared(cls, base_url: str) -> "AsyncHTTPClient":
+        """Return the process-wide client (and connection pool) for `base_url`."""
+        client = cls._shared.get(base_url)
+        if client is None:
+            client = cls._shared[base_url] = cls(base_url)
+        return client
+
+    @classmethod
+    def close_shared(cls):
+        """Close the idle connections of every process-wide client (at shutdown)."""
+        for client in cls._shared.values():
+            client.close()
+
+    def __init__(self, base_url: str, max_idle: int = 8):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or "http"
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or (443 if self.scheme == "https" else 80)
+        self.base_path = parts.path.rstrip("/")
+        self.max_idle = max_idle
+        self._idle = []  # Keep-alive connections ready for the next request
+        self.connections_opened = 0
+
+    async def get(self, path: str, timeout: float = None) -> HTTPResponse:
+        return await self.request("GET", path, timeout=timeout)
+
+    async def post_json(self, path: str, payload, timeout: float = None) -> HTTPResponse:
+        body = json.dumps(payload).encode()
+        return await self.request(
+            "POST", path, body, {"Content-Type": "application/json"}, timeout
+        )
+
+    async def request(self, method, path, body=b"", headers=None, timeout=None):
+        """Send a request and return the full response. Raises HTTPError on non-2xx."""
+        response = await asyncio.wait_for(
+            self._request(method, path, body, headers or {}), timeout
+        )
+        if not 200 <= response.status < 300:
+            raise HTTPError(response.status, response.body)
+        return response
+
+    async def stream_json_lines(self, path: str, payload, timeout: float = None):
+        """
+        POST `payload` and yield each newline-delimited JSON object of the reply
+        as soon as it arrives (Ollama's streaming format). `timeout` bounds the
+        wait for the response head and for every following line, not the whole
+        stream, so a long generation that keeps producing tokens is not cut off.
+        """
+        body = json.dumps(payload).encode()
+        headers = {"Content-Type": "application/json"}
+        conn, status, response_headers = await asyncio.wait_for(
+            self._send("POST", path, body, headers), timeout
+        )
+        finished = False
+        try:
+            if not 200 <= status < 300:
+                raise HTTPError(status, await self._read_body(conn.reader, response_headers))
+
+            buffer = b""
+            async for data in self._iter_body(conn.reader, response_headers, timeout):
+                buffer += data
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    if line.strip():
+                        yield json.loads(line.decode())
+            if buffer.strip():
+                yield json.loads(buffer.decode())
+            finished = True
+        finally:
+            # A stream abandoned halfway leaves unread data on the socket
+            self._release(conn, finished and self._keep_alive(response_headers))
+
+    def close(self):
+        """Close the idle connections."""
+        while self._idle:
+            self._idle.pop().close()
+
+    async def _open(self):
+        ssl_context = ssl.create_default_context() if self.scheme == "https" else None
+        return await asyncio.open_connection(self.host, self.port, ssl=ssl_context)
+
+    async def _acquire(self):
+        """Return (connection, reused): an idle pooled connection or a new one."""
+        loop = asyncio.get_running_loop()
+        while self._idle:
+            conn = self._idle.pop()
+            if conn.usable(loop):
+                return conn, True
+            conn.close()
+        reader, writer = await self._open()
+        self.connections_opened += 1
+        return _Connection(reader, writer, loop), False
+
+    def _release(self, conn, reusable):
+        if reusable and len(self._idle) < self.max_idle:
+            self._idle.append(conn)
+        else:
+            conn.close()
+
+    @staticmethod
+    def _keep_alive(headers):
+        # Reusable only if the server keeps it open and the body had a known length
+        if headers.get("connection", "").lower() == "close":
+            return False
+        return (
+            headers.get("transfer-encoding", "").lower() == "chunked"
+            or "content-length" in headers
+        )
+
+    async def _send(self, method, path, body, headers):
+        """Send the request and read the response head. Returns (conn, status, headers)."""
+        while True:
+            conn, reused = await self._acquire()
+            try:
+                conn.writer.write(self._encode_request(method, path, body, headers))
+                await conn.writer.drain()
+                status, response_headers = await self._read_head(conn.reader)
+                return conn, status, response_headers
+            except (ConnectionError, asyncio.IncompleteReadError):
+                conn.close()
+                if not reused:
+                    raise
+                # The server dropped the idle connection; retry on a fresh one
+            except BaseException:
+                conn.close()
+                raise
+
+    async def _request(self, method, path, body, headers):
+        conn, status, response_headers = await self._send(method, path, body, headers)
+        try:
+            response_body = await self._read_body(conn.reader, response_headers)
+        except BaseException:
+            conn.close()
+            raise
+        self._release(conn, self._keep_alive(response_headers))
+        return HTTPResponse(status, response_headers, response_body)
+
+    def _encode_request(self, method, path, body, headers):
+        lines = [
+            f"{method} {self.base_path}{path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            f"Content-Length: {len(body)}",
+        ]
+        lines.extend(f"{k}: {v}" for k, v in headers.items())
+        return ("\r\n".join(lines) + "\r\n\r\n").encode() + body
+
+    @staticmethod
+    async def _read_head(reader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed before response")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        return status, headers
+
+    @staticmethod
+    async def _iter_body(reader, headers, timeout=None):
+        """Yield body data as it arrives, waiting at most `timeout` for each piece."""
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size_line = await asyncio.wait_for(reader.readline(), timeout)
+                size = int(size_line.split(b";")[0], 16)
+                if size == 0:
+                    await reader.readline()  # Trailing CRLF
+                    return
+                yield await asyncio.wait_for(reader.readexactly(size), timeout)
+                await reader.readline()
+        remaining = int(headers["content-length"]) if "content-length" in headers else None
+        while remaining is None or remaining > 0:
+            data = await asyncio.wait_for(
+                reader.read(65536 if remaining is None else min(remaining, 65536)), timeout
+            )
+            if not data:
+                return
+            if remaining is not None:
+                remaining -= len(data)
+            yield data
+
+    @staticmethod
+    async def _read_body(reader, headers):
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readline()  # Trailing CRLF
+                    return b"".join(chunks)
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+        if "content-length" in headers:
+            return await reader.readexactly(int(headers["content-length"]))
+        return await reader.read()
@@ -1,28 +1,167 @@
+import asyncio
+import copy
 import json
 import urllib.request
 from .base import AIBackend
+from .health import BackendUnavailable
+from .host_pool import Host, HostPool
+from .http_client import AsyncHTTPClient, HTTPError
 from ..config import AI_CONFIG
 
 
+def _is_outage(error):
+    """Errors that say the host is down or overloaded (not a bad request)."""
+    if isinstance(error, HTTPError):
+        return error.status >= 500
+    return isinstance(error, (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError))
+
+
 class OllamaBackend(AIBackend):
-    def __init__(self):
-        self.host = AI_CONFIG["ollama_host"]
-        self.model = AI_CONFIG["ollama_model"]
+    def __init__(self, host=None, model=None, health=None, hosts=None):
+        # One host, or a pool of them (AI_CONFIG["ollama_hosts"]) to balance across
+        urls = [host] if host else list(hosts or AI_CONFIG["ollama_hosts"])
+        self.host = urls[0]
+        self.model = model or AI_CONFIG["ollama_model"]
+        self.timeout = AI_CONFIG["request_timeout"]
+        self.keep_alive = AI_CONFIG["keep_alive"]
+        if health is not None:
+            # Caller-owned health state: a private pool for this one host
+            self.pool = HostPool([Host(self.host, health)])
+        else:
+            # Shared per host list, so routing sees the load of every session
+            self.pool = HostPool.shared(urls)
+        first = self.pool.hosts[0]
+        # Pooled keep-alive connections and circuit breaker of the first host
+        self.client = first.client
+        self.health = first.health
+        self._siblings = {self.model: self}
+
+    @property
+    def model_name(self):
+        return f"ollama/{self.model}"
+
+    @property
+    def endpoint(self):
+        return self.pool.key
+
+    def with_model(self, model):
+        """Same hosts (pool, health), different model (and scheduler queue)."""
+        sibling = self._siblings.get(model)
+        if sibling is None:
+            sibling = copy.copy(self)
+            sibling.model = model
+            self._siblings[model] = sibling  # The dict is shared by every sibling
+        return sibling
+
+    @property
+    def host_count(self):
+        return len(self.pool.hosts)
 
     def is_available(self):
-        try:
-            urllib.request.urlopen(f"{self.host}/api/tags")
-            return True
-        except:
-            return False
+        """Cached: never blocks. Stale state is refreshed in the background."""
+        return self.pool.is_available()
+
+    def is_known_available(self):
+        """Available for new sessions: probed, and not failing (see HealthMonitor)."""
+        return self.pool.is_known_available()
+
+    async def probe(self):
+        """Round trip to /api/tags on the first host; raises if it cannot be reached."""
+        await self.pool.hosts[0].probe()
+
+    def _payload(self, messages, stream=False, schema=None):
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "stream": stream,
+            # Keep the model, and the prompt prefix it has evaluated, loaded between turns
+            "keep_alive": self.keep_alive,
+        }
+        if schema is not None:
+            # Structured outputs: generation is constrained to the JSON schema
+            payload["format"] = schema
+        return payload
+
+    def _next_host(self, tried, error):
+        """Host for the next attempt; raises when every usable host has been tried."""
+        host = self.pool.choose(self.model, exclude=tried)
+        if host is None:
+            if error is not None:
+                raise error
+            raise BackendUnavailable(f"No Ollama host available ({self.pool.key})")
+        host.health.check_request()
+        tried.append(host)
+        return host
 
     def get_chat_completion(self, messages):
         url = f"{self.host}/api/chat"
         headers = {"Content-Type": "application/json"}
-        data = {"model": self.model, "messages": messages, "stream": False}
+        data = self._payload(messages)
 
         req = urllib.request.Request(
             url, headers=headers, data=json.dumps(data).encode()
         )
-        response = urllib.request.urlopen(req)
+        response = urllib.request.urlopen(req, timeout=self.timeout)
         return json.loads(response.read().decode())
+
+    async def get_chat_completion_async(self, messages, timeout=None, schema=None):
+        """Native asyncio request: awaiting it never blocks the event loop."""
+        tried, error = [], None
+        while True:
+            host = self._next_host(tried, error)
+            started = host.started()
+            try:
+                response = await host.client.post_json(
+                    "/api/chat",
+                    self._payload(messages, schema=schema),
+                    timeout=timeout if timeout is not None else self.timeout,
+                )
+            except Exception as e:
+                host.finished(started)
+                if not _is_outage(e):
+                    raise
+                host.failed(e)
+                error = e  # Fail over to the next host
+                continue
+            except BaseException:
+                host.finished(started)
+                raise
+            host.finished(started, self.model)
+            host.health.record_success()
+            return response.json()
+
+    async def stream_chat_completion_async(self, messages, timeout=None):
+        """Stream /api/chat: Ollama sends one JSON object per generated chunk."""
+        tried, error = [], None
+        while True:
+            host = self._next_host(tried, error)
+            started = host.started()
+            streamed = False
+            try:
+                async for chunk in host.client.stream_json_lines(
+                    "/api/chat",
+                    self._payload(messages, stream=True),
+                    timeout=timeout if timeout is not None else self.timeout,
+                ):
+                    if "error" in chunk:
+                        raise Exception(chunk["error"])
+                    content = chunk.get("message", {}).get("content")
+                    if content:
+                        streamed = True
+                        yield content
+                    # Read on past the "done" chunk so the connection ends cleanly and is reused
+            except Exception as e:
+                host.finished(started)
+                if not _is_outage(e):
+                    raise
+                host.failed(e)
+                if streamed:
+                    raise  # Part of the reply is already out; cannot switch hosts
+                error = e
+                continue
+            except BaseException:
+                host.finished(started)
+                raise
+            host.finished(started, self.model)
+            host.health.record_success()
+            return
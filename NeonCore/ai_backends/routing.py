@@ -0,0 +1,79 @@
+"""Task-aware model tiers.
+
+Every call site used to go to AI_CONFIG["ollama_model"], so a 15-word
+intrusive thought waited on (and occupied) the same 32B model as the
+reflection analysis. The router picks the model per call site:
+
+- AI_CONFIG["task_tiers"] maps a call site to a tier, AI_CONFIG["model_tiers"]
+  maps tiers (smallest first) to models,
+- AI_CONFIG["task_budgets"] gives a call site a latency budget in seconds.
+  When the expected wait for the site's tier (queue ahead of it plus the
+  model's recent latency) is over budget, the call drops to the next smaller
+  tier instead of queueing behind a busy large model.
+
+Backends with a single model (Gemini) ignore tiers: with_model() returns the
+backend itself.
+"""
+
+import logging
+
+from ..config import AI_CONFIG
+
+
+class ModelRouter:
+    def __init__(self, model_tiers=None, task_tiers=None, budgets=None, scheduler=None):
+        self.model_tiers = dict(AI_CONFIG["model_tiers"] if model_tiers is None else model_tiers)
+        self.task_tiers = dict(AI_CONFIG["task_tiers"] if task_tiers is None else task_tiers)
+        self.budgets = dict(AI_CONFIG["task_budgets"] if budgets is None else budgets)
+        self.scheduler = scheduler  # For queue depth; None disables the budget fallback
+        self.latency = {}  # model_name -> moving average of call time, seconds
+        self.fallbacks = 0
+
+    def observe(self, backend, seconds):
+        """Record how long a call to `backend` took."""
+        previous = self.latency.get(backend.model_name)
+        self.latency[backend.model_name] = seconds if previous is None else 0.8 * previous + 0.2 * seconds
+
+    def expected_seconds(self, backend):
+        """Queue wait plus recent call time for `backend`, or None if it has no history yet."""
+        latency = self.latency.get(backend.model_name)
+        if latency is None or self.scheduler is None:
+            return None
+        queue = self.scheduler.queue_for(backend)
+        # Requests that have to finish before a new one gets a slot
+        ahead = max(0, queue.in_flight + queue.queued - queue.limit + 1)
+        return ahead * latency / queue.limit + latency
+
+    def route(self, backend, site):
+        """The backend (with the model of the site's tier) to send a `site` call to."""
+        tiers = list(self.model_tiers)
+        tier = self.task_tiers.get(site, tiers[-1])
+        if tier not in self.model_tiers:
+            return backend
+        chosen = backend.with_model(self.model_tiers[tier])
+        budget = self.budgets.get(site)
+        if budget is None:
+            return chosen
+
+        level = tiers.index(tier)
+        while level > 0:
+            expected = self.expected_seconds(chosen)
+            if expected is None or expected <= budget:
+                break
+            level -= 1
+            smaller = backend.with_model(self.model_tiers[tiers[level]])
+            if smaller.model_name == chosen.model_name:
+                break  # Same model (single-model backend, or tiers sharing one): nothing to gain
+            logging.info(
+                f"{site}: {chosen.model_name} expected {expected:.1f}s > {budget:.1f}s budget, "
+                f"using {smaller.model_name}"
+            )
+            self.fallbacks += 1
+            chosen = smaller
+        return chosen
+
+    def snapshot(self):
+        return {
+            "latency_seconds": {model: round(s, 3) for model, s in self.latency.items()},
+            "fallbacks": self.fallbacks,
+        }
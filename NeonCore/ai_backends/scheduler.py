@@ -0,0 +1,167 @@
+"""Shared scheduler for LLM requests.
+
+Every session talks to the same model host. Without coordination a burst of
+passive intrusive thoughts can fill the model's queue while a player waits on
+an NPC reply. The scheduler sits in front of the backends:
+
+- at most AI_CONFIG["max_in_flight"] requests run per endpoint (and model
+  host behind it) and model at once; each model has its own queue, so a call
+  routed to a small model does not wait behind a busy large one,
+- waiting requests are served by priority class (say > reflect > thought),
+- within a class, sessions take turns (round robin), so one chatty session
+  cannot starve the others,
+- queue depth, in-flight count and queue wait are kept per endpoint and model.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from enum import IntEnum
+
+from ..config import AI_CONFIG
+from ..core.session import SessionContext
+
+
+class Priority(IntEnum):
+    SAY = 0  # A player is waiting on an NPC reply
+    REFLECT = 1  # Player-initiated, but not conversational
+    THOUGHT = 2  # Passive flavour text, can wait
+
+# Call site name -> priority class
+SITE_PRIORITY = {
+    "say": Priority.SAY,
+    "reflect": Priority.REFLECT,
+    "probe": Priority.REFLECT,  # The reflection's opening question
+    "thought": Priority.THOUGHT,
+    "greeting": Priority.THOUGHT,  # Speculative, prefetched on entering a location
+    "summary": Priority.THOUGHT,  # Background compaction of conversation history
+}
+
+
+class EndpointQueue:
+    """Slots and waiting requests for one model on one backend endpoint."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        # priority -> session id -> waiting futures; dict order is the round robin
+        self.waiting = {p: OrderedDict() for p in Priority}
+        self.max_queued = 0
+        self.dispatched = 0
+        self.wait_seconds = 0.0
+
+    @property
+    def queued(self) -> int:
+        return sum(len(w) for sessions in self.waiting.values() for w in sessions.values())
+
+    def queued_by_priority(self):
+        return {
+            p.name.lower(): sum(len(w) for w in self.waiting[p].values()) for p in Priority
+        }
+
+    async def acquire(self, priority: Priority, session_id: str):
+        start = time.perf_counter()
+        if self.in_flight < self.limit and not self.queued:
+            self.in_flight += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self.waiting[priority].setdefault(session_id, deque()).append(future)
+            self.max_queued = max(self.max_queued, self.queued)
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # Granted a slot just as we were cancelled: hand it on
+                    self.release()
+                else:
+                    self._forget(priority, session_id, future)
+                raise
+        self.dispatched += 1
+        self.wait_seconds += time.perf_counter() - start
+
+    def release(self):
+        self.in_flight -= 1
+        while self.in_flight < self.limit:
+            future = self._next_waiter()
+            if future is None:
+                break
+            self.in_flight += 1
+            future.set_result(None)
+
+    def _next_waiter(self):
+        for priority in Priority:
+            sessions = self.waiting[priority]
+            if sessions:
+                session_id, waiters = sessions.popitem(last=False)
+                future = waiters.popleft()
+                if waiters:
+                    # Back of the line until the other sessions had their turn
+                    sessions[session_id] = waiters
+                return future
+        return None
+
+    def _forget(self, priority, session_id, future):
+        waiters = self.waiting[priority].get(session_id)
+        if waiters and future in waiters:
+            waiters.remove(future)
+            if not waiters:
+                del self.waiting[priority][session_id]
+
+    def snapshot(self):
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "queued_by_priority": self.queued_by_priority(),
+            "max_queued": self.max_queued,
+            "dispatched": self.dispatched,
+            "mean_wait_seconds": self.wait_seconds / self.dispatched if self.dispatched else 0.0,
+        }
+
+
+class LLMScheduler:
+    """Process-wide gate in front of every AIBackend."""
+
+    _shared = None
+    _lock = threading.Lock()
+
+    def __init__(self, max_in_flight: int = None):
+        self.max_in_flight = max_in_flight or AI_CONFIG["max_in_flight"]
+        self.queues = {}
+
+    @classmethod
+    def shared(cls) -> "LLMScheduler":
+        if cls._shared is None:
+            with cls._lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    def queue_for(self, backend) -> EndpointQueue:
+        key = (backend.endpoint, backend.model_name)
+        if key not in self.queues:
+            # max_in_flight is per model host; a pool of hosts serves more at once
+            self.queues[key] = EndpointQueue(self.max_in_flight * backend.host_count)
+        return self.queues[key]
+
+    @asynccontextmanager
+    async def slot(self, backend, site: str, session_id: str = None):
+        """Hold one of the backend's request slots for the duration of the block."""
+        if session_id is None:
+            session = SessionContext.current()
+            session_id = session.session_id if session else ""
+        queue = self.queue_for(backend)
+        await queue.acquire(SITE_PRIORITY.get(site, Priority.THOUGHT), session_id)
+        try:
+            yield
+        finally:
+            queue.release()
+
+    def snapshot(self):
+        """Queue metrics per endpoint, then model."""
+        endpoints = {}
+        for (endpoint, model), queue in self.queues.items():
+            endpoints.setdefault(endpoint, {})[model] = queue.snapshot()
+        return endpoints
@@ -0,0 +1,178 @@
+"""Single entry point for the game's LLM calls.
+
+A call is first routed to the model tier of its call site (routing.py), then
+goes through the response cache; on a miss it waits for a slot from the shared
+scheduler and only then reaches the backend. Each call is recorded in the
+telemetry registry (telemetry.py). Any layer can be left out (None), e.g. in
+tests that want every request to hit the model.
+"""
+
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+
+from ..config import AI_CONFIG
+from .cache import ResponseCache
+from .routing import ModelRouter
+from .scheduler import LLMScheduler
+from .structured import field_errors, parse_fields, repair_prompt, subschema
+from .telemetry import CallRecord, Telemetry, token_counts
+
+
+class AIService:
+    _shared = None
+    _lock = threading.Lock()
+
+    def __init__(
+        self,
+        cache: ResponseCache = None,
+        scheduler: LLMScheduler = None,
+        router: ModelRouter = None,
+        telemetry: Telemetry = None,
+    ):
+        self.cache = cache
+        self.scheduler = scheduler
+        self.router = router
+        self.telemetry = telemetry
+
+    @classmethod
+    def shared(cls) -> "AIService":
+        """Return the process-wide service (shared cache, scheduler, router and telemetry)."""
+        if cls._shared is None:
+            with cls._lock:
+                if cls._shared is None:
+                    scheduler = LLMScheduler.shared()
+                    cls._shared = cls(
+                        ResponseCache.shared(), scheduler, ModelRouter(scheduler=scheduler), Telemetry.shared()
+                    )
+        return cls._shared
+
+    def _route(self, backend, site):
+        if self.router is None:
+            return backend
+        return self.router.route(backend, site)
+
+    def _observe(self, backend, latency):
+        if self.router is not None:
+            self.router.observe(backend, latency)
+
+    def _record(self, record: CallRecord):
+        if self.telemetry is not None:
+            self.telemetry.record(record)
+
+    def _cache_key(self, backend, site, messages, schema=None):
+        if self.cache is None:
+            return None
+        return self.cache.key_for(backend, site, messages, schema)
+
+    @asynccontextmanager
+    async def _slot(self, backend, site):
+        if self.scheduler is None:
+            yield
+        else:
+            async with self.scheduler.slot(backend, site):
+                yield
+
+    async def reply(self, backend, site: str, messages, schema=None) -> str:
+        """Return the reply text for `messages`; `site` names the call site."""
+        backend = self._route(backend, site)
+        key = self._cache_key(backend, site, messages, schema)
+        if key is not None:
+            cached = await self.cache.get_async(key)
+            if cached is not None:
+                self._record(CallRecord(site, backend.model_name, cache_hit=True))
+                return cached
+
+        queued = time.perf_counter()
+        try:
+            async with self._slot(backend, site):
+                start = time.perf_counter()
+                if schema is None:  # Keeps backends without structured output working
+                    response = await backend.get_chat_completion_async(messages)
+                else:
+                    response = await backend.get_chat_completion_async(messages, schema=schema)
+                latency = time.perf_counter() - start
+        except Exception:
+            self._record(CallRecord(site, backend.model_name, failed=True))
+            raise
+        except BaseException:
+            self._record(CallRecord(site, backend.model_name, cancelled=True))
+            raise
+        self._observe(backend, latency)
+        text = response["message"]["content"]
+        prompt_tokens, response_tokens = token_counts(messages, text, response)
+        self._record(CallRecord(
+            site, backend.model_name, start - queued, latency, latency, prompt_tokens, response_tokens
+        ))
+        if key is not None:
+            await self.cache.put_async(key, backend.model_name, text, latency)
+        return text
+
+    async def structured(self, backend, site: str, messages, schema, repairs=None) -> dict:
+        """
+        One JSON reply for `messages`, checked field by field against `schema`.
+        Fields that are missing or invalid are asked for again, alone, up to
+        `repairs` times (default AI_CONFIG["json_repairs"]). Returns the valid
+        fields; any still invalid after that are left out.
+        """
+        if repairs is None:
+            repairs = AI_CONFIG["json_repairs"]
+        text = await self.reply(backend, site, messages, schema)
+        data = parse_fields(text)
+        errors = field_errors(schema, data)
+        messages = list(messages)
+        while errors and repairs > 0:
+            repairs -= 1
+            logging.info(f"{site}: re-asking for invalid fields {sorted(errors)}")
+            messages += [
+                {"role": "assistant", "content": text},
+                {"role": "user", "content": repair_prompt(errors)},
+            ]
+            text = await self.reply(backend, site, messages, subschema(schema, errors))
+            fixed = parse_fields(text)
+            for name in list(errors):
+                if name in fixed:
+                    data[name] = fixed[name]
+            errors = field_errors(schema, data)
+        return {name: value for name, value in data.items() if name in schema["properties"] and name not in errors}
+
+    async def stream(self, backend, site: str, messages):
+        """Streaming counterpart of reply(): a cache hit is yielded as one fragment."""
+        backend = self._route(backend, site)
+        key = self._cache_key(backend, site, messages)
+        if key is not None:
+            cached = await self.cache.get_async(key)
+            if cached is not None:
+                self._record(CallRecord(site, backend.model_name, cache_hit=True))
+                yield cached
+                return
+
+        parts = []
+        first_token = None
+        queued = time.perf_counter()
+        try:
+            async with self._slot(backend, site):
+                start = time.perf_counter()
+                async for chunk in backend.stream_chat_completion_async(messages):
+                    if first_token is None:
+                        first_token = time.perf_counter() - start
+                    parts.append(chunk)
+                    yield chunk
+                latency = time.perf_counter() - start
+        except Exception:
+            self._record(CallRecord(site, backend.model_name, failed=True))
+            raise
+        except BaseException:
+            self._record(CallRecord(site, backend.model_name, cancelled=True))
+            raise
+        self._observe(backend, latency)
+        # Streams do not report token counts: estimated from the text
+        prompt_tokens, response_tokens = token_counts(messages, "".join(parts))
+        self._record(CallRecord(
+            site, backend.model_name, start - queued,
+            latency if first_token is None else first_token, latency, prompt_tokens, response_tokens,
+        ))
+        # Only complete replies are cached (an abandoned stream never gets here)
+        if key is not None:
+            await self.cache.put_async(key, backend.model_name, "".join(parts), latency)
@@ -0,0 +1,124 @@
+"""Structured (JSON) replies checked against a declared schema.
+
+Backends that support it constrain generation to the schema (Ollama's
+`format`, Gemini's `response_schema`). The reply is still checked here,
+field by field, because smaller models drift even when constrained and
+backends without a JSON mode ignore the schema altogether:
+
+- parse_fields() reads the top-level object one member at a time, so a reply
+  that is cut off or broken halfway still yields the fields before the break,
+- field_errors() validates each top-level field on its own,
+- only the fields that failed are asked for again (see repair_prompt()).
+
+The validator covers the subset of JSON Schema the game declares: type,
+properties, required, items, minimum, maximum, additionalProperties.
+"""
+
+import json
+import re
+
+_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+}
+
+# Models like to write +1 for positive integers, which is not JSON
+_PLUS_NUMBER = re.compile(r'(:\s*|\[\s*|,\s*)\+(\d)')
+
+
+def validate(schema, value, path="") -> list:
+    """Return the problems with `value` under `schema` (empty when valid)."""
+    expected = schema.get("type")
+    if expected:
+        kind = _TYPES[expected]
+        # bool is an int subclass, but true is not a valid integer
+        if not isinstance(value, kind) or (isinstance(value, bool) and expected != "boolean"):
+            return [f"{path or 'value'} should be {expected}"]
+    errors = []
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        if "minimum" in schema and value < schema["minimum"]:
+            errors.append(f"{path} should be >= {schema['minimum']}")
+        if "maximum" in schema and value > schema["maximum"]:
+            errors.append(f"{path} should be <= {schema['maximum']}")
+    if isinstance(value, list) and "items" in schema:
+        for i, item in enumerate(value):
+            errors.extend(validate(schema["items"], item, f"{path}[{i}]"))
+    if isinstance(value, dict):
+        properties = schema.get("properties", {})
+        for name in schema.get("required", []):
+            if name not in value:
+                errors.append(f"{path}.{name} is missing".lstrip("."))
+        for name, item in value.items():
+            if name in properties:
+                errors.extend(validate(properties[name], item, f"{path}.{name}".lstrip(".")))
+            elif schema.get("additionalProperties") is False:
+                errors.append(f"{path}.{name} is not allowed".lstrip("."))
+    return errors
+
+
+def field_errors(schema, data) -> dict:
+    """Problems per top-level field of `schema`; fields missing from `data` included."""
+    errors = {}
+    for name, field_schema in schema["properties"].items():
+        if name not in data:
+            errors[name] = "missing"
+            continue
+        problems = validate(field_schema, data[name], name)
+        if problems:
+            errors[name] = "; ".join(problems)
+    return errors
+
+
+def parse_fields(text) -> dict:
+    """
+    Decode the top-level JSON object in `text` member by member. Returns every
+    member decoded before the first syntax error (all of them for valid JSON).
+    """
+    start = text.find("{")
+    if start < 0:
+        return {}
+    text = _PLUS_NUMBER.sub(r"\1\2", text[start:])
+    decoder = json.JSONDecoder()
+    fields = {}
+    pos = 1
+    while True:
+        pos = _skip(text, pos, ",")
+        if pos >= len(text) or text[pos] == "}":
+            return fields
+        try:
+            name, pos = decoder.raw_decode(text, pos)
+            pos = _skip(text, pos)
+            if not isinstance(name, str) or text[pos:pos + 1] != ":":
+                return fields
+            value, pos = decoder.raw_decode(text, _skip(text, pos + 1))
+        except (json.JSONDecodeError, IndexError):
+            return fields
+        fields[name] = value
+
+
+def _skip(text, pos, also=""):
+    while pos < len(text) and (text[pos].isspace() or text[pos] in also):
+        pos += 1
+    return pos
+
+
+def subschema(schema, names) -> dict:
+    """The object schema restricted to the fields `names`."""
+    return {
+        "type": "object",
+        "properties": {n: schema["properties"][n] for n in names},
+        "required": list(names),
+    }
+
+
+def repair_prompt(errors) -> str:
+    """Ask again for just the fields in `errors` (name -> problem)."""
+    problems = "; ".join(f"'{name}': {problem}" for name, problem in errors.items())
+    return (
+        f"Some fields of your JSON were missing or invalid: {problems}. "
+        f"Return ONLY a JSON object with just these keys: {', '.join(errors)}."
+    )
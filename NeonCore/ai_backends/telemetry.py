@@ -0,0 +1,184 @@
+"""Per-call telemetry for LLM requests.
+
+Every call that goes through AIService is recorded with its call site, model,
+queue wait, time to first token, total latency, prompt and response tokens
+and whether the response cache answered it. Records are folded into
+histograms per (site, model), so the registry stays the same size however
+many calls are made, and the last few records are kept as they were.
+
+The registry is read by the server's /stats endpoint and the dev_stats command.
+"""
+
+import bisect
+import math
+import threading
+from collections import deque
+from dataclasses import asdict, dataclass
+
+from .conversation import estimate_tokens
+
+# Bucket upper bounds in seconds: 5 ms to ~2 minutes, each 1.5x the previous
+SECONDS_BUCKETS = tuple(0.005 * 1.5 ** i for i in range(26))
+
+
+@dataclass
+class CallRecord:
+    site: str
+    model: str
+    queue_wait: float = 0.0
+    first_token: float = 0.0  # Seconds to the first fragment (the whole reply if not streamed)
+    latency: float = 0.0  # Seconds from the slot being granted to the last fragment
+    prompt_tokens: int = 0
+    response_tokens: int = 0
+    cache_hit: bool = False
+    failed: bool = False
+    cancelled: bool = False  # Given up by the caller (deadline, disconnect, abandoned stream)
+
+
+def token_counts(messages, text, response=None):
+    """(prompt, response) tokens: as reported by the backend, else estimated."""
+    response = response or {}
+    prompt = response.get("prompt_eval_count") or estimate_tokens(messages)
+    reply = response.get("eval_count") or len(text) // 4 + 1
+    return prompt, reply
+
+
+class Histogram:
+    """Counts of values per bucket, with the exact count, sum, min and max."""
+
+    def __init__(self, bounds=SECONDS_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # The last bucket holds values above every bound
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q) -> float:
+        """Upper bound of the bucket holding the q-quantile (never above the largest value)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                bound = self.bounds[i] if i < len(self.bounds) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+        }
+
+
+class SiteStats:
+    """Everything recorded for one (call site, model)."""
+
+    def __init__(self):
+        self.calls = 0
+        self.cache_hits = 0
+        self.failures = 0
+        self.cancelled = 0
+        self.prompt_tokens = 0
+        self.response_tokens = 0
+        self.queue_wait = Histogram()
+        self.first_token = Histogram()
+        self.latency = Histogram()
+
+    def add(self, record: CallRecord):
+        self.calls += 1
+        if record.failed:
+            self.failures += 1
+            return
+        if record.cancelled:
+            self.cancelled += 1
+            return
+        if record.cache_hit:
+            # Answered without the model: no queue, no tokens, nothing to time
+            self.cache_hits += 1
+            return
+        self.prompt_tokens += record.prompt_tokens
+        self.response_tokens += record.response_tokens
+        self.queue_wait.add(record.queue_wait)
+        self.first_token.add(record.first_token)
+        self.latency.add(record.latency)
+
+    def snapshot(self):
+        return {
+            "calls": self.calls,
+            "cache_hits": self.cache_hits,
+            "failures": self.failures,
+            "cancelled": self.cancelled,
+            "prompt_tokens": self.prompt_tokens,
+            "response_tokens": self.response_tokens,
+            "queue_wait": self.queue_wait.snapshot(),
+            "first_token": self.first_token.snapshot(),
+            "latency": self.latency.snapshot(),
+        }
+
+
+class Telemetry:
+    """Process-wide registry of LLM call statistics."""
+
+    _shared = None
+    _lock = threading.Lock()
+
+    def __init__(self, recent: int = 50):
+        self.sites = {}  # (site, model) -> SiteStats
+        self.recent = deque(maxlen=recent)
+        self._records_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "Telemetry":
+        if cls._shared is None:
+            with cls._lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    def record(self, record: CallRecord):
+        with self._records_lock:
+            self.sites.setdefault((record.site, record.model), SiteStats()).add(record)
+            self.recent.append(record)
+
+    def snapshot(self):
+        """Statistics per call site and model, plus the most recent calls."""
+        with self._records_lock:
+            return {
+                "sites": [
+                    {"site": site, "model": model, **stats.snapshot()}
+                    for (site, model), stats in sorted(self.sites.items())
+                ],
+                "recent": [asdict(r) for r in self.recent],
+            }
+
+    def report(self) -> list:
+        """One text line per call site and model, heaviest token users first."""
+        rows = sorted(
+            self.snapshot()["sites"], key=lambda s: s["prompt_tokens"] + s["response_tokens"], reverse=True
+        )
+        lines = []
+        for s in rows:
+            lines.append(
+                f"{s['site']:<8} {s['model']:<20} calls {s['calls']:>5}  hits {s['cache_hits']:>4}  "
+                f"fail {s['failures']:>3}  cxl {s['cancelled']:>3}  tokens {s['prompt_tokens']:>7}+{s['response_tokens']:<6}  "
+                f"wait p50 {s['queue_wait']['p50']:.2f}s  "
+                f"ttft p50/p95 {s['first_token']['p50']:.2f}/{s['first_token']['p95']:.2f}s  "
+                f"total p50/p95 {s['latency']['p50']:.2f}/{s['latency']['p95']:.2f}s"
+            )
+        return lines
@@ -3,10 +3,102 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+
+def _pairs(value, convert=str):
+    """Parse "key=value,key=value" (env var syntax for small mappings)."""
+    pairs = (item.split("=", 1) for item in value.split(",") if "=" in item)
+    return {k.strip(): convert(v.strip()) for k, v in pairs}
+
+
 # Read directly from environment or use defaults
 AI_CONFIG = {
     "default_backend": "ollama",
+    # Force a backend (gemini, ollama, fake); unset picks the first available one
+    "backend": os.environ.get("AI_BACKEND"),
     "gemini_api_key": os.environ.get("GEMINI_API_KEY"),
     "ollama_host": os.environ.get("OLLAMA_HOST", "http://localhost:11434"),
+    # Several Ollama hosts (comma separated) to balance requests across; defaults to OLLAMA_HOST
+    "ollama_hosts": [
+        h.strip()
+        for h in os.environ.get("OLLAMA_HOSTS", os.environ.get("OLLAMA_HOST", "http://localhost:11434")).split(",")
+        if h.strip()
+    ],
     "ollama_model": os.environ.get("OLLAMA_MODEL", "qwen3:32b"),  # Configurable model
+    # Model tiers, smallest first; the small tier defaults to the main model
+    "model_tiers": {
+        "small": os.environ.get("OLLAMA_SMALL_MODEL", os.environ.get("OLLAMA_MODEL", "qwen3:32b")),
+        "large": os.environ.get("OLLAMA_MODEL", "qwen3:32b"),
+    },
+    # Tier per call site: short passive lines go to the small model, analysis to the large one
+    "task_tiers": {
+        "thought": "small",
+        "summary": "small",
+        "say": "large",
+        "greeting": "large",  # Same model as the conversation it opens (and warms its prompt cache)
+        "probe": "large",  # Same model as the reflection analysis, which extends its prompt
+        "reflect": "large",
+        **_pairs(os.environ.get("AI_TASK_TIERS", "")),
+    },
+    # Seconds a call site may expect to wait (queue + generation) before it
+    # drops to the next smaller tier
+    "task_budgets": {
+        "say": 8.0,
+        "thought": 10.0,
+        **_pairs(os.environ.get("AI_TASK_BUDGETS", ""), float),
+    },
+    # Seconds before an LLM request is abandoned (keeps a stuck model from hanging a player)
+    "request_timeout": float(os.environ.get("AI_TIMEOUT", "60")),
+    # Seconds to the first words of an NPC reply before a pre-generated line is used instead
+    "say_deadline": float(os.environ.get("AI_SAY_DEADLINE", "5")),
+    # How long Ollama keeps the model (and its prompt cache) loaded after a request
+    "keep_alive": os.environ.get("AI_KEEP_ALIVE", "30m"),
+    # Token budget for the verbatim turns of an NPC conversation; older turns are summarized
+    "history_budget": int(os.environ.get("AI_HISTORY_BUDGET", "1024")),
+    # Intrusive thoughts: min seconds between two for one player, max seconds
+    # a thought may take before it is too late to show
+    "thought_interval": float(os.environ.get("AI_THOUGHT_INTERVAL", "30")),
+    "thought_max_age": float(os.environ.get("AI_THOUGHT_MAX_AGE", "20")),
+    # Seconds an NPC greeting prefetched on entering a location stays usable
+    "greeting_ttl": float(os.environ.get("AI_GREETING_TTL", "120")),
+    # Memories of a character given to a prompt (the most related ones), and
+    # the size of the vectors they are indexed by
+    "memory_top_k": int(os.environ.get("AI_MEMORY_TOP_K", "3")),
+    "embedding_dim": int(os.environ.get("AI_EMBEDDING_DIM", "512")),
+    # Lore passages given to an NPC prompt, and where the lore index is stored (.npy + .json)
+    "lore_top_k": int(os.environ.get("AI_LORE_TOP_K", "2")),
+    "lore_index": os.environ.get(
+        "AI_LORE_INDEX", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "lore_index")
+    ),
+    # Times a structured (JSON) reply is re-asked for its invalid fields
+    "json_repairs": int(os.environ.get("AI_JSON_REPAIRS", "1")),
+    # Offline fake backend (see ai_backends/fake.py): latency distribution,
+    # share of calls that fail, seed for replies and delays
+    "fake_latency": os.environ.get("AI_FAKE_LATENCY", "fixed:0"),
+    "fake_failure_rate": float(os.environ.get("AI_FAKE_FAILURE_RATE", "0")),
+    "fake_seed": int(os.environ.get("AI_FAKE_SEED", "0")),
+    # Backend health: failures before the circuit opens, seconds it stays open,
+    # seconds between background health probes, probe timeout
+    "breaker_threshold": int(os.environ.get("AI_BREAKER_THRESHOLD", "3")),
+    "breaker_cooldown": float(os.environ.get("AI_BREAKER_COOLDOWN", "30")),
+    "health_interval": float(os.environ.get("AI_HEALTH_INTERVAL", "30")),
+    "health_timeout": float(os.environ.get("AI_HEALTH_TIMEOUT", "2")),
+    # Concurrent requests per model endpoint; the rest wait in the scheduler's queue
+    "max_in_flight": int(os.environ.get("AI_MAX_IN_FLIGHT", "2")),
+    # Response cache: call sites (say, thought, reflect) allowed to reuse replies
+    "cache_sites": [s for s in os.environ.get("AI_CACHE_SITES", "say,thought").split(",") if s],
+    "cache_ttl": float(os.environ.get("AI_CACHE_TTL", "86400")),  # Seconds
+    "cache_size": int(os.environ.get("AI_CACHE_SIZE", "1024")),  # In-memory entries
+    "cache_variants": int(os.environ.get("AI_CACHE_VARIANTS", "3")),  # Replies kept per prompt
+}
+
+# Game database (see core/async_sqlite.py)
+DB_CONFIG = {
+    # Worker threads (each with its own connection) serving reads off the event loop
+    "readers": int(os.environ.get("DB_READERS", "4")),
+    # Seconds a connection waits for a lock held by another connection
+    "busy_timeout": float(os.environ.get("DB_BUSY_TIMEOUT", "5")),
+    # Item moves held in the location cache before they are written (see managers/location_cache.py)
+    "writeback_max": int(os.environ.get("DB_WRITEBACK_MAX", "32")),
+    # Seconds an item move may wait to be written
+    "writeback_delay": float(os.environ.get("DB_WRITEBACK_DELAY", "5")),
 }
@@ -0,0 +1,243 @@
+"""Asyncio access to a SQLite database.
+
+DatabaseManager ran every query on one sqlite3 connection on the event loop
+thread, so a slow disk (an fsync on commit, a cold page) stalled every
+session, not just the one that asked. AsyncSQLite keeps the loop free:
+
+- the database is in WAL mode, so readers and the writer do not block each other,
+- reads run on a small pool of worker threads, each with its own connection,
+- writes are queued to one writer coroutine per database file; it applies
+  everything queued so far, on its own thread and connection, in one
+  transaction, so concurrent saves share a commit (and its fsync).
+
+Each write runs in its own savepoint: a failing write is rolled back alone and
+its caller gets the exception. Closing the store commits what is still queued
+before the connections go. Queries are plain functions of a connection
+(`fn(conn, *args)`) and must not commit themselves.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ..config import DB_CONFIG
+
+
+def connect(db_path, autocommit=False):
+    """A connection in WAL mode; `autocommit` leaves transactions to the caller."""
+    conn = sqlite3.connect(
+        db_path,
+        timeout=DB_CONFIG["busy_timeout"],
+        isolation_level=None if autocommit else "",
+        check_same_thread=False,  # Used by one thread, but closed from another
+    )
+    conn.row_factory = sqlite3.Row  # Access columns by name
+    conn.execute("PRAGMA journal_mode=WAL")
+    # In WAL mode, commits are durable once the WAL is checkpointed; a crash
+    # loses at most the last commits, never the database
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class AsyncSQLite:
+    """Reader threads and one writer for a database file, shared by every session using it."""
+
+    _stores = {}  # db_path -> AsyncSQLite
+    _lock = threading.Lock()
+
+    def __init__(self, db_path, readers=None):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        self._readers = ThreadPoolExecutor(readers or DB_CONFIG["readers"], thread_name_prefix="sqlite-read")
+        self._writer_thread = ThreadPoolExecutor(1, thread_name_prefix="sqlite-write")
+        self._loop = None
+        self._queue = None
+        self._writer = None
+        self._in_flight = None  # (batch, concurrent future) being applied by the writer thread
+        self.users = 0
+        self.writes = 0
+        self.commits = 0
+
+    @classmethod
+    def acquire(cls, db_path) -> "AsyncSQLite":
+        """The store for `db_path`; release() it when done."""
+        with cls._lock:
+            store = cls._stores.get(db_path)
+            if store is None:
+                store = cls._stores[db_path] = cls(db_path)
+            store.users += 1
+            return store
+
+    async def release_async(self):
+        """release() from the event loop: what is queued is committed first, without blocking it."""
+        await self.flush()
+        self.release()
+
+    def release(self):
+        """One user less; the last one closes the store."""
+        with AsyncSQLite._lock:
+            self.users -= 1
+            if self.users > 0:
+                return
+            if AsyncSQLite._stores.get(self.db_path) is self:
+                del AsyncSQLite._stores[self.db_path]
+        self.close()
+
+    def _connection(self, autocommit=False):
+        """This thread's connection (opened on first use)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.db_path, autocommit)
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    # --- Reads ---
+
+    def _read(self, fn, args):
+        return fn(self._connection(), *args)
+
+    async def read(self, fn, *args):
+        """`fn(conn, *args)` on a reader thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._readers, self._read, fn, args)
+
+    # --- Writes ---
+
+    async def write(self, fn, *args):
+        """Queue `fn(conn, *args)` for the writer; returns its result once committed."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue_for(loop).put_nowait((fn, args, future))
+        return await future
+
+    async def flush(self):
+        """Wait until the writes queued so far (from this event loop) are committed."""
+        if self._writer is None or self._writer.done() or self._loop is not asyncio.get_running_loop():
+            return
+        await self._queue.join()
+
+    def _queue_for(self, loop):
+        if self._loop is not loop or self._writer.done():
+            # First write, or from a new event loop (the old writer went with its loop)
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._writer = loop.create_task(self._drain(self._queue))
+        return self._queue
+
+    async def _drain(self, queue):
+        while True:
+            batch = [await queue.get()]
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            applying = self._writer_thread.submit(self._apply, batch)
+            self._in_flight = (batch, applying)
+            try:
+                results = await asyncio.wrap_future(applying)
+            except Exception as e:
+                # The commit itself failed: none of the batch is stored
+                logging.error(f"SQLite write to {self.db_path} failed: {e}")
+                results = [(False, e)] * len(batch)
+            self._in_flight = None
+            self._deliver(batch, results)
+            for _ in batch:
+                queue.task_done()
+
+    def _deliver(self, batch, results):
+        for (_, _, future), (ok, value) in zip(batch, results):
+            if future.done():
+                continue  # The caller stopped waiting; the write is stored anyway
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def _apply(self, batch):
+        """Run the batch in one transaction, each write in its own savepoint."""
+        conn = self._connection(autocommit=True)
+        results = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for fn, args, _ in batch:
+                conn.execute("SAVEPOINT write")
+                try:
+                    value = fn(conn, *args)
+                except Exception as e:
+                    conn.execute("ROLLBACK TO write")
+                    results.append((False, e))
+                else:
+                    results.append((True, value))
+                conn.execute("RELEASE write")
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        self.writes += len(batch)
+        self.commits += 1
+        return results
+
+    def close(self):
+        """Commit what is still queued, stop the writer and close every connection."""
+        writer, loop = self._writer, self._loop
+        if writer is not None and not writer.done():
+            if loop.is_running() and not _running_in(loop):
+                # The writer empties its queue on its own loop
+                asyncio.run_coroutine_threadsafe(self._stop(), loop).result()
+            else:
+                # On the writer's loop (which cannot wait for it here), or the loop is gone
+                try:
+                    writer.cancel()
+                except RuntimeError:
+                    pass  # Its loop is already closed
+                self._apply_queued()
+        self._readers.shutdown(wait=True)
+        self._writer_thread.shutdown(wait=True)
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
+    async def _stop(self):
+        await self._queue.join()
+        self._writer.cancel()
+
+    def _apply_queued(self):
+        """Finish the writer's work on this thread: the batch it was applying, then the queue."""
+        pending = []
+        if self._in_flight is not None:
+            batch, applying = self._in_flight
+            self._in_flight = None
+            if applying.cancelled():
+                pending = batch  # Never started
+            else:
+                try:
+                    results = applying.result()
+                except Exception as e:
+                    results = [(False, e)] * len(batch)
+                self._deliver_if_open(batch, results)
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        if not pending:
+            return
+        try:
+            results = self._writer_thread.submit(self._apply, pending).result()
+        except Exception as e:
+            logging.error(f"SQLite write to {self.db_path} failed: {e}")
+            results = [(False, e)] * len(pending)
+        self._deliver_if_open(pending, results)
+
+    def _deliver_if_open(self, batch, results):
+        if not self._loop.is_closed():  # Otherwise nobody is waiting any more
+            self._deliver(batch, results)
+
+
+def _running_in(loop):
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
@@ -0,0 +1,147 @@
+"""Process-wide registry of the static game content.
+
+The character/NPC JSON files, their ASCII art and the location table are
+parsed once and shared by every session. Sessions get copy-on-write views:
+the large immutable parts (art, descriptions, exits) are shared by reference,
+only the small mutable parts of a record are copied when a session needs them.
+"""
+
+import json
+import logging
+import threading
+from collections.abc import Mapping, MutableMapping
+from pathlib import Path
+from types import MappingProxyType
+
+ASSETS_DIR = Path(__file__).parent.parent / "character_assets"
+
+
+def freeze(value):
+    """Recursively convert dicts/lists into read-only mappings/tuples."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value):
+    """Return a private, mutable copy of a frozen value (strings are shared)."""
+    if isinstance(value, Mapping):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(v) for v in value]
+    return value
+
+
+class LocationView(MutableMapping):
+    """Per-session copy-on-write view over the shared location table.
+
+    Reads fall through to the shared (frozen) table. Writes only touch the
+    session's overlay, so one player's changes never leak to another.
+    """
+
+    def __init__(self, base: Mapping):
+        self._base = base
+        self._overlay = {}
+        self._deleted = set()
+
+    def __getitem__(self, key):
+        if key in self._overlay:
+            return self._overlay[key]
+        if key in self._deleted:
+            raise KeyError(key)
+        return self._base[key]
+
+    def __setitem__(self, key, value):
+        self._overlay[key] = value
+        self._deleted.discard(key)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._overlay.pop(key, None)
+        self._deleted.add(key)
+
+    def __iter__(self):
+        for key in self._base:
+            if key not in self._deleted:
+                yield key
+        for key in self._overlay:
+            if key not in self._base:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def own(self, key):
+        """Return a mutable copy of a location, private to this session."""
+        if key not in self._overlay:
+            self._overlay[key] = thaw(self[key])
+        return self._overlay[key]
+
+
+class ContentRegistry:
+    """Parses all static game content once and hands out cheap views."""
+
+    _shared = None
+    _lock = threading.Lock()
+
+    def __init__(self, assets_dir: Path = ASSETS_DIR):
+        self.assets_dir = Path(assets_dir)
+        self._art_cache = {}
+        self.characters = self._load_records("characters.json")
+        self.npcs = self._load_records("npcs.json")
+        self.locations = self._load_locations()
+        logging.info(
+            f"Content registry loaded: {len(self.characters)} characters, "
+            f"{len(self.npcs)} NPCs, {len(self.locations)} locations"
+        )
+
+    @classmethod
+    def shared(cls) -> "ContentRegistry":
+        """Return the process-wide registry, loading it on first use."""
+        if cls._shared is None:
+            with cls._lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    def _load_records(self, filename):
+        path = self.assets_dir / filename
+        if not path.exists():
+            return ()
+        with open(path) as f:
+            records = json.load(f)
+        for record in records:
+            if "ascii_art" in record:
+                record["ascii_art"] = self._load_art(record["ascii_art"])
+        return freeze(records)
+
+    def _load_art(self, filename):
+        # Several records may point at the same art file; keep one copy.
+        if filename not in self._art_cache:
+            art_path = self.assets_dir / filename
+            if art_path.exists():
+                with open(art_path, "r", encoding="utf-8") as f:
+                    self._art_cache[filename] = f.read()
+            else:
+                self._art_cache[filename] = "No Art"
+        return self._art_cache[filename]
+
+    def _load_locations(self):
+        from ..world.world import World
+
+        return freeze(World._init_locations())
+
+    def character_records(self):
+        """Mutable copies of the playable character records."""
+        return [thaw(record) for record in self.characters]
+
+    def npc_records(self):
+        """Mutable copies of the NPC records."""
+        return [thaw(record) for record in self.npcs]
+
+    def location_view(self) -> LocationView:
+        """A copy-on-write view of the location table for one session."""
+        return LocationView(self.locations)
@@ -13,7 +13,11 @@ from ..world.world import World
 from ..managers import common
 from ..game_mechanics.skill_check import SkillCheckCommand
 from ..managers.npc_manager import NPCManager
+from ..managers.database_manager import DatabaseManager
+from ..ai_backends.service import AIService
 from .game_io import GameIO
+from .content_registry import ContentRegistry
+from .session import SessionContext
 
 
 @dataclass
@@ -25,18 +29,45 @@ class GameDependencies:
     io: GameIO
     story_manager: "StoryManager"
     skill_check: SkillCheckCommand = None
+    db: DatabaseManager = None
+    session: SessionContext = None
+    ai_service: AIService = None
 
     @classmethod
-    def initialize_game(cls, io: GameIO = None) -> ActionManager:
+    def initialize_game(
+        cls,
+        io: GameIO = None,
+        registry: ContentRegistry = None,
+        db_path: str = None,
+        session: SessionContext = None,
+        ai_service: AIService = None,
+    ) -> ActionManager:
         # Initialize IO
         if io is None:
             from .game_io import ConsoleIO
             io = ConsoleIO()
 
-        char_mngr = CharacterManager()
+        # Static content is parsed once per process; sessions get cheap views
+        if registry is None:
+            registry = ContentRegistry.shared()
+
+        # LLM calls share one reply cache and one request scheduler per process
+        if ai_service is None:
+            ai_service = AIService.shared()
+
+        # Every session owns its StoryManager, SkillCheckCommand and DatabaseManager
+        if session is None:
+            session = SessionContext()
+        with session:
+            return cls._build(io, registry, db_path, session, ai_service)
+
+    @classmethod
+    def _build(cls, io, registry, db_path, session, ai_service) -> ActionManager:
+        db = DatabaseManager(db_path)
+        char_mngr = CharacterManager(registry)
         cmd_mngr = CommandManager()
         npc_manager = NPCManager(char_mngr)
-        world = World(char_mngr, npc_manager, io)
+        world = World(char_mngr, npc_manager, io, locations=registry.location_view())
         
         # Initialize StoryManager
         from ..managers.story_manager import StoryManager
@@ -63,6 +94,9 @@ class GameDependencies:
             story_manager=story_manager,
             skill_check=skill_check,
             io=io,
+            db=db,
+            session=session,
+            ai_service=ai_service,
         )
         
         # Inject dependencies into StoryManager
@@ -22,6 +22,18 @@ class GameIO(ABC):
         """Get input from the client."""
         pass
 
+    async def send_stream(self, chunks, prefix: str = "", suffix: str = "") -> str:
+        """
+        Send text that arrives in pieces (e.g. LLM tokens) as one output line.
+        `chunks` is an async iterator of strings. Returns the full text.
+        The default waits for the whole text and sends it at once; clients that
+        can render partial lines override this to show tokens as they arrive.
+        """
+        parts = [chunk async for chunk in chunks]
+        text = "".join(parts)
+        await self.send(f"{prefix}{text}{suffix}")
+        return text
+
 
 from prompt_toolkit import PromptSession
 from prompt_toolkit.completion import Completer, Completion
@@ -101,6 +113,18 @@ class ConsoleIO(GameIO):
         # unless prompt is active. prompt_app usually handles this.
         print(text)
 
+    async def send_stream(self, chunks, prefix: str = "", suffix: str = "") -> str:
+        # Print tokens in place on one line; always terminate the line, even on error
+        parts = []
+        print(prefix, end="", flush=True)
+        try:
+            async for chunk in chunks:
+                parts.append(chunk)
+                print(chunk, end="", flush=True)
+        finally:
+            print(suffix, flush=True)
+        return "".join(parts)
+
     async def display(self, data: Any, view_type: str = "text"):
         if view_type == "text":
              print(data)
@@ -0,0 +1,94 @@
+"""Per-session scope for the game's singleton services.
+
+StoryManager, SkillCheckCommand and DatabaseManager were process-wide
+singletons, so two players on one server shared story state and a sqlite
+connection. A SessionContext owns one instance of each per game session.
+It is tracked in a ContextVar, so every asyncio task (and the tasks it
+spawns) resolves the singletons of its own session.
+
+Outside an active session the classes keep their old process-wide behaviour
+(used by scripts such as seed_db.py and by unit tests).
+"""
+
+import contextvars
+import logging
+import uuid
+
+_current_session = contextvars.ContextVar("neoncore_session", default=None)
+
+
+class SessionContext:
+    """Owns the per-session instances of singleton services."""
+
+    def __init__(self, session_id: str = None):
+        self.session_id = session_id or uuid.uuid4().hex[:8]
+        self.instances = {}
+        self._tokens = []
+
+    @staticmethod
+    def current() -> "SessionContext":
+        """Return the session active in the running context, or None."""
+        return _current_session.get()
+
+    def activate(self) -> "SessionContext":
+        """Make this the current session for the running context."""
+        self._tokens.append(_current_session.set(self))
+        return self
+
+    def deactivate(self):
+        if self._tokens:
+            _current_session.reset(self._tokens.pop())
+
+    def __enter__(self):
+        return self.activate()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.deactivate()
+        return False
+
+    def get(self, cls):
+        return self.instances.get(cls)
+
+    def put(self, cls, instance):
+        self.instances[cls] = instance
+        return instance
+
+    def close(self):
+        """Release resources held by the session's instances (e.g. db connections)."""
+        for instance in self.instances.values():
+            close = getattr(instance, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception as e:
+                    logging.error(f"Session {self.session_id}: close failed: {e}")
+        self.instances.clear()
+
+    async def close_async(self):
+        """close() from the event loop: instances with a close_async() are closed through it."""
+        for instance in self.instances.values():
+            try:
+                if callable(getattr(instance, "close_async", None)):
+                    await instance.close_async()
+                elif callable(getattr(instance, "close", None)):
+                    instance.close()
+            except Exception as e:
+                logging.error(f"Session {self.session_id}: close failed: {e}")
+        self.instances.clear()
+
+
+def scoped_instance(cls, factory):
+    """
+    Return the instance of `cls` for the current session, creating it with
+    `factory` on first use. Outside a session, fall back to `cls._instance`.
+    """
+    session = SessionContext.current()
+    if session is not None:
+        instance = session.get(cls)
+        if instance is None:
+            instance = session.put(cls, factory())
+        return instance
+
+    if cls._instance is None:
+        cls._instance = factory()
+    return cls._instance
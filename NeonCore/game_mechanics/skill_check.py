@@ -3,6 +3,7 @@ import random
 from typing import Optional
 from ..utils import wprint
 from ..utils import DiceRoller
+from ..core.session import SessionContext
 from ..managers.character_manager import (
     Character,
 )  # Type hint only, circular dependency risk handled at runtime
@@ -12,10 +13,13 @@ class Singleton:
     _singletons = {}
 
     def __new__(cls, *args, **kwds):
-        if cls not in cls._singletons:
-            cls._singletons[cls] = obj = super().__new__(cls)
+        # Inside a game session each session owns its own instances
+        session = SessionContext.current()
+        singletons = session.instances if session is not None else cls._singletons
+        if cls not in singletons:
+            singletons[cls] = obj = super().__new__(cls)
             obj._initialized = False
-        return cls._singletons[cls]
+        return singletons[cls]
 
 
 class SkillCheckCommand(Singleton):
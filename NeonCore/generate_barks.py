@@ -0,0 +1,57 @@
+"""Fill the NPC bark library offline.
+
+    python -m NeonCore.generate_barks [--npc Lenard] [--per-key 3] [--replace]
+
+Asks the configured model for lines of every NPC, for each relationship
+status and player intent, using the same prompt as do_say (see
+bark_manager.py), and stores them in the game database.
+"""
+
+import argparse
+import asyncio
+
+from .ai_backends.fake import FakeBackend
+from .ai_backends.gemini import GeminiBackend
+from .ai_backends.ollama import OllamaBackend
+from .ai_backends.service import AIService
+from .config import AI_CONFIG
+from .core.content_registry import ContentRegistry
+from .managers.bark_manager import BarkManager
+from .managers.character_manager import CharacterManager
+from .managers.database_manager import DatabaseManager
+
+
+async def generate_barks(backend, db, npcs, per_key=3, replace=False):
+    service = AIService()  # No cache: every line should be a fresh sample
+
+    async def reply(messages):
+        return await service.reply(backend, "bark", messages)
+
+    if replace:
+        for npc in npcs:
+            db.delete_barks(npc.handle)
+    return await BarkManager(db).generate(reply, npcs, per_key)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-generate fallback NPC lines.")
+    parser.add_argument("--backend", choices=["ollama", "gemini", "fake"], default=AI_CONFIG["default_backend"])
+    parser.add_argument("--npc", action="append", help="Only this NPC (repeatable)")
+    parser.add_argument("--per-key", type=int, default=3, help="Lines per NPC, relationship and intent")
+    parser.add_argument("--replace", action="store_true", help="Delete the NPCs' existing lines first")
+    parser.add_argument("--db", help="Database path (default: neoncore.db in the project root)")
+    args = parser.parse_args(argv)
+
+    backend = {"ollama": OllamaBackend, "gemini": GeminiBackend, "fake": FakeBackend}[args.backend]()
+    db = DatabaseManager(args.db)
+    npcs = CharacterManager(ContentRegistry.shared()).npcs
+    if args.npc:
+        wanted = {name.lower() for name in args.npc}
+        npcs = [npc for npc in npcs if npc.handle.lower() in wanted]
+
+    stored = asyncio.run(generate_barks(backend, db, npcs, args.per_key, args.replace))
+    print(f"Stored {stored} barks for {len(npcs)} NPCs.")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ import os
 import logging
 import json
 import random
+import asyncio
 from ..core.async_cmd import AsyncCmd
 from argparse import Action
 
@@ -26,7 +27,16 @@ except ImportError:
 from ..utils import wprint
 from ..ai_backends.ollama import OllamaBackend
 from ..ai_backends.gemini import GeminiBackend
+from ..ai_backends.fake import FakeBackend
+from ..ai_backends.conversation import Conversation, DialogueStore
+from ..ai_backends.service import AIService
+from .bark_manager import BarkManager, classify_intent, first_within, npc_prompt
+from .greeting_manager import GREETING_CUE, GreetingManager
+from .thought_manager import ThoughtManager
+from .trait_manager import REFLECTION_SCHEMA
+from ..config import AI_CONFIG
 from ..game_mechanics.combat_system import CombatEncounter
+from ..world.lore import LoreIndex
 
 
 class ActionManager(AsyncCmd):
@@ -61,9 +71,29 @@ class ActionManager(AsyncCmd):
 
         self.help_system = HelpSystem()
 
+        # Dialogue history per (NPC, player), kept across talk/bye (see do_say)
+        self.dialogue = DialogueStore()
+        # Passive intrusive thoughts run in the background (see log_event)
+        self.thoughts = ThoughtManager(self._intrusive_thought, self._show_thought)
+        # NPC greetings prefetched on entering a location (see do_go, do_talk)
+        self.greetings = GreetingManager(lambda messages: self.ai_reply("greeting", messages))
+        session = getattr(dependencies, "session", None)
+        if session is not None:
+            # Closing the session cancels pending history summaries, thoughts and greetings
+            session.put(DialogueStore, self.dialogue)
+            session.put(ThoughtManager, self.thoughts)
+            session.put(GreetingManager, self.greetings)
+
+        # Pre-generated NPC lines for replies that miss their deadline (see do_say)
+        self.barks = BarkManager(getattr(dependencies, "db", None))
+
         # Initialize AI backend
-        self.ai_backends = {"gemini": GeminiBackend(), "ollama": OllamaBackend()}
+        # Cheap per session: connection pools and health state are shared per host,
+        # and is_known_available() answers from cache without touching the network
+        self.ai_backends = {"gemini": GeminiBackend(), "ollama": OllamaBackend(), "fake": FakeBackend()}
         self.ai_backend = self.select_available_backend()
+        # Shared LLM front door (response cache + request scheduler)
+        self.ai_service = getattr(dependencies, "ai_service", None) or AIService()
 
     def get_names(self):
         """Override to filter commands based on game state"""
@@ -79,6 +109,14 @@ class ActionManager(AsyncCmd):
         # Default behavior: return all available commands
         return dir(self)
 
+    async def cmdloop(self, intro=None):
+        """Run the command loop with this player's session active."""
+        session = getattr(self.dependencies, "session", None)
+        if session is None:
+            return await super().cmdloop(intro)
+        with session:
+            return await super().cmdloop(intro)
+
     async def emptyline(self):
         """Do nothing on empty input (don't repeat last command)."""
         pass
@@ -90,20 +128,45 @@ class ActionManager(AsyncCmd):
         return stop
 
     def select_available_backend(self):
-        """Auto-select the first available backend"""
+        """
+        Auto-select the first available backend, or AI_CONFIG["backend"] if set.
+        The offline fake backend comes last, so the game starts without a model;
+        an endpoint that was never probed or is still failing does not count.
+        """
+        forced = AI_CONFIG["backend"]
+        if forced:
+            if forced not in self.ai_backends:
+                raise RuntimeError(f"Unknown AI backend: {forced}")
+            logging.info(f"Using {forced} AI backend (AI_BACKEND)")
+            return self.ai_backends[forced]
         try:
             name, backend = next(
                 (name, backend)
                 for name, backend in self.ai_backends.items()
-                if backend.is_available()
+                if backend.is_known_available()
             )
-            logging.info(f"Using {name} AI backend")
-            return backend
         except StopIteration:
             raise RuntimeError("No AI backend available")
+        if name == "fake":
+            logging.warning("No AI backend reachable, NPCs answer with canned lines (fake backend)")
+        else:
+            logging.info(f"Using {name} AI backend")
+        return backend
+
+    async def ai_reply(self, site, messages):
+        """Reply text for `messages`; `site` (say/reflect/thought) sets caching and priority."""
+        return await self.ai_service.reply(self.ai_backend, site, messages)
+
+    async def ai_structured(self, site, messages, schema):
+        """JSON reply for `messages` as a dict of the fields that are valid under `schema`."""
+        return await self.ai_service.structured(self.ai_backend, site, messages, schema)
+
+    def ai_stream(self, site, messages):
+        """Streaming variant of ai_reply(): an async iterator of reply fragments."""
+        return self.ai_service.stream(self.ai_backend, site, messages)
 
     async def do_protocol(self, arg):
-        """Switch between available AI backends (gemini/ollama) or config."""
+        """Switch between available AI backends (gemini/ollama/fake) or config."""
         if arg not in self.ai_backends:
             await self.io.send(f"Available backends: {', '.join(self.ai_backends.keys())}")
             return
@@ -118,7 +181,7 @@ class ActionManager(AsyncCmd):
 
     def complete_protocol(self, text, line, begidx, endidx):
         """Complete AI backend options"""
-        available_backends = list(self.ai_backends.keys())  # ['gemini', 'ollama']
+        available_backends = list(self.ai_backends.keys())  # ['gemini', 'ollama', 'fake']
         logging.debug(f"Available AI backends: {available_backends}")
         return [
             backend + " " for backend in available_backends if backend.startswith(text)
@@ -206,15 +269,22 @@ class ActionManager(AsyncCmd):
             f"\n\033[1;35m[ Entering conversation with {npc_name}{rel_tag}\033[1;35m. Type 'bye' to exit. ]\033[0m"
         )
 
+        # Opening line prefetched when the player walked in, if it is ready
+        cue = GREETING_CUE.format(player=player_name)
+        greeting = self.greetings.take(npc_name, self._conversation_with(target_npc, player).messages(cue))
+        if greeting:
+            await self.io.send(f"\033[1;35m{npc_name}: {greeting}\033[0m")
+            self._conversation_with(target_npc, player).record(cue, greeting)
+
         # If user provided an argument (e.g. "talk lazlo hello"), treat it as the first message
         if arg and arg.lower() != target_name.lower():
             # If arg is just 'lazlo', we do nothing.
             if not arg.lower().startswith(target_name.lower()):
-                self.do_say(arg)
+                await self.do_say(arg)
             elif len(arg) > len(target_name):
                 msg = arg[len(target_name) :].strip()
                 if msg:
-                    self.do_say(msg)
+                    await self.do_say(msg)
         return
 
 
@@ -244,7 +314,12 @@ class ActionManager(AsyncCmd):
 
         # Normal Movement
         # 1. Update Position
+        previous = self.dependencies.world.player_position
         await self.dependencies.world.do_go(arg)
+        if self.dependencies.world.player_position != previous:
+            # Greetings for the NPCs left behind are no longer needed
+            self.greetings.cancel()
+            self._prefetch_greetings()
         # 2. Trigger Story Updates (e.g. Ambush Spawns)
         await self.dependencies.story_manager.update()
         
@@ -252,6 +327,16 @@ class ActionManager(AsyncCmd):
         if not getattr(self.dependencies.story_manager, "scene_triggered", False):
             await self.dependencies.world.do_look("")
 
+    def _prefetch_greetings(self):
+        """Start generating an opening line for each NPC at the player's location."""
+        player = self.char_mngr.player
+        if not player:
+            return
+        world = self.dependencies.world
+        for npc in self.dependencies.npc_manager.get_npcs_in_location(world.player_position):
+            cue = GREETING_CUE.format(player=player.handle)
+            self.greetings.prefetch(npc.handle, self._conversation_with(npc, player).messages(cue))
+
     def complete_go(self, text, line, begidx, endidx):
         """Complete go command with available exits"""
         current_location = self.dependencies.world.locations[
@@ -329,7 +414,7 @@ class ActionManager(AsyncCmd):
         if selected_char:
              # --- 3. Save/Load Check ---
              db = self.dependencies.world.db
-             saved_state = db.load_player(selected_char.handle)
+             saved_state = await db.load_player_async(selected_char.handle)
              
              if saved_state:
                  # RESUME GAME
@@ -344,15 +429,10 @@ class ActionManager(AsyncCmd):
                  inv_ids = json.loads(saved_state['inventory_ids']) if saved_state['inventory_ids'] else []
                  equip_ids = json.loads(saved_state['equipped_ids']) if saved_state['equipped_ids'] else []
                  
-                 inv_items = []
-                 for i_id in inv_ids:
-                     item = db.get_item(i_id)
-                     if item: inv_items.append(item)
-                     
-                 equip_items = []
-                 for i_id in equip_ids:
-                     item = db.get_item(i_id)
-                     if item: equip_items.append(item)
+                 # One query for both lists
+                 items = await db.get_items_async(inv_ids + equip_ids)
+                 inv_items = [items[i_id] for i_id in inv_ids if i_id in items]
+                 equip_items = [items[i_id] for i_id in equip_ids if i_id in items]
                  
                  # PARSE STATS
                  # Handle the new "attributes" + "combat" structure
@@ -403,29 +483,26 @@ class ActionManager(AsyncCmd):
                          has_burner = True
                          break
                  
+                 # Templates and instances are collected and written in one transaction
+                 uow = db.unit_of_work()
+
                  if not has_burner:
                       # Create and Add to Inventory
-                      burner_tid = db.get_template_id_by_name("Glitching Burner")
-                      if not burner_tid:
-                          burner_tid = db.create_template("Glitching Burner", "gear", "A cheap burner phone, screen cracked and glitching.")
-                      
-                      if burner_tid:
-                          # Create instance owned by player
-                          iid = db.create_instance(burner_tid, owner_id=selected_char.handle)
-                          # Add to inventory list so it's usable immediately
-                          selected_char.inventory.append({"name": "Glitching Burner", "id": iid})
+                      burner_tid = uow.template("Glitching Burner", "gear", "A cheap burner phone, screen cracked and glitching.")
+                      # Create instance owned by player
+                      iid = uow.create_instance(burner_tid, owner_id=selected_char.handle)
+                      # Add to inventory list so it's usable immediately
+                      selected_char.inventory.append({"name": "Glitching Burner", "id": iid})
                  
                  # 2. Persist Player Starting Gear
                  new_inv = []
                  for item in selected_char.inventory:
                      name = item.get('name') if isinstance(item, dict) else item
                      # Check/Create Template
-                     tid = db.get_template_id_by_name(name)
-                     if not tid:
-                         desc = item.get('notes', 'Standard gear.')
-                         tid = db.create_template(name, "gear", desc)
+                     desc = item.get('notes', 'Standard gear.') if isinstance(item, dict) else 'Standard gear.'
+                     tid = uow.template(name, "gear", desc)
                      
-                     iid = db.create_instance(tid, owner_id=selected_char.handle)
+                     iid = uow.create_instance(tid, owner_id=selected_char.handle)
                      
                      if isinstance(item, dict):
                          item['id'] = iid
@@ -437,26 +514,25 @@ class ActionManager(AsyncCmd):
                  new_weapons = []
                  for item in selected_char.weapons:
                      name = item.get('name') if isinstance(item, dict) else item
-                     tid = db.get_template_id_by_name(name)
-                     if not tid:
-                         desc = item.get('notes', 'Weapon.')
-                         desc = item.get('notes', 'Weapon.')
-                         # Try to parse stats from json if possible or default
-                         # CAPTURE ALL STATS (Ammo, ROF, Dmg)
-                         stats = {}
-                         # specific keys to migrate to base_stats
-                         for key in ['dmg', 'damage', 'ammo', 'rof', 'range', 'cost']:
-                             if key in item: stats[key] = item[key]
-                             
-                         tid = db.create_template(name, "weapon", desc, base_stats=json.dumps(stats))
+                     desc = item.get('notes', 'Weapon.') if isinstance(item, dict) else 'Weapon.'
+                     # Try to parse stats from json if possible or default
+                     # CAPTURE ALL STATS (Ammo, ROF, Dmg)
+                     stats = {}
+                     # specific keys to migrate to base_stats
+                     for key in ['dmg', 'damage', 'ammo', 'rof', 'range', 'cost']:
+                         if isinstance(item, dict) and key in item: stats[key] = item[key]
+                         
+                     tid = uow.template(name, "weapon", desc, base_stats=json.dumps(stats))
                      
-                     iid = db.create_instance(tid, owner_id=selected_char.handle)
+                     iid = uow.create_instance(tid, owner_id=selected_char.handle)
                      if isinstance(item, dict):
                          item['id'] = iid
                      else:
                          item = {"name": item, "id": iid}
                      new_weapons.append(item)
                  selected_char.weapons = new_weapons
+                 if not await uow.commit_async():
+                     await self.io.send("\033[1;31m[ERROR] Save Failed: starting gear was not stored.\033[0m")
 
                  
                  # Set State to 'character_chosen' 
@@ -490,10 +566,12 @@ class ActionManager(AsyncCmd):
         
         loc = self.dependencies.world.player_position
         
-        success = self.dependencies.world.db.save_player(
+        # Player and item states are written together, in one transaction
+        uow = self.dependencies.world.db.unit_of_work()
+        uow.save_player(
             player.handle,
             loc,
-            full_stats, # Pass Dict, DatabaseManager.save_player handles json.dumps in this project version
+            full_stats, # Pass Dict, the unit of work handles json.dumps in this project version
             data['inventory_ids'],
             data['equipped_ids']
         )
@@ -510,8 +588,9 @@ class ActionManager(AsyncCmd):
                 # or just specific mutable fields.
                 # Let's save the whole mutable dict to ensure we capture ammo/notes changes.
                 # But we should exclude ID/Name if they are redundant? No, JSON is flexible.
-                self.dependencies.world.db.update_instance_stats(item['id'], item)
+                uow.update_instance_stats(item['id'], item)
         
+        success = await uow.commit_async()
         if success:
             await self.io.send("\033[1;32m[SYSTEM] Progress Saved.\033[0m")
         else:
@@ -528,7 +607,7 @@ class ActionManager(AsyncCmd):
             
         # Strict Check: Must exist in DB
         db = self.dependencies.world.db
-        if not db.load_player(arg):
+        if not await db.load_player_async(arg):
              await self.io.send(f"No save file found for '{arg}'. Use 'choose {arg}' to start a new game.")
              return
 
@@ -953,7 +1032,7 @@ class ActionManager(AsyncCmd):
                      # Check ground
                      ground_burner = False
                      loc = self.dependencies.world.player_position
-                     items = self.dependencies.world.get_items_in_location(loc)
+                     items = await self.dependencies.world.get_items_in_location_async(loc)
                      for item in items:
                          name = item.get('name', '') if isinstance(item, dict) else item
                          if "glitching burner" in name.lower(): ground_burner = True
@@ -982,37 +1061,34 @@ class ActionManager(AsyncCmd):
             # Passive "Intrusive Thoughts" (Chance to trigger)
             # Only trigger random thoughts if stress is building up or event is significant
             if random.random() < 0.4:  # 40% chance
-                await self._trigger_intrusive_thought(event) # Await it!
+                # Fire and forget: the command that caused the event does not wait
+                self.thoughts.trigger(self.char_mngr.player.handle, event)
 
-    async def _trigger_intrusive_thought(self, event):
-        """Generates and displays a passive intrusive thought"""
-        try:
-            player = self.char_mngr.player
-            soul = player.digital_soul
-
-            messages = [
-                {
-                    "role": "system",
-                    "content": (
-                        f"You are the inner consciousness of {player.handle} ({player.role}). "
-                        f"Current Stress: {soul.stress}%. Traits: {soul.traits}. "
-                        "Generate a SINGLE, short, gritty intrusive thought about the recent event. "
-                        "It should reflect your internal conflict or reaction. "
-                        "Max 15 words. No quotes."
-                    ),
-                },
-                {"role": "user", "content": f"Event: {event}"},
-            ]
-            # Use a quick call if possible, or just standard
-            # NOTE: get_chat_completion is sync blocking call.
-            response = self.ai_backend.get_chat_completion(messages)
-            thought = response["message"]["content"]
+    async def _intrusive_thought(self, event):
+        """Generates a passive intrusive thought (runs in the background, see ThoughtManager)"""
+        player = self.char_mngr.player
+        soul = player.digital_soul
+        memories = soul.relevant_memories(event)
 
-            # Print in grey italics
-            await self.io.send(f"\033[3;90m{thought}\033[0m")
+        messages = [
+            {
+                "role": "system",
+                "content": (
+                    f"You are the inner consciousness of {player.handle} ({player.role}). "
+                    f"Current Stress: {soul.stress}%. Traits: {soul.traits}. "
+                    + (f"Related memories: {'; '.join(memories)}. " if memories else "")
+                    + "Generate a SINGLE, short, gritty intrusive thought about the recent event. "
+                    "It should reflect your internal conflict or reaction. "
+                    "Max 15 words. No quotes."
+                ),
+            },
+            {"role": "user", "content": f"Event: {event}"},
+        ]
+        return await self.ai_reply("thought", messages)
 
-        except Exception:
-            pass  # Fail silently for passive flavor
+    async def _show_thought(self, thought):
+        # Print in grey italics
+        await self.io.send(f"\033[3;90m{thought}\033[0m")
 
     async def do_reflect(self, arg):
         """
@@ -1030,87 +1106,71 @@ class ActionManager(AsyncCmd):
         await self.io.send(f"\033[3mProcessing {len(soul.recent_events)} recent events...\033[0m")
 
         # 1. Ask Gemini to generate a probe
+        # Both calls share one conversation: the analysis extends the probe's
+        # prompt, so the model does not evaluate the events a second time
         events_str = "; ".join(soul.recent_events)
-        probe_messages = [
-            {
-                "role": "system",
-                "content": f"You are the internal monologue of a Cyberpunk Edgerunner ({player.role}). Traits: {soul.traits}.",
-            },
-            {
-                "role": "user",
-                "content": (
-                    f"Recent Events: {events_str}.\n"
-                    "GOAL: Ask the user a Single, Deep, Gritty question about these events to help them process the psychological weight. "
-                    "Do not be nice. Be introspective and noir-style."
-                ),
-            },
-        ]
+        memories = soul.relevant_memories(events_str)
+        reflection = Conversation(
+            [
+                {
+                    "role": "system",
+                    "content": (
+                        f"You are the internal monologue of a Cyberpunk Edgerunner ({player.role}). Traits: {soul.traits}."
+                        + (f" Related memories: {'; '.join(memories)}." if memories else "")
+                    ),
+                },
+            ]
+        )
+        probe = (
+            f"Recent Events: {events_str}.\n"
+            "GOAL: Ask the user a Single, Deep, Gritty question about these events to help them process the psychological weight. "
+            "Do not be nice. Be introspective and noir-style."
+        )
 
         try:
-            probe_response = self.ai_backend.get_chat_completion(probe_messages)
-            question = probe_response["message"]["content"]
+            question = await self.ai_reply("probe", reflection.messages(probe))
+            reflection.record(probe, question)
             await self.io.send(f"\n\033[1;36mSOUL > {question}\033[0m")
 
             # 2. Get User Reflection (Critical Input Replacement)
             answer = await self.io.prompt("\n\033[1;30mYOU > \033[0m")
 
             # 3. Analyze and Update
-            analyze_messages = [
-                {
-                    "role": "system",
-                    "content": "You are a psychological analyzer for a game character.",
-                },
-                {
-                    "role": "user",
-                    "content": (
-                        f"User ({player.role}) reflected on events: {events_str}. "
-                        f"Their internal monologue asked: {question}. "
-                        f"They answered: {answer}. "
-                        "GOAL: Analyze this to update their character. "
-                        "1. CLASSIFY the connection between User's Nature (Traits/Triads) and Action:"
-                        "   - ALIGNMENT: Acting according to nature. EFFECT: Heals Stress."
-                        "   - DISSONANCE: Acting against nature. EFFECT: Increases Stress."
-                        "2. CLASSIFY the Motivation (The Soul Trilemma):"
-                        "   - SENTIMENT (Humanity): Genuine care. Effect: Heals Stress, Light Triad +."
-                        "   - NECESSITY (Survival): 'No choice'. Effect: NO stress heal (Numb), LOSS of Agreeableness."
-                        "   - TRANSACTIONAL/CYNIC (Masking): 'Fake kindness', 'Used them', 'Annoyed'. Effect: INCREASES Stress (Masking Cost), Dark Triad +, Agreeableness -."
-                        "   - RUTHLESSNESS (Power): Cruelty enjoyed. Effect: Heals stress, Dark Triad +."
-                        "3. LIGHT TRIAD: Did they show Kantianism (Principles), Humanism (Dignity), or Faith (Hope)? "
-                        "Return ONLY a JSON object with keys: "
-                        "'stress_change' (int), "
-                        "'new_traits' (list[str]), "
-                        "'memory_summary' (str), "
-                        "'big5_drift' (dict: keys openness, conscientiousness, extraversion, agreeableness, neuroticism. Values +/- int), "
-                        "'dark_triad_drift' (dict: keys machiavellianism, narcissism, psychopathy. Values + int), "
-                        "'light_triad_drift' (dict: keys kantianism, humanism, faith. Values + int)."
-                    ),
-                },
-            ]
+            analyze_messages = reflection.messages(
+                f"They answered: {answer}. "
+                "Now act as a psychological analyzer for this game character. "
+                "GOAL: Analyze this to update their character. "
+                "1. CLASSIFY the connection between User's Nature (Traits/Triads) and Action:"
+                "   - ALIGNMENT: Acting according to nature. EFFECT: Heals Stress."
+                "   - DISSONANCE: Acting against nature. EFFECT: Increases Stress."
+                "2. CLASSIFY the Motivation (The Soul Trilemma):"
+                "   - SENTIMENT (Humanity): Genuine care. Effect: Heals Stress, Light Triad +."
+                "   - NECESSITY (Survival): 'No choice'. Effect: NO stress heal (Numb), LOSS of Agreeableness."
+                "   - TRANSACTIONAL/CYNIC (Masking): 'Fake kindness', 'Used them', 'Annoyed'. Effect: INCREASES Stress (Masking Cost), Dark Triad +, Agreeableness -."
+                "   - RUTHLESSNESS (Power): Cruelty enjoyed. Effect: Heals stress, Dark Triad +."
+                "3. LIGHT TRIAD: Did they show Kantianism (Principles), Humanism (Dignity), or Faith (Hope)? "
+                "Return ONLY a JSON object with keys: "
+                "'stress_change' (int), "
+                "'new_traits' (list[str]), "
+                "'memory_summary' (str), "
+                "'big5_drift' (dict: keys openness, conscientiousness, extraversion, agreeableness, neuroticism. Values +/- int), "
+                "'dark_triad_drift' (dict: keys machiavellianism, narcissism, psychopathy. Values + int), "
+                "'light_triad_drift' (dict: keys kantianism, humanism, faith. Values + int)."
+            )
 
             await self.io.send("\n\033[3m(Re-integrating psyche...)\033[0m")
             try:
-                analysis_response = self.ai_backend.get_chat_completion(analyze_messages)
-                analysis_text = analysis_response["message"]["content"]
+                # One structured-output call; fields that fail validation are
+                # re-asked for on their own instead of redoing the analysis
+                analysis = await self.ai_structured("reflect", analyze_messages, REFLECTION_SCHEMA)
             except Exception as e:
                 await self.io.send(f"\n\033[1;31m[ ERROR: Connection to Soul Severed ({e}) ]\033[0m")
                 await self.io.send("\033[31mYour thoughts scatter before they can form a coherent pattern.\033[0m")
                 self.char_mngr.player.digital_soul.recent_events.clear() # Clear events to unblock queue?
                 return
 
-            # Robust JSON extraction
-            import re
-            json_match = re.search(r"\{.*\}", analysis_text, re.DOTALL)
-            if json_match:
-                analysis_text = json_match.group(0)
-            
-            # SANITIZE JSON: Limit AI's creativity with "+" signs (e.g., +1 -> 1) which breaks JSON
-            # NOTE: Specific fix for Qwen 32b which tends to output non-compliant JSON integers (e.g. +1)
-            analysis_text = re.sub(r':\s*\+(\d+)', r': \1', analysis_text)
-
-            try:
-                analysis = json.loads(analysis_text)
-            except json.JSONDecodeError as e:
-                await self.io.send(f"\033[1;31m(Neural Glitch: {e})\033[0m")
+            if not analysis:
+                await self.io.send("\033[1;31m(Neural Glitch: no usable analysis)\033[0m")
                 return
 
             # Apply Changes
@@ -1183,6 +1243,20 @@ class ActionManager(AsyncCmd):
         else:
              await self.io.send(f"NPC '{arg}' not found.")
 
+    async def do_dev_stats(self, arg):
+        """[DEBUG] Show AI call statistics (latency, tokens, cache hits) per call site and model."""
+        telemetry = self.ai_service.telemetry
+        if telemetry is None:
+            await self.io.send("AI telemetry is off for this session.")
+            return
+        lines = telemetry.report()
+        if not lines:
+            await self.io.send("No AI calls recorded yet.")
+            return
+        await self.io.send("\033[1;36m[DEBUG] AI calls since startup (all sessions):\033[0m")
+        for line in lines:
+            await self.io.send(line)
+
     async def do_help(self, arg):
         """Get help for commands - context-sensitive based on game state."""
         if not arg:
@@ -1370,6 +1444,31 @@ class ActionManager(AsyncCmd):
             return
 
     # Conversation Methods (Re-added)
+    def _conversation_with(self, npc, player):
+        """The conversation between `player` and `npc`, kept across talk and bye."""
+        return self.dialogue.conversation(
+            (npc.handle, player.handle),
+            lambda: npc_prompt(npc, player.handle, player.role),
+        )
+
+    async def _summarize_dialogue(self, conversation, summary, turns):
+        """Fold older turns of an NPC conversation into its running summary."""
+        npc_handle, player_handle = conversation.key
+        names = {"user": player_handle, "assistant": npc_handle}
+        transcript = "\n".join(f"{names[m['role']]}: {m['content']}" for m in turns)
+        messages = [
+            {
+                "role": "system",
+                "content": (
+                    f"You keep the memory of {npc_handle}, an NPC talking to {player_handle}. "
+                    "Merge the summary so far and the new lines into one summary of under 80 words. "
+                    "Keep names, deals, promises, threats and facts learned. No quotes."
+                ),
+            },
+            {"role": "user", "content": f"Summary so far: {summary or 'none'}\n\nNew lines:\n{transcript}"},
+        ]
+        return await self.ai_reply("summary", messages)
+
     async def do_bye(self, arg):
         """End the conversation."""
         if self.game_state == "conversation":
@@ -1406,35 +1505,59 @@ class ActionManager(AsyncCmd):
         npc = self.conversing_npc
         player = self.char_mngr.player
 
-        # Basic context construction
-        messages = [
-            {
-                "role": "system",
-                "content": (
-                    f"You are {npc.handle}, a {npc.role}. "
-                    f"Description: {npc.description}. "
-                    f"Context: {npc.dialogue_context}. "
-                    f"You are talking to {player.handle} ({player.role}). "
-                    "Keep responses short (under 2 sentences) and in-character (Cyberpunk slang). "
-                    "Do not use quotes."
-                ),
-            },
-            # Role Ability Context Injection
-            {
-                "role": "system",
-                "content": player.role_ability.get_social_context(npc.relationships.get(player.handle))
-            },
-            # We should ideally keep a history buffer, but for now simple 1-turn
-            {"role": "user", "content": arg},
-        ]
+        # The conversation keeps its prompt prefix identical across turns,
+        # so the model only evaluates what was added since the last line
+        conversation = self._conversation_with(npc, player)
+        # Role Ability Context Injection (appended only when it changes)
+        conversation.update_context(
+            "social", player.role_ability.get_social_context(npc.relationships.get(player.handle))
+        )
+        # A few lore passages related to this NPC and the opening line (its own entry is
+        # already in the prompt); looked up once, so later turns still extend the prefix
+        if not conversation.lore_looked_up:
+            lore = LoreIndex.shared().search(
+                f"{npc.handle} {npc.dialogue_context}: {arg}", AI_CONFIG["lore_top_k"],
+                exclude={f"npc:{npc.handle}"},
+            )
+            conversation.update_context("lore", "World notes: " + " | ".join(p["text"] for p in lore) if lore else "")
+            conversation.lore_looked_up = True
+        # Only the player's memories related to this NPC and line, however many there are
+        memories = player.digital_soul.relevant_memories(f"{npc.handle}: {arg}")
+        conversation.update_context(
+            "memories", f"{player.handle} remembers (bring up only if it fits): {'; '.join(memories)}" if memories else ""
+        )
+        messages = conversation.messages(arg)
+        # Holds a scheduler slot until it is exhausted or closed
+        stream = self.ai_stream("say", messages)
 
         try:
-            # AI Call
-            # NOTE: Sync call!
-            response = self.ai_backend.get_chat_completion(messages)
-            response_content = response["message"]["content"]
+            # AI Call (non-blocking, bounded by AI_CONFIG["request_timeout"])
+            # The first words must arrive within AI_CONFIG["say_deadline"]
+            chunks = await first_within(stream, AI_CONFIG["say_deadline"])
+        except Exception as e:
+            # Slow, down or empty (StopAsyncIteration): answer with a pre-generated line if there is one
+            logging.warning(f"say: no reply from {npc.handle} in time ({type(e).__name__}: {e})")
+            bark = await self.barks.pick(npc.handle, npc.relationships.get(player.handle), classify_intent(arg))
+            if bark is not None:
+                await self.io.send(f"\033[1;35m{npc.handle}: {bark}\033[0m")
+                conversation.record(arg, bark)
+            elif isinstance(e, asyncio.TimeoutError):
+                await self.io.send(f"[{npc.handle} glitches out... (AI Error: no reply within {AI_CONFIG['say_deadline']:.0f}s)]")
+            else:
+                await self.io.send(f"[{npc.handle} glitches out... (AI Error: {e})]")
+            return
 
-            await self.io.send(f"\033[1;35m{npc.handle}: {response_content}\033[0m")
+        try:
+            # Tokens are streamed to the client as they are generated
+            reply = await self.io.send_stream(
+                chunks,
+                prefix=f"\033[1;35m{npc.handle}: ",
+                suffix="\033[0m",
+            )
+            conversation.record(arg, reply)
+            # Over budget: older turns are summarized in the background,
+            # the next line does not wait for it
+            conversation.compact_soon(self._summarize_dialogue)
 
             # Update stress slightly if conversation is intense? (Simplification)
             # Triggers: Profanity OR Strong Emotion words
@@ -1442,8 +1565,13 @@ class ActionManager(AsyncCmd):
             if any(t in arg.lower() for t in triggers):
                 await self.log_event(f"Significant conversation with {npc.handle}: '{arg}'")
 
+        except asyncio.TimeoutError:
+            await self.io.send(f"[{npc.handle} glitches out... (AI Error: no reply within {AI_CONFIG['request_timeout']:.0f}s)]")
         except Exception as e:
             await self.io.send(f"[{npc.handle} glitches out... (AI Error: {e})]")
+        finally:
+            # The reply may not have been read to the end (e.g. the client left)
+            await stream.aclose()
 
     # do_take removed as per user request (replaced by skill interactions)
 
@@ -1476,7 +1604,7 @@ class ActionManager(AsyncCmd):
               
               if not has_it:
                    loc = self.dependencies.world.player_position
-                   ground_items = self.dependencies.world.get_items_in_location(loc)
+                   ground_items = await self.dependencies.world.get_items_in_location_async(loc)
                    for i in ground_items:
                        name = i.get('name') if isinstance(i, dict) else i
                        if "burner" in name.lower(): has_it = True
@@ -1489,7 +1617,7 @@ class ActionManager(AsyncCmd):
                   # Try to pick it up from the world
                   current_loc = self.dependencies.world.player_position
                   # We use 'glitching burner' as keyword
-                  world_item = self.dependencies.world.remove_item(current_loc, "glitching burner")
+                  world_item = await self.dependencies.world.remove_item_async(current_loc, "glitching burner")
                   
                   if world_item:
                       player.weapons.append(world_item)
@@ -1535,7 +1663,7 @@ class ActionManager(AsyncCmd):
                  return
 
         # Generic Pickup from World
-        world_item = self.dependencies.world.remove_item(current_loc, arg)
+        world_item = await self.dependencies.world.remove_item_async(current_loc, arg)
         if world_item:
             player.inventory.append(world_item)
             name = world_item.get('name') if isinstance(world_item, dict) else world_item
@@ -1591,7 +1719,7 @@ class ActionManager(AsyncCmd):
             
             # Add to World
             current_loc = self.dependencies.world.player_position
-            self.dependencies.world.add_item(current_loc, dropped_item)
+            await self.dependencies.world.add_item_async(current_loc, dropped_item)
             
             await self.io.send(f"You drop the \033[1m{name}\033[0m onto the concrete.")
         else:
@@ -0,0 +1,146 @@
+"""Pre-generated NPC lines for when the model cannot answer in time.
+
+do_say used to wait for as long as the request took and then print a
+"glitches out" error. Now a reply whose first words do not arrive within
+AI_CONFIG["say_deadline"] seconds (or that fails outright) is replaced by a
+bark: an in-character line generated offline (see generate_barks.py) and
+stored in SQLite by NPC, relationship status (e.g. "Fan") and the intent of
+the player's line. Looking one up is a single indexed query, so the worst
+case for an NPC reply is the deadline, not the model.
+"""
+
+import asyncio
+import logging
+import random
+import re
+
+from .role_manager import RockerboyAbility
+
+NEUTRAL = "Neutral"  # Relationship status of NPCs with no special relation to the player
+FALLBACK_INTENT = "chatter"
+
+# Intent -> (keywords, sample player line the barks for that intent answer).
+# Classification checks the intents in this order; "question" and "chatter"
+# are matched by shape rather than keywords.
+INTENTS = {
+    "threat": (("kill", "shoot", "hurt", "die", "dead", "gun", "or else"), "Talk, or I put a hole in you."),
+    "plea": (("help", "please", "need", "sorry", "beg"), "I need your help. Please."),
+    "thanks": (("thanks", "thank", "appreciate", "owe you"), "Thanks. I owe you one."),
+    "farewell": (("bye", "later", "see you", "gotta go"), "I'm heading out. Later."),
+    "greeting": (("hi", "hello", "hey", "yo", "sup"), "Hey. Got a minute?"),
+    "question": ((), "What do you know about what's going on around here?"),
+    FALLBACK_INTENT: ((), "So. How's business?"),
+}
+
+_QUESTION_WORDS = {"who", "what", "where", "when", "why", "how", "which", "can", "do", "is", "are", "will"}
+
+
+def classify_intent(text) -> str:
+    """Rough intent of a player's line, used to pick a fitting bark."""
+    lowered = text.lower()
+    words = re.findall(r"[a-z']+", lowered)
+    for intent, (keywords, _) in INTENTS.items():
+        for keyword in keywords:
+            if (" " in keyword and keyword in lowered) or keyword in words:
+                return intent
+    if lowered.rstrip().endswith("?") or (words and words[0] in _QUESTION_WORDS):
+        return "question"
+    return FALLBACK_INTENT
+
+
+def npc_prompt(npc, player_handle, player_role):
+    """System prompt of a conversation with `npc` (shared by do_say and the bark generator)."""
+    return [
+        {
+            "role": "system",
+            "content": (
+                f"You are {npc.handle}, a {npc.role}. "
+                f"Description: {npc.description}. "
+                f"Context: {npc.dialogue_context}. "
+                f"You are talking to {player_handle} ({player_role}). "
+                "Keep responses short (under 2 sentences) and in-character (Cyberpunk slang). "
+                "Do not use quotes."
+            ),
+        }
+    ]
+
+
+def bark_messages(npc, relationship, intent):
+    """
+    The do_say request for a bark: the same system prompt and relationship
+    context, addressed to a player the NPC does not know by name.
+    """
+    messages = npc_prompt(npc, "a stranger", "Edgerunner")
+    # Only Rockerboys are told about fans; the context line is the one they get
+    social = RockerboyAbility().get_social_context(relationship)
+    if social:
+        messages.append({"role": "system", "content": social})
+    messages.append({"role": "user", "content": INTENTS[intent][1]})
+    return messages
+
+
+async def first_within(chunks, deadline):
+    """
+    `chunks` (an async iterator of reply fragments) if its first fragment
+    arrives within `deadline` seconds. Raises TimeoutError otherwise, after
+    cancelling the request, and StopAsyncIteration for an empty reply.
+    """
+    first = await asyncio.wait_for(anext(chunks), deadline)
+
+    async def stream():
+        yield first
+        async for chunk in chunks:
+            yield chunk
+
+    return stream()
+
+
+class BarkManager:
+    def __init__(self, db, rng=random):
+        self.db = db
+        self.rng = rng
+        self._last = {}  # NPC -> last bark shown, not repeated back to back
+        self.used = 0
+
+    async def pick(self, npc_handle, relationship, intent):
+        """
+        A stored line of `npc_handle` for `relationship` and `intent`, or None.
+        Prefers an exact match, then the neutral relationship, then small talk.
+        """
+        relationship = relationship or NEUTRAL
+        rows = await self.db.get_barks_async(npc_handle, {relationship, NEUTRAL}, {intent, FALLBACK_INTENT})
+        if not rows:
+            return None
+        rank = lambda row: (row["relationship"] == relationship, row["intent"] == intent)
+        best = max(rank(row) for row in rows)
+        lines = [row["text"] for row in rows if rank(row) == best]
+        if len(lines) > 1 and self._last.get(npc_handle) in lines:
+            lines.remove(self._last[npc_handle])
+        line = self.rng.choice(lines)
+        self._last[npc_handle] = line
+        self.used += 1
+        return line
+
+    async def generate(self, reply, npcs, per_key=3, relationships=(NEUTRAL, "Fan")):
+        """
+        Fill the library: `per_key` lines for every NPC, relationship and
+        intent. `reply` is an async (messages) -> text. Returns lines stored.
+        """
+        stored = 0
+        for npc in npcs:
+            rows = []
+            for relationship in relationships:
+                for intent in INTENTS:
+                    messages = bark_messages(npc, relationship, intent)
+                    for _ in range(per_key):
+                        try:
+                            text = (await reply(messages)).strip()
+                        except Exception as e:
+                            logging.warning(f"Bark for {npc.handle}/{relationship}/{intent} failed: {e}")
+                            continue
+                        if text:
+                            rows.append((npc.handle, relationship, intent, text))
+            self.db.add_barks(rows)
+            stored += len(rows)
+            logging.info(f"Stored {len(rows)} barks for {npc.handle}")
+        return stored
@@ -1,11 +1,10 @@
 # Change to singleton
-import json
 import uuid
-from pathlib import Path
 import logging
 
 
 from .character import Character
+from ..core.content_registry import ContentRegistry
 from .trait_manager import TraitManager
 from ..utils import DiceRoller, wprint
 import textwrap
@@ -13,8 +12,10 @@ from itertools import zip_longest
 
 
 class CharacterManager:
-    def __init__(self):
+    def __init__(self, registry=None):
         self.trait_manager = TraitManager()
+        # Static content is parsed once per process and shared between sessions
+        self.registry = registry if registry is not None else ContentRegistry.shared()
         self.characters = {}
         self.npcs = []
         self.load_characters()
@@ -36,47 +37,18 @@ class CharacterManager:
         return None
 
     def load_characters(self):
-        # Load Playable Characters
-        char_path = Path(__file__).parent.parent / "character_assets/characters.json"
-        
-        # Load NPCs
-        npc_path = Path(__file__).parent.parent / "character_assets/npcs.json"
-
-
-        with open(char_path) as f:
-            characters_data = json.load(f)
-        
-        # Helper to process character data list into Character objects
-        def process_chars(data_list, target_dict=None, target_list=None):
-            for char in data_list:
-                char["char_id"] = uuid.uuid4()
-                # Check if Ascii art exists, otherwise placeholder or skip
-                # Assuming ascii art files for NPCs exist or are managed similarly
-                if "ascii_art" in char:
-                   ascii_path = (
-                       Path(__file__).parent.parent / f'character_assets/{char["ascii_art"]}'
-                   )
-                   if ascii_path.exists():
-                       with open(ascii_path, "r", encoding="utf-8") as f:
-                            char["ascii_art"] = f.read()
-                   else:
-                       char["ascii_art"] = "No Art"
-                
-                soul = self.trait_manager.generate_random_soul()
-                character_obj = Character(**char, digital_soul=soul)
-                
-                if target_dict is not None:
-                    target_dict[character_obj.char_id] = character_obj
-                
-                if target_list is not None:
-                    target_list.append(character_obj)
-
-        process_chars(characters_data, target_dict=self.characters)
-
-        if npc_path.exists():
-            with open(npc_path) as f:
-                npcs_data = json.load(f)
-            process_chars(npcs_data, target_list=self.npcs)
+        """Build this session's Character objects from the content registry."""
+        for char in self.registry.character_records():
+            character_obj = self._make_character(char)
+            self.characters[character_obj.char_id] = character_obj
+
+        for char in self.registry.npc_records():
+            self.npcs.append(self._make_character(char))
+
+    def _make_character(self, char):
+        char["char_id"] = uuid.uuid4()
+        soul = self.trait_manager.generate_random_soul()
+        return Character(**char, digital_soul=soul)
 
 
     def roles(self, text=""):
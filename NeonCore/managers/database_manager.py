@@ -1,268 +1,605 @@
+import asyncio
+import copy
 import sqlite3
 import uuid
 import logging
 import os
 import json
 
+from ..core.async_sqlite import AsyncSQLite, connect
+from ..core.session import scoped_instance
+from .location_cache import LocationItemCache
+from .migrations import migrate
+
+
+# Queries and writes as functions of a connection, shared by the synchronous
+# methods (the session's own connection) and the *_async ones (AsyncSQLite).
+# Writes do not commit: the caller does, or the shared writer.
+
+def _template_id_by_name(conn, name):
+    row = conn.execute("SELECT id FROM item_templates WHERE name = ?", (name,)).fetchone()
+    return row['id'] if row else None
+
+
+def _template_id_like(conn, name):
+    row = conn.execute("SELECT id FROM item_templates WHERE name LIKE ?", (name,)).fetchone()
+    return row['id'] if row else None
+
+
+def _insert_template(conn, name, item_type, description, base_stats="{}"):
+    t_id = str(uuid.uuid4())
+    conn.execute('''
+        INSERT INTO item_templates (id, name, type, description, base_stats)
+        VALUES (?, ?, ?, ?, ?)
+    ''', (t_id, name, item_type, description, str(base_stats)))
+    return t_id
+
+
+def _insert_instance(conn, template_id, location_id=None, owner_id=None):
+    i_id = str(uuid.uuid4())
+    conn.execute('''
+        INSERT INTO item_instances (instance_id, template_id, location_id, owner_id, current_stats)
+        VALUES (?, ?, ?, ?, '{}')
+    ''', (i_id, template_id, location_id, owner_id))
+    return i_id
+
+
+def _items_in_location(conn, location_id):
+    cursor = conn.execute('''
+        SELECT i.instance_id, i.name, t.name as template_name, t.type, t.description 
+        FROM item_instances i
+        JOIN item_templates t ON i.template_id = t.id
+        WHERE i.location_id = ?
+    ''', (location_id,))
+
+    items = []
+    for row in cursor.fetchall():
+        # Merge template and instance data
+        item_data = dict(row)
+        # Use instance name if set, else template name
+        final_name = item_data['name'] if item_data['name'] else item_data['template_name']
+        items.append({
+            "id": item_data['instance_id'],
+            "name": final_name,
+            "type": item_data['type'],
+            "description": item_data['description']
+        })
+    return items
+
+
+# Template stats never change once created, so each template's base_stats is
+# parsed once (per process) and deep-copied into every item of that template
+_template_stats = {}  # template_id -> (base_stats JSON, parsed stats)
+
+
+def _base_stats(template_id, base_stats):
+    cached = _template_stats.get(template_id)
+    if cached is None or cached[0] != base_stats:
+        stats = {}
+        if base_stats:
+            try:
+                stats = json.loads(base_stats)
+            except:
+                pass
+        cached = _template_stats[template_id] = (base_stats, stats)
+    return copy.deepcopy(cached[1])
+
+
+_ITEM_SELECT = '''
+    SELECT i.instance_id, i.name, i.current_stats, t.id as template_id, t.name as template_name,
+           t.type, t.description, t.base_stats
+    FROM item_instances i
+    JOIN item_templates t ON i.template_id = t.id
+'''
+
+
+def _merged_item(row):
+    item_data = dict(row)
+    final_name = item_data['name'] if item_data['name'] else item_data['template_name']
+
+    # 1. Template Stats (Base)
+    stats = _base_stats(item_data['template_id'], item_data['base_stats'])
+
+    # 2. Parse/Merge Instance Stats (Current/Mutable Overrides)
+    if item_data['current_stats']:
+        try:
+            curr = json.loads(item_data['current_stats'])
+            stats.update(curr) # Instance overrides Template
+        except:
+            pass
+
+    return {
+        "id": item_data['instance_id'],
+        "name": final_name,
+        "type": item_data['type'],
+        "description": item_data['description'],
+        **stats # Merge combined stats
+    }
+
+
+def _item(conn, instance_id):
+    row = conn.execute(f"{_ITEM_SELECT} WHERE i.instance_id = ?", (instance_id,)).fetchone()
+    return _merged_item(row) if row else None
+
+
+def _items(conn, instance_ids):
+    ids = list(dict.fromkeys(instance_ids))
+    found = {}
+    # Chunked to stay well below SQLite's limit on bound parameters
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        cursor = conn.execute(f"{_ITEM_SELECT} WHERE i.instance_id IN ({', '.join('?' * len(chunk))})", chunk)
+        for row in cursor.fetchall():
+            item = _merged_item(row)
+            found[item["id"]] = item
+    return {i_id: found[i_id] for i_id in ids if i_id in found}  # In the order asked for
+
+
+def _items_by_owner(conn, owner_id):
+    cursor = conn.execute(f"{_ITEM_SELECT} WHERE i.owner_id = ? ORDER BY i.rowid", (owner_id,))
+    return [_merged_item(row) for row in cursor.fetchall()]
+
+
+def _move_items(conn, rows):
+    # rows: (location_id, owner_id, instance_id), as LocationItemCache.dirty() gives them
+    conn.executemany('''
+        UPDATE item_instances 
+        SET location_id = ?, owner_id = ?
+        WHERE instance_id = ?
+    ''', rows)
+    return True
+
+
+def _location_entry(item):
+    # An item as _items_in_location() lists it
+    return {key: item[key] for key in ("id", "name", "type", "description")}
+
+
+def _set_instance_stats(conn, instance_id, new_stats):
+    conn.execute('''
+        UPDATE item_instances 
+        SET current_stats = ?
+        WHERE instance_id = ?
+    ''', (json.dumps(new_stats), instance_id))
+    return True
+
+
+def _upsert_player(conn, handle, location_id, stats, inventory_ids, equipped_ids):
+    # Upsert (Insert or Replace)
+    conn.execute('''
+        INSERT OR REPLACE INTO player_saves (handle, location_id, stats, inventory_ids, equipped_ids)
+        VALUES (?, ?, ?, ?, ?)
+    ''', (handle, location_id, json.dumps(stats), json.dumps(inventory_ids), json.dumps(equipped_ids)))
+    return True
+
+
+def _player(conn, handle):
+    row = conn.execute("SELECT * FROM player_saves WHERE handle = ?", (handle,)).fetchone()
+    return dict(row) if row else None
+
+
+def _barks(conn, npc, relationships, intents):
+    relationships, intents = list(relationships), list(intents)
+    rows = conn.execute(
+        f"""
+        SELECT relationship, intent, text FROM npc_barks
+        WHERE npc = ?
+          AND relationship IN ({", ".join("?" * len(relationships))})
+          AND intent IN ({", ".join("?" * len(intents))})
+        """,
+        (npc, *relationships, *intents),
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+class UnitOfWork:
+    """
+    Item and player writes collected in memory and applied together: one
+    transaction (one commit) with one executemany per statement. Instance IDs
+    are assigned up front, so they can be handed out before the commit.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.templates = {}  # name -> (placeholder id, type, description, base_stats)
+        self.instances = []  # (instance_id, template placeholder or id, location_id, owner_id)
+        self.stats = {}  # instance_id -> current_stats (the last update wins)
+        self.players = {}  # handle -> (location_id, stats, inventory_ids, equipped_ids)
+        self.moves = []  # Pending item moves of the location cache, written along
+
+    def template(self, name, item_type, description, base_stats="{}"):
+        """
+        The template called `name`, for create_instance() in this unit. An
+        existing template is reused at commit; otherwise one is created from
+        these fields.
+        """
+        if name not in self.templates:
+            self.templates[name] = (str(uuid.uuid4()), item_type, description, str(base_stats))
+        return self.templates[name][0]
+
+    def create_instance(self, template_id, location_id=None, owner_id=None):
+        """Spawn an instance at commit; returns its ID now."""
+        i_id = str(uuid.uuid4())
+        self.instances.append((i_id, template_id, location_id, owner_id))
+        return i_id
+
+    def update_instance_stats(self, instance_id, new_stats):
+        self.stats[instance_id] = json.dumps(new_stats)
+
+    def save_player(self, handle, location_id, stats, inventory_ids, equipped_ids):
+        self.players[handle] = (location_id, json.dumps(stats), json.dumps(inventory_ids), json.dumps(equipped_ids))
+
+    def _apply(self, conn):
+        # Template names are unique: existing ones are kept, and every name resolved to its ID
+        conn.executemany('''
+            INSERT OR IGNORE INTO item_templates (id, name, type, description, base_stats)
+            VALUES (?, ?, ?, ?, ?)
+        ''', [(t_id, name, *fields) for name, (t_id, *fields) in self.templates.items()])
+        template_ids = {}
+        names = list(self.templates)
+        if names:
+            cursor = conn.execute(
+                f"SELECT id, name FROM item_templates WHERE name IN ({', '.join('?' * len(names))})", names
+            )
+            stored = {row['name']: row['id'] for row in cursor.fetchall()}
+            template_ids = {t_id: stored[name] for name, (t_id, *_) in self.templates.items()}
+
+        conn.executemany('''
+            INSERT INTO item_instances (instance_id, template_id, location_id, owner_id, current_stats)
+            VALUES (?, ?, ?, ?, '{}')
+        ''', [(i_id, template_ids.get(t_id, t_id), loc, owner) for i_id, t_id, loc, owner in self.instances])
+        _move_items(conn, self.moves)
+        conn.executemany('''
+            UPDATE item_instances 
+            SET current_stats = ?
+            WHERE instance_id = ?
+        ''', [(stats, i_id) for i_id, stats in self.stats.items()])
+        conn.executemany('''
+            INSERT OR REPLACE INTO player_saves (handle, location_id, stats, inventory_ids, equipped_ids)
+            VALUES (?, ?, ?, ?, ?)
+        ''', [(handle, *fields) for handle, fields in self.players.items()])
+        return True
+
+    def commit(self):
+        """Apply every collected write in one transaction; False (and nothing stored) on error."""
+        self.moves = self.db.location_cache.dirty()
+        return self._committed(self.db._write("apply unit of work", self._apply, failed=False))
+
+    async def commit_async(self):
+        self.moves = self.db.location_cache.dirty()
+        return self._committed(await self.db._write_async("apply unit of work", self._apply, failed=False))
+
+    def _committed(self, ok):
+        if ok:
+            cache = self.db.location_cache
+            cache.written(self.moves)
+            for loc in {loc for _, _, loc, _ in self.instances}:
+                cache.invalidate(loc)
+        return ok
+
+
 class DatabaseManager:
+    """Per-session singleton: each game session owns its own connection."""
     _instance = None
     
     
     def __new__(cls, db_path=None):
-        if cls._instance is None:
-            cls._instance = super(DatabaseManager, cls).__new__(cls)
-            
-            if db_path is None:
-                # Default to Project Root (../../ from managers dir)
-                base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-                db_path = os.path.join(base_dir, "neoncore.db")
-                
-            cls._instance.db_path = db_path
-            cls._instance.connection = None
-            cls._instance._initialize_db()
-        return cls._instance
+        return scoped_instance(cls, lambda: cls._create(db_path))
+
+    @classmethod
+    def _create(cls, db_path):
+        instance = super(DatabaseManager, cls).__new__(cls)
+
+        if db_path is None:
+            # Default to Project Root (../../ from managers dir)
+            base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            db_path = os.path.join(base_dir, "neoncore.db")
+
+        instance.db_path = db_path
+        instance.connection = None
+        instance._store = None
+        instance._location_cache = None
+        instance._flush_task = None
+        instance._initialize_db()
+        return instance
 
     def _get_connection(self):
         """Establish or return existing connection."""
         if self.connection is None:
             try:
-                self.connection = sqlite3.connect(self.db_path)
-                self.connection.row_factory = sqlite3.Row  # Access columns by name
+                self.connection = connect(self.db_path)  # WAL mode, rows by column name
             except sqlite3.Error as e:
                 logging.error(f"Database connection failed: {e}")
                 return None
         return self.connection
 
     def _initialize_db(self):
-        """Create necessary tables if they don't exist."""
+        """Create the tables, or bring an existing database up to date (see migrations.py)."""
         conn = self._get_connection()
         if not conn:
             return
 
-        cursor = conn.cursor()
-        
-        # 1. Item Templates (Base Definitions)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS item_templates (
-                id TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                type TEXT NOT NULL,
-                description TEXT,
-                base_stats JSON  -- Store stats like damage, armor, effect, etc.
-            )
-        ''')
-        
-        # 2. Item Instances (Unique Entities)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS item_instances (
-                instance_id TEXT PRIMARY KEY,
-                template_id TEXT NOT NULL,
-                name TEXT, -- Optional override name
-                owner_id TEXT, -- Character Handle or NULL
-                location_id TEXT, -- Location ID or NULL
-                current_stats JSON, -- Mutable stats (ammo, condition)
-                FOREIGN KEY (template_id) REFERENCES item_templates(id)
-            )
-        ''')
-
-        # 3. Player Saves (Persistence)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS player_saves (
-                handle TEXT PRIMARY KEY,
-                location_id TEXT,
-                stats JSON,         -- HP, SP, etc.
-                inventory_ids JSON, -- List of Item UUIDs
-                equipped_ids JSON   -- List of Item UUIDs
-            )
-        ''')
-
-        conn.commit()
+        try:
+            migrate(conn)
+        except sqlite3.Error as e:
+            logging.error(f"Database migration failed: {e}")
+            return
         logging.info("Database initialized successfully.")
 
+    @property
+    def store(self) -> AsyncSQLite:
+        """Reader threads and the shared writer for this database (used by the *_async methods)."""
+        if self._store is None:
+            self._store = AsyncSQLite.acquire(self.db_path)
+        return self._store
+
+    @property
+    def location_cache(self) -> LocationItemCache:
+        """Items per location, shared with the other sessions on this database."""
+        if self._location_cache is None:
+            self._location_cache = LocationItemCache.acquire(self.db_path)
+        return self._location_cache
+
+    _closing = set()  # close_async() tasks started by close() on the event loop
+
     def close(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is not None:
+            # A flush here would wait on the shared writer with the loop blocked: close through it
+            task = loop.create_task(self.close_async())
+            DatabaseManager._closing.add(task)
+            task.add_done_callback(DatabaseManager._closing.discard)
+            return
+        if self._location_cache is not None:
+            self.flush()  # Item moves are not lost with the session
+            self._release_cache()
+        self._close_connection()
+        if self._store is not None:
+            self._store.release()
+            self._store = None
+
+    async def close_async(self):
+        """close() from the event loop: pending moves and queued writes go through the shared writer."""
+        if self._location_cache is not None:
+            await self.flush_async()
+            self._release_cache()
+        self._close_connection()
+        if self._store is not None:
+            store, self._store = self._store, None
+            await store.release_async()
+
+    def _release_cache(self):
+        self._location_cache.unschedule()
+        self._location_cache.release()
+        self._location_cache = None
+
+    def _close_connection(self):
         if self.connection:
             self.connection.close()
             self.connection = None
 
     
+    def unit_of_work(self) -> UnitOfWork:
+        """Collect writes to apply in one transaction (see UnitOfWork)."""
+        return UnitOfWork(self)
+
+    def _write(self, what, fn, *args, failed=None):
+        """Run the write `fn(conn, *args)` and commit; `failed` is returned on error."""
+        conn = self._get_connection()
+        try:
+            result = fn(conn, *args)
+            conn.commit()
+            return result
+        except sqlite3.Error as e:
+            conn.rollback()
+            logging.error(f"Failed to {what}: {e}")
+            return failed
+
+    async def _write_async(self, what, fn, *args, failed=None):
+        """_write() through the shared writer, off the event loop."""
+        try:
+            return await self.store.write(fn, *args)
+        except sqlite3.Error as e:
+            logging.error(f"Failed to {what}: {e}")
+            return failed
+
+    def flush(self):
+        """Write the item moves the location cache holds back; False if that failed."""
+        rows = self.location_cache.dirty()
+        if not rows:
+            return True
+        if not self._write("write item moves", _move_items, rows, failed=False):
+            return False
+        self.location_cache.written(rows)
+        return True
+
+    async def flush_async(self):
+        # Moves made while a flush is under way are pending again: repeat until none are
+        while True:
+            rows = self.location_cache.dirty()
+            if not rows:
+                return True
+            if not await self._write_async("write item moves", _move_items, rows, failed=False):
+                return False
+            self.location_cache.written(rows)
+
+    def _flush_later(self, now=False):
+        """
+        On the event loop: have the pending moves written by the shared writer,
+        `now` or once the oldest is due. False if there is no loop (a script).
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        if now:
+            self._flush_in_background()
+        else:
+            self.location_cache.schedule(loop, self._flush_in_background)
+        return True
+
+    def _flush_in_background(self):
+        self._flush_task = asyncio.get_running_loop().create_task(self.flush_async())
+
     def get_template_id_by_name(self, name):
         """Find a template ID by exact name."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT id FROM item_templates WHERE name = ?", (name,))
-        row = cursor.fetchone()
-        return row['id'] if row else None
+        return _template_id_by_name(self._get_connection(), name)
+
+    async def get_template_id_by_name_async(self, name):
+        return await self.store.read(_template_id_by_name, name)
+
+    def find_template_id(self, name):
+        """Find a template ID by name, ignoring case (SQL LIKE)."""
+        return _template_id_like(self._get_connection(), name)
+
+    async def find_template_id_async(self, name):
+        return await self.store.read(_template_id_like, name)
 
     # --- Item Operations ---
 
     def create_template(self, name, item_type, description, base_stats="{}"):
         """Create a new item template."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        t_id = str(uuid.uuid4())
-        
-        try:
-            cursor.execute('''
-                INSERT INTO item_templates (id, name, type, description, base_stats)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (t_id, name, item_type, description, str(base_stats)))
-            conn.commit()
-            return t_id
-        except sqlite3.Error as e:
-            logging.error(f"Failed to create template: {e}")
-            return None
+        return self._write("create template", _insert_template, name, item_type, description, base_stats)
+
+    async def create_template_async(self, name, item_type, description, base_stats="{}"):
+        return await self._write_async("create template", _insert_template, name, item_type, description, base_stats)
 
     def create_instance(self, template_id, location_id=None, owner_id=None):
         """Spawn a unique instance of an item."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        i_id = str(uuid.uuid4())
-        
-        try:
-            cursor.execute('''
-                INSERT INTO item_instances (instance_id, template_id, location_id, owner_id, current_stats)
-                VALUES (?, ?, ?, ?, '{}')
-            ''', (i_id, template_id, location_id, owner_id))
-            conn.commit()
-            return i_id
-        except sqlite3.Error as e:
-            logging.error(f"Failed to create instance: {e}")
-            return None
+        i_id = self._write("create instance", _insert_instance, template_id, location_id, owner_id)
+        self.location_cache.invalidate(location_id)
+        return i_id
+
+    async def create_instance_async(self, template_id, location_id=None, owner_id=None):
+        i_id = await self._write_async("create instance", _insert_instance, template_id, location_id, owner_id)
+        self.location_cache.invalidate(location_id)
+        return i_id
 
     def get_items_in_location(self, location_id):
-        """Retrieve all items in a specific location."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT i.instance_id, i.name, t.name as template_name, t.type, t.description 
-            FROM item_instances i
-            JOIN item_templates t ON i.template_id = t.id
-            WHERE i.location_id = ?
-        ''', (location_id,))
-        
-        items = []
-        for row in cursor.fetchall():
-            # Merge template and instance data
-            item_data = dict(row)
-            # Use instance name if set, else template name
-            final_name = item_data['name'] if item_data['name'] else item_data['template_name']
-            items.append({
-                "id": item_data['instance_id'],
-                "name": final_name,
-                "type": item_data['type'],
-                "description": item_data['description']
-            })
+        """Retrieve all items in a specific location (from the location cache when it has them)."""
+        cache = self.location_cache
+        items = cache.get(location_id)
+        if items is None:
+            version = cache.version(location_id)
+            items = _items_in_location(self._get_connection(), location_id)
+            items = self._with_pending_moves(items, lambda loc, owner: loc == location_id, _location_entry)
+            cache.fill(location_id, items, version)
+        return items
+
+    def _with_pending_moves(self, items, ends_here, entry=dict):
+        """
+        `items` read from the session's connection, as they will be once the
+        pending moves are written (`ends_here(location_id, owner_id)`: whether
+        a move puts an item among them). Saves a flush on the event loop.
+        """
+        pending = self.location_cache.pending()
+        if not pending:
+            return items
+        items = [item for item in items if item["id"] not in pending or ends_here(*pending[item["id"]])]
+        listed = {item["id"] for item in items}
+        arriving = [i_id for i_id, move in pending.items() if ends_here(*move) and i_id not in listed]
+        if arriving:
+            items += [entry(item) for item in _items(self._get_connection(), arriving).values()]
+        return items
+
+    async def get_items_in_location_async(self, location_id):
+        cache = self.location_cache
+        items = cache.get(location_id)
+        if items is None:
+            await self.flush_async()
+            version = cache.version(location_id)
+            items = await self.store.read(_items_in_location, location_id)
+            cache.fill(location_id, items, version)
         return items
 
-    
     def get_item(self, instance_id):
         """Retrieve a specific item by ID."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        # Select current_stats as well
-        cursor.execute('''
-            SELECT i.instance_id, i.name, i.current_stats, t.name as template_name, t.type, t.description, t.base_stats
-            FROM item_instances i
-            JOIN item_templates t ON i.template_id = t.id
-            WHERE i.instance_id = ?
-        ''', (instance_id,))
-        
-        row = cursor.fetchone()
-        if row:
-            item_data = dict(row)
-            final_name = item_data['name'] if item_data['name'] else item_data['template_name']
-            
-            # 1. Parse Template Stats (Base)
-            stats = {}
-            if item_data['base_stats']:
-                try:
-                    stats = json.loads(item_data['base_stats'])
-                except:
-                    pass
-            
-            # 2. Parse/Merge Instance Stats (Current/Mutable Overrides)
-            if item_data['current_stats']:
-                try:
-                    curr = json.loads(item_data['current_stats'])
-                    stats.update(curr) # Instance overrides Template
-                except:
-                    pass
-            
-            return {
-                "id": item_data['instance_id'],
-                "name": final_name,
-                "type": item_data['type'],
-                "description": item_data['description'],
-                **stats # Merge combined stats
-            }
-        return None
+        return _item(self._get_connection(), instance_id)
+
+    async def get_item_async(self, instance_id):
+        return await self.store.read(_item, instance_id)
+
+    def get_items(self, instance_ids):
+        """Retrieve several items in one query: {instance_id: item} for those that exist."""
+        return _items(self._get_connection(), instance_ids)
+
+    async def get_items_async(self, instance_ids):
+        return await self.store.read(_items, instance_ids)
+
+    def get_items_by_owner(self, owner_id):
+        """Retrieve all items owned by a character, oldest first (then those given since the last flush)."""
+        items = _items_by_owner(self._get_connection(), owner_id)
+        return self._with_pending_moves(items, lambda loc, owner: owner == owner_id)
+
+    async def get_items_by_owner_async(self, owner_id):
+        await self.flush_async()
+        return await self.store.read(_items_by_owner, owner_id)
 
     def update_item_state(self, instance_id, location_id=None, owner_id=None):
-        """Move an item to a new location or owner."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        try:
-            cursor.execute('''
-                UPDATE item_instances 
-                SET location_id = ?, owner_id = ?
-                WHERE instance_id = ?
-            ''', (location_id, owner_id, instance_id))
-            conn.commit()
-            return True
-        except sqlite3.Error as e:
-            logging.error(f"Failed to move item: {e}")
+        """Move an item to a new location or owner (written back later, see LocationItemCache)."""
+        self.location_cache.move(instance_id, location_id, owner_id)
+        return self._write_back()
+
+    async def update_item_state_async(self, instance_id, location_id=None, owner_id=None):
+        self.location_cache.move(instance_id, location_id, owner_id)
+        return await self._write_back_async()
+
+    def take_item(self, instance_id, location_id):
+        """Pick up an item (written back later) if it is still at `location_id`; False if it is gone."""
+        if not self.location_cache.move(instance_id, from_location=location_id):
             return False
+        self._write_back()
+        return True
+
+    async def take_item_async(self, instance_id, location_id):
+        if not self.location_cache.move(instance_id, from_location=location_id):
+            return False
+        await self._write_back_async()
+        return True
+
+    def _write_back(self):
+        due = self.location_cache.due()
+        if self._flush_later(now=due) or not due:
+            return True
+        return self.flush()  # No event loop: written here
+
+    async def _write_back_async(self):
+        if self.location_cache.due():
+            return await self.flush_async()
+        self._flush_later()
+        return True
 
     def update_instance_stats(self, instance_id, new_stats):
         """Update the mutable stats (current_stats) of an item instance."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        try:
-            cursor.execute('''
-                UPDATE item_instances 
-                SET current_stats = ?
-                WHERE instance_id = ?
-            ''', (json.dumps(new_stats), instance_id))
-            conn.commit()
-            return True
-        except sqlite3.Error as e:
-            logging.error(f"Failed to update item stats: {e}")
-            return False
+        return self._write("update item stats", _set_instance_stats, instance_id, new_stats, failed=False)
+
+    async def update_instance_stats_async(self, instance_id, new_stats):
+        return await self._write_async(
+            "update item stats", _set_instance_stats, instance_id, new_stats, failed=False
+        )
 
     # --- Player Persistence ---
 
     def save_player(self, handle, location_id, stats, inventory_ids, equipped_ids):
         """Save player state to DB."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        # Upsert (Insert or Replace)
-        try:
-            cursor.execute('''
-                INSERT OR REPLACE INTO player_saves (handle, location_id, stats, inventory_ids, equipped_ids)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (handle, location_id, json.dumps(stats), json.dumps(inventory_ids), json.dumps(equipped_ids)))
-            conn.commit()
-            return True
-        except sqlite3.Error as e:
-            logging.error(f"Failed to save player: {e}")
-            return False
+        return self._write(
+            "save player", _upsert_player, handle, location_id, stats, inventory_ids, equipped_ids, failed=False
+        )
+
+    async def save_player_async(self, handle, location_id, stats, inventory_ids, equipped_ids):
+        return await self._write_async(
+            "save player", _upsert_player, handle, location_id, stats, inventory_ids, equipped_ids, failed=False
+        )
 
     def load_player(self, handle):
         """Load player state from DB."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT * FROM player_saves WHERE handle = ?", (handle,))
-        row = cursor.fetchone()
-        
-        if row:
-            return dict(row)
-        return None
+        return _player(self._get_connection(), handle)
+
+    async def load_player_async(self, handle):
+        return await self.store.read(_player, handle)
 
     def delete_player(self, handle):
         """Delete a player's save file."""
@@ -285,3 +622,35 @@ class DatabaseManager:
         cursor.execute("SELECT handle FROM player_saves")
         rows = cursor.fetchall()
         return [row['handle'] for row in rows]
+
+    # --- NPC Barks ---
+
+    def add_barks(self, barks):
+        """Store pre-generated lines: (npc, relationship, intent, text) tuples."""
+        conn = self._get_connection()
+        try:
+            conn.executemany(
+                "INSERT INTO npc_barks (npc, relationship, intent, text) VALUES (?, ?, ?, ?)",
+                list(barks),
+            )
+            conn.commit()
+            return True
+        except sqlite3.Error as e:
+            logging.error(f"Failed to store barks: {e}")
+            return False
+
+    def get_barks(self, npc, relationships, intents):
+        """Lines of `npc` for any of `relationships` and `intents` (one indexed lookup)."""
+        return _barks(self._get_connection(), npc, relationships, intents)
+
+    async def get_barks_async(self, npc, relationships, intents):
+        return await self.store.read(_barks, npc, relationships, intents)
+
+    def delete_barks(self, npc=None):
+        """Remove the stored lines of `npc` (all NPCs if None)."""
+        conn = self._get_connection()
+        if npc is None:
+            conn.execute("DELETE FROM npc_barks")
+        else:
+            conn.execute("DELETE FROM npc_barks WHERE npc = ?", (npc,))
+        conn.commit()
@@ -0,0 +1,94 @@
+"""Speculative NPC greetings, generated when the player enters a location.
+
+The first `talk` with an NPC used to leave the player looking at a silent
+NPC, and the first `say` paid for a cold model call. Entering a location now
+starts generating an opening line for every NPC there at thought priority,
+while the player reads the room. `talk` uses a line that is ready:
+
+- a greeting is only used for the prompt it was generated for (the
+  conversation has not moved on since) and while it is younger than
+  AI_CONFIG["greeting_ttl"] seconds,
+- a greeting still being generated when the player talks is cancelled, not
+  waited for,
+- leaving the location (or closing the session) cancels the greetings still
+  being generated and forgets the unused ones.
+
+For a local model, the prefetch also loads the NPC's prompt prefix into the
+model's cache, so the first `say` starts warm as well.
+"""
+
+import asyncio
+import logging
+import time
+
+from ..config import AI_CONFIG
+
+# Stands in for the player's first line: the NPC speaks first
+GREETING_CUE = "({player} walks up to you. Greet them with one short line, in character.)"
+
+
+class GreetingManager:
+    def __init__(self, generate, ttl=None, clock=time.monotonic):
+        self.generate = generate  # async (messages) -> greeting text
+        self.ttl = AI_CONFIG["greeting_ttl"] if ttl is None else ttl
+        self.clock = clock
+        self._pending = {}  # NPC -> (messages, started, task)
+        self.stats = {"used": 0, "cancelled": 0, "stale": 0, "failed": 0}
+
+    def prefetch(self, npc, messages):
+        """Start generating a greeting for `messages` in the background, unless one is already there."""
+        entry = self._pending.get(npc)
+        if entry and entry[0] == messages and not entry[2].cancelled():
+            return entry[2]
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+        self._discard(npc)
+        task = loop.create_task(self._run(npc, messages))
+        self._pending[npc] = (messages, self.clock(), task)
+        return task
+
+    async def _run(self, npc, messages):
+        try:
+            return (await self.generate(messages)).strip()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Speculative: the conversation simply starts without a greeting
+            self.stats["failed"] += 1
+            logging.debug(f"Greeting prefetch for {npc} failed: {e}")
+            return None
+
+    def take(self, npc, messages):
+        """The greeting prefetched for `messages`, if it is ready and fresh; None otherwise."""
+        entry = self._pending.pop(npc, None)
+        if entry is None:
+            return None
+        prefetched, started, task = entry
+        if not task.done():
+            task.cancel()
+            self.stats["cancelled"] += 1
+            return None
+        if task.cancelled() or task.result() is None:
+            return None
+        if prefetched != messages or self.clock() - started > self.ttl:
+            self.stats["stale"] += 1
+            return None
+        self.stats["used"] += 1
+        return task.result()
+
+    def _discard(self, npc):
+        entry = self._pending.pop(npc, None)
+        if entry and not entry[2].done():
+            entry[2].cancel()
+            self.stats["cancelled"] += 1
+
+    def cancel(self):
+        """The player left: cancel greetings still being generated and forget the rest."""
+        for npc in list(self._pending):
+            self._discard(npc)
+
+    def close(self):
+        """Cancel greetings still being generated (the session is over)."""
+        self.cancel()
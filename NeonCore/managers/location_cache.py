@@ -0,0 +1,205 @@
+"""In-memory items per location, shared by every session using a database file.
+
+Every `look` (and the pickups and reminders around it) asked SQLite for the
+items in the player's location. LocationItemCache keeps those lists:
+
+- a location's items are read from SQLite once, then served from memory,
+- each location has a version, bumped by every change to it; a read that
+  started before a change does not fill the cache with what it found,
+- item moves (update_item_state) are write-back: the cache changes at once,
+  the database later. Pending moves are flushed when there are
+  DB_CONFIG["writeback_max"] of them or the oldest is
+  DB_CONFIG["writeback_delay"] seconds old (a timer on the event loop, set by
+  the first pending move), before the async queries that depend on where
+  items are, with a save (UnitOfWork) and when a session closes. The sync
+  queries, which run on the event loop, do not write: they apply the pending
+  moves to what they read,
+- pickups (take_item) are write-back moves too, made only if the item is
+  still in that location as far as the cache knows (checked under its lock),
+  so two players cannot both take it,
+- new instances (create_instance) invalidate their location.
+
+The cache assumes one game server process writes the database.
+"""
+
+import threading
+import time
+
+from ..config import DB_CONFIG
+
+
+class LocationItemCache:
+    """Items per location, and the item moves not yet written."""
+
+    _caches = {}  # db_path -> LocationItemCache
+    _lock = threading.Lock()
+
+    def __init__(self, db_path, max_dirty=None, delay=None, clock=time.monotonic):
+        self.db_path = db_path
+        self.max_dirty = max_dirty or DB_CONFIG["writeback_max"]
+        self.delay = delay if delay is not None else DB_CONFIG["writeback_delay"]
+        self.clock = clock
+        self._entries = {}  # location_id -> [item dicts]
+        self._versions = {}  # location_id -> changes so far
+        self._where = {}  # instance_id -> location_id, for cached items
+        self._dirty = {}  # instance_id -> (location_id, owner_id), not yet written
+        self._dirty_since = None
+        self._timer = None  # (loop, handle) of the scheduled flush
+        self._mutex = threading.Lock()
+        self.users = 0
+        self.stats = {"hits": 0, "misses": 0, "flushes": 0, "moves": 0}
+
+    @classmethod
+    def acquire(cls, db_path) -> "LocationItemCache":
+        """The cache for `db_path`; release() it when done."""
+        with cls._lock:
+            cache = cls._caches.get(db_path)
+            if cache is None:
+                cache = cls._caches[db_path] = cls(db_path)
+            cache.users += 1
+            return cache
+
+    def release(self):
+        """One user less; the last one drops the cache (flush it first)."""
+        with LocationItemCache._lock:
+            self.users -= 1
+            if self.users <= 0 and LocationItemCache._caches.get(self.db_path) is self:
+                del LocationItemCache._caches[self.db_path]
+
+    # --- Reads ---
+
+    def version(self, location_id):
+        """Take before reading a location from SQLite; pass to fill()."""
+        return self._versions.get(location_id, 0)
+
+    def get(self, location_id):
+        """Copies of the cached items, or None on a miss."""
+        with self._mutex:
+            items = self._entries.get(location_id)
+            if items is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            return [dict(item) for item in items]
+
+    def fill(self, location_id, items, version):
+        """Cache what SQLite returned, unless the location changed since `version`."""
+        with self._mutex:
+            if self._versions.get(location_id, 0) != version:
+                return
+            self._entries[location_id] = [dict(item) for item in items]
+            for item in items:
+                self._where[item["id"]] = location_id
+
+    # --- Changes ---
+
+    def _bump(self, location_id):
+        self._versions[location_id] = self._versions.get(location_id, 0) + 1
+
+    def invalidate(self, location_id):
+        """Forget a location (something was added there behind the cache's back)."""
+        if location_id is None:
+            return
+        with self._mutex:
+            self._bump(location_id)
+            for item in self._entries.pop(location_id, []):
+                self._where.pop(item["id"], None)
+
+    def move(self, instance_id, location_id=None, owner_id=None, from_location=None):
+        """
+        Record a move: applied to the cache now, to the database at the next
+        flush. With `from_location`, the item is only moved if it is still
+        there as far as the cache knows; returns whether it was moved.
+        """
+        with self._mutex:
+            if from_location is not None and self._location_of(instance_id, from_location) != from_location:
+                return False
+
+            item = None
+            old = self._where.pop(instance_id, None)
+            if old is not None:
+                self._bump(old)
+                items = self._entries.get(old, [])
+                for i, cached in enumerate(items):
+                    if cached["id"] == instance_id:
+                        item = items.pop(i)
+                        break
+
+            if location_id is not None:
+                self._bump(location_id)
+                if location_id in self._entries:
+                    if item is None:
+                        # Not known how it looks: read the location again
+                        for cached in self._entries.pop(location_id):
+                            self._where.pop(cached["id"], None)
+                    else:
+                        self._entries[location_id].append(item)
+                        self._where[instance_id] = location_id
+
+            if not self._dirty:
+                self._dirty_since = self.clock()
+            self._dirty[instance_id] = (location_id, owner_id)  # A later move replaces an earlier one
+            self.stats["moves"] += 1
+            return True
+
+    def _location_of(self, instance_id, default):
+        if instance_id in self._dirty:
+            return self._dirty[instance_id][0]
+        if instance_id in self._where:
+            return self._where[instance_id]
+        if default in self._entries:
+            return None  # The location is cached, without the item
+        return default  # Not cached: taken to be there
+
+    # --- Write-back ---
+
+    def dirty(self):
+        """The pending moves, as (location_id, owner_id, instance_id) rows."""
+        with self._mutex:
+            return [(loc, owner, i_id) for i_id, (loc, owner) in self._dirty.items()]
+
+    def pending(self):
+        """The pending moves, as {instance_id: (location_id, owner_id)}."""
+        with self._mutex:
+            return dict(self._dirty)
+
+    def due(self):
+        """Whether the pending moves should be written now."""
+        if not self._dirty:
+            return False
+        return len(self._dirty) >= self.max_dirty or self.clock() - self._dirty_since >= self.delay
+
+    def written(self, rows):
+        """The flushed `rows` are stored (moves made since are still pending)."""
+        with self._mutex:
+            for loc, owner, i_id in rows:
+                if self._dirty.get(i_id) == (loc, owner):
+                    del self._dirty[i_id]
+            self._dirty_since = self.clock() if self._dirty else None
+            self.stats["flushes"] += 1
+            if not self._dirty:
+                self._unschedule()
+
+    def schedule(self, loop, flush):
+        """Have `flush()` called on `loop` once the oldest pending move is due (unless already set)."""
+        with self._mutex:
+            if not self._dirty:
+                return
+            if self._timer is not None and self._timer[0] is loop and not loop.is_closed():
+                return
+            wait = max(0.0, self.delay - (self.clock() - self._dirty_since))
+            self._timer = (loop, loop.call_later(wait, self._fire, flush))
+
+    def unschedule(self):
+        """Cancel the scheduled flush (its owner is going away)."""
+        with self._mutex:
+            self._unschedule()
+
+    def _fire(self, flush):
+        self._timer = None
+        flush()
+
+    def _unschedule(self):
+        if self._timer is not None:
+            self._timer[1].cancel()
+            self._timer = None
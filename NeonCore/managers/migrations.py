@@ -0,0 +1,187 @@
+"""Versioned schema for the game database.
+
+Each migration is a function of a connection; its version is its position in
+MIGRATIONS (starting at 1), so new steps are only ever appended. The
+`schema_version` table records the steps applied to a database file, and
+migrate() runs the missing ones in order, each in its own transaction. Steps
+must also work on databases created before versioning (tables already there,
+no `schema_version` rows), hence the IF NOT EXISTS.
+"""
+
+import json
+import logging
+
+
+def _base_schema(conn):
+    """Item templates and instances, player saves, NPC barks"""
+    # 1. Item Templates (Base Definitions)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS item_templates (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            type TEXT NOT NULL,
+            description TEXT,
+            base_stats JSON  -- Store stats like damage, armor, effect, etc.
+        )
+    ''')
+
+    # 2. Item Instances (Unique Entities)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS item_instances (
+            instance_id TEXT PRIMARY KEY,
+            template_id TEXT NOT NULL,
+            name TEXT, -- Optional override name
+            owner_id TEXT, -- Character Handle or NULL
+            location_id TEXT, -- Location ID or NULL
+            current_stats JSON, -- Mutable stats (ammo, condition)
+            FOREIGN KEY (template_id) REFERENCES item_templates(id)
+        )
+    ''')
+
+    # 3. Player Saves (Persistence)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS player_saves (
+            handle TEXT PRIMARY KEY,
+            location_id TEXT,
+            stats JSON,         -- HP, SP, etc.
+            inventory_ids JSON, -- List of Item UUIDs
+            equipped_ids JSON   -- List of Item UUIDs
+        )
+    ''')
+
+    # 4. NPC Barks (pre-generated lines used when the model is too slow)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS npc_barks (
+            id INTEGER PRIMARY KEY,
+            npc TEXT NOT NULL,          -- NPC Handle
+            relationship TEXT NOT NULL, -- Relationship status to the player (Neutral, Fan)
+            intent TEXT NOT NULL,       -- Intent of the player's line (threat, question, ...)
+            text TEXT NOT NULL
+        )
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_npc_barks_key ON npc_barks (npc, relationship, intent)
+    ''')
+
+
+def _item_instance_indexes(conn):
+    """Index item instances by location (every look) and owner"""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_item_instances_location ON item_instances (location_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_item_instances_owner ON item_instances (owner_id)")
+
+
+def _stats(value):
+    try:
+        stats = json.loads(value) if value else {}
+    except ValueError:
+        return {}
+    return stats if isinstance(stats, dict) else {}
+
+
+def _keep_duplicate_stats(conn, dup, keep):
+    """Copy into the instances of template `dup` the base stats that differ from `keep`'s."""
+    dup_id, name, dup_type, dup_stats = dup
+    keep_id, _, keep_type, keep_stats = keep
+    dup_stats, keep_stats = _stats(dup_stats), _stats(keep_stats)
+    changed = {key: value for key, value in dup_stats.items() if keep_stats.get(key) != value}
+    if dup_type != keep_type:
+        logging.warning(f"Template {name!r}: instances of {dup_id} ({dup_type}) become {keep_type} ({keep_id})")
+    extra = sorted(set(keep_stats) - set(dup_stats))
+    if extra:
+        logging.warning(f"Template {name!r}: instances of {dup_id} gain the stats {extra} of {keep_id}")
+    if not changed:
+        return
+    instances = conn.execute(
+        "SELECT instance_id, current_stats FROM item_instances WHERE template_id = ?", (dup_id,)
+    ).fetchall()
+    # Instance stats override the template's, so they stay on top
+    conn.executemany(
+        "UPDATE item_instances SET current_stats = ? WHERE instance_id = ?",
+        [(json.dumps({**changed, **_stats(current)}), i_id) for i_id, current in instances],
+    )
+    if instances:
+        logging.warning(
+            f"Template {name!r}: {len(instances)} instance(s) of {dup_id} keep its stats {changed} "
+            f"(merged into {keep_id})"
+        )
+
+
+def _unique_template_names(conn):
+    """One template per name (duplicates merged into the oldest)"""
+    # The duplicate's type and stats go away with it: keep its stats on its instances
+    kept = {}
+    for t_id, name, t_type, base_stats in conn.execute(
+        "SELECT id, name, type, base_stats FROM item_templates ORDER BY rowid"
+    ).fetchall():
+        keep = kept.setdefault(name, (t_id, name, t_type, base_stats))
+        if keep[0] != t_id:
+            _keep_duplicate_stats(conn, (t_id, name, t_type, base_stats), keep)
+
+    # Point instances of a duplicate at the oldest template of that name, then drop the duplicates
+    conn.execute('''
+        UPDATE item_instances SET template_id = (
+            SELECT keep.id FROM item_templates dup
+            JOIN item_templates keep ON keep.name = dup.name
+            WHERE dup.id = item_instances.template_id
+            ORDER BY keep.rowid LIMIT 1
+        )
+        WHERE template_id IN (
+            SELECT id FROM item_templates
+            WHERE rowid NOT IN (SELECT MIN(rowid) FROM item_templates GROUP BY name)
+        )
+    ''')
+    conn.execute('''
+        DELETE FROM item_templates
+        WHERE rowid NOT IN (SELECT MIN(rowid) FROM item_templates GROUP BY name)
+    ''')
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_item_templates_name ON item_templates (name)")
+
+
+# Append only: a migration's version is its position in this list
+MIGRATIONS = [
+    _base_schema,
+    _item_instance_indexes,
+    _unique_template_names,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def schema_version(conn) -> int:
+    """The last migration applied to the database (0 for none)."""
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+
+def migrate(conn, migrations=MIGRATIONS):
+    """Apply the missing migrations in order; returns the versions applied."""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.commit()
+
+    applied = []
+    for version, step in enumerate(migrations, start=1):
+        if version <= schema_version(conn):
+            continue
+        # Take the write lock before re-checking: another connection may be migrating too
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if version > schema_version(conn):
+                step(conn)
+                conn.execute(
+                    "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                    (version, (step.__doc__ or step.__name__).strip()),
+                )
+                applied.append(version)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        if applied and applied[-1] == version:
+            logging.info(f"Database migrated to version {version}: {step.__doc__}")
+    return applied
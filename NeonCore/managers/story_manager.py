@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 import logging
 
+from ..core.session import scoped_instance
+
 class Story(ABC):
     """Abstract base class for all story modules."""
     
@@ -38,18 +40,21 @@ class Story(ABC):
 
 
 class StoryManager:
-    """Singleton class that manages the active story and transition logic."""
+    """Per-session singleton that manages the active story and transition logic."""
 
     _instance = None
     _dependencies = None
 
     def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(StoryManager, cls).__new__(cls)
-            cls._instance.current_story = None
-            cls._instance.available_stories = {}
-            cls._instance.scene_triggered = False
-        return cls._instance
+        return scoped_instance(cls, cls._create)
+
+    @classmethod
+    def _create(cls):
+        instance = super(StoryManager, cls).__new__(cls)
+        instance.current_story = None
+        instance.available_stories = {}
+        instance.scene_triggered = False
+        return instance
 
     def set_dependencies(self, dependencies):
         """Inject game dependencies (ActionManager, etc.)"""
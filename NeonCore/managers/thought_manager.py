@@ -0,0 +1,76 @@
+"""Passive intrusive thoughts, generated off the command path.
+
+log_event used to await the LLM inline whenever a thought triggered, so the
+command that caused the event (e.g. a line of dialogue with a trigger word)
+took a full model round trip longer. The ThoughtManager runs each thought as
+a background task and sends it to the session's output when it is ready:
+
+- at most one thought per player every AI_CONFIG["thought_interval"] seconds,
+  and never two in flight for the same player,
+- a thought that takes longer than AI_CONFIG["thought_max_age"] seconds is
+  about something the player has moved on from: its generation is cancelled
+  at that point and it is dropped,
+- closing the session cancels thoughts still being generated.
+"""
+
+import asyncio
+import logging
+import time
+
+from ..config import AI_CONFIG
+
+
+class ThoughtManager:
+    def __init__(self, generate, deliver, interval=None, max_age=None, clock=time.monotonic):
+        self.generate = generate  # async (event) -> thought text
+        self.deliver = deliver  # async (text), sends to the session's output
+        self.interval = AI_CONFIG["thought_interval"] if interval is None else interval
+        self.max_age = AI_CONFIG["thought_max_age"] if max_age is None else max_age
+        self.clock = clock
+        self._last_started = {}  # Player -> when their last thought was triggered
+        self._pending = {}  # Player -> task
+        self.delivered = 0
+        self.dropped = {"rate_limited": 0, "stale": 0, "failed": 0}
+
+    def trigger(self, player, event):
+        """Start a thought about `event` in the background; returns the task, or None if dropped."""
+        task = self._pending.get(player)
+        last = self._last_started.get(player)
+        if (task and not task.done()) or (last is not None and self.clock() - last < self.interval):
+            self.dropped["rate_limited"] += 1
+            return None
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+        self._last_started[player] = self.clock()
+        task = self._pending[player] = loop.create_task(self._run(player, event, self.clock()))
+        return task
+
+    async def _run(self, player, event, started):
+        try:
+            thought = await asyncio.wait_for(self.generate(event), max(0, self.max_age - (self.clock() - started)))
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            self.dropped["stale"] += 1
+            logging.debug(f"Intrusive thought for {player} timed out")
+            return
+        except Exception as e:
+            # Passive flavour: fail silently
+            self.dropped["failed"] += 1
+            logging.debug(f"Intrusive thought for {player} failed: {e}")
+            return
+        if self.clock() - started > self.max_age:
+            self.dropped["stale"] += 1
+            logging.debug(f"Dropped stale intrusive thought for {player}")
+            return
+        await self.deliver(thought)
+        self.delivered += 1
+
+    def close(self):
+        """Cancel thoughts still being generated (the session is over)."""
+        for task in self._pending.values():
+            if not task.done():
+                task.cancel()
+        self._pending.clear()
@@ -1,7 +1,10 @@
 import json
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import Dict, List, Optional
 
+from ..ai_backends.embedding import VectorIndex
+from ..config import AI_CONFIG
+
 
 @dataclass
 class Big5Traits:
@@ -36,6 +39,21 @@ class DigitalSoul:
     memories: List[str] = field(default_factory=list)
     recent_events: List[str] = field(default_factory=list)  # Buffer for Reflection
     stress: int = 0  # 0-100, where 100 is psychotic break
+    # Vectors of `memories`, built on first use (not saved: rebuilt from the texts)
+    memory_index: Optional[VectorIndex] = field(default=None, repr=False, compare=False)
+
+    def relevant_memories(self, query: str, k: int = None) -> List[str]:
+        """The (at most) `k` memories most related to `query`, most related first."""
+        if k is None:
+            k = AI_CONFIG["memory_top_k"]
+        if not self.memories:
+            return []
+        index = self.memory_index
+        if index is None or index.texts != self.memories[: len(index)]:
+            self.memory_index = index = VectorIndex()  # New, or the list was edited: rebuild
+        # Memories appended since the last query (or loaded from a save) are indexed now
+        index.add(self.memories[len(index):])
+        return [text for text, _ in index.search(query, k)]
 
     def to_dict(self):
         return {
@@ -66,6 +84,35 @@ class DigitalSoul:
         return soul
 
 
+def _drift(traits, minimum, maximum):
+    """Schema of a drift object: one optional integer delta per trait of the dataclass."""
+    return {
+        "type": "object",
+        "properties": {
+            f.name: {"type": "integer", "minimum": minimum, "maximum": maximum} for f in fields(traits)
+        },
+        "additionalProperties": False,
+    }
+
+
+# Structured output of the reflection analysis (see ActionManager.do_reflect)
+REFLECTION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "stress_change": {"type": "integer", "minimum": -100, "maximum": 100},
+        "new_traits": {"type": "array", "items": {"type": "string"}},
+        "memory_summary": {"type": "string"},
+        "big5_drift": _drift(Big5Traits, -20, 20),
+        "dark_triad_drift": _drift(DarkTriad, 0, 20),  # Triads only rise
+        "light_triad_drift": _drift(LightTriad, 0, 20),
+    },
+    "required": [
+        "stress_change", "new_traits", "memory_summary",
+        "big5_drift", "dark_triad_drift", "light_triad_drift",
+    ],
+}
+
+
 class TraitManager:
     def __init__(self):
         pass
@@ -168,7 +168,7 @@ class HeywoodAmbush(Story):
             
             self.state = "briefcase_dropped"
             # Spawn the item in the world for interaction
-            game_context.world.add_item("heywood_alley", {"name": "Briefcase", "desc": "A heavy corporate briefcase."})
+            await game_context.world.add_item_async("heywood_alley", {"name": "Briefcase", "desc": "A heavy corporate briefcase."})
             return True
         return False
 
@@ -0,0 +1,199 @@
+"""Lore retrieval for NPC prompts.
+
+NPC knowledge used to be one dialogue_context string per NPC; anything more
+would have had to be pasted into every system prompt. The lore index holds
+passages from the game's own content:
+
+- characters and NPCs (character_assets/*.json),
+- story module text (the narration the modules send to the player),
+- location descriptions,
+- any *.md / *.txt file in NeonCore/lore/ (blank-line separated passages).
+
+It is built once into an on-disk float16 matrix (lore_index.npy) plus the
+passages and a fingerprint (lore_index.json), and memory-mapped at startup.
+do_say asks it for the few passages related to the NPC and the player's line.
+The index is rebuilt when the content or the embedder changes, or with:
+
+    python -m NeonCore.world.lore
+"""
+
+import ast
+import hashlib
+import json
+import logging
+import re
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from ..ai_backends.embedding import normalize, shared_embedder
+from ..config import AI_CONFIG
+from ..core.content_registry import ContentRegistry
+
+PACKAGE_DIR = Path(__file__).parent.parent
+STORY_DIR = PACKAGE_DIR / "story_modules"
+LORE_DIR = PACKAGE_DIR / "lore"
+
+_ANSI = re.compile(r"\033\[[0-9;]*m")
+_MIN_LINE = 25  # Shorter narration lines ("*CLATTER*", prompts) say little about the world
+_PASSAGE = 400  # Characters per story passage
+
+
+def _record_passages(records, kind):
+    for record in records:
+        parts = [f"{record['handle']} ({record.get('role', kind)})."]
+        for key in ("description", "dialogue_context"):
+            if record.get(key):
+                parts.append(record[key])
+        if record.get("location"):
+            parts.append(f"Usually found at {record['location'].replace('_', ' ')}.")
+        yield {"source": f"{kind}:{record['handle']}", "text": " ".join(parts)}
+
+
+def _story_lines(path):
+    """The narration strings of a story module (string constants in its code)."""
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    docstrings = {
+        id(node.body[0].value)
+        for node in ast.walk(tree)
+        if isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef))
+        and node.body and isinstance(node.body[0], ast.Expr)
+    }
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Constant) and isinstance(node.value, str) and id(node) not in docstrings:
+            text = _ANSI.sub("", node.value).strip()
+            if len(text) >= _MIN_LINE and " " in text:
+                yield text
+
+
+def _story_passages(story_dir):
+    for path in sorted(Path(story_dir).glob("*.py")):
+        chunk = []
+        for line in _story_lines(path):
+            chunk.append(line)
+            if sum(len(c) for c in chunk) >= _PASSAGE:
+                yield {"source": f"story:{path.stem}", "text": " ".join(chunk)}
+                chunk = []
+        if chunk:
+            yield {"source": f"story:{path.stem}", "text": " ".join(chunk)}
+
+
+def _location_passages(locations):
+    for name, location in locations.items():
+        if location.get("description"):
+            place = name.replace("_", " ").title()
+            yield {"source": f"location:{name}", "text": f"{place}: {location['description']}"}
+
+
+def _document_passages(lore_dir):
+    for path in sorted(Path(lore_dir).glob("*")):
+        if path.suffix in (".md", ".txt"):
+            for block in re.split(r"\n\s*\n", path.read_text(encoding="utf-8")):
+                if block.strip():
+                    yield {"source": f"lore:{path.stem}", "text": " ".join(block.split())}
+
+
+def collect_passages(registry=None, story_dir=STORY_DIR, lore_dir=LORE_DIR):
+    """Every lore passage, as {"source", "text"} dicts, in a stable order."""
+    registry = registry or ContentRegistry.shared()
+    passages = list(_record_passages(registry.characters, "character"))
+    passages += _record_passages(registry.npcs, "npc")
+    passages += _story_passages(story_dir)
+    passages += _location_passages(registry.locations)
+    passages += _document_passages(lore_dir)
+    return passages
+
+
+def fingerprint(passages, embedder):
+    """Changes with the passages and with the embedder (vectors are not comparable across embedders)."""
+    digest = hashlib.sha256(f"{type(embedder).__name__}:{embedder.dim}".encode())
+    for passage in passages:
+        digest.update(f"{passage['source']}\0{passage['text']}\0".encode())
+    return digest.hexdigest()
+
+
+class LoreIndex:
+    """Read-only passage vectors (memory-mapped) and their passages."""
+
+    _shared = None
+    _lock = threading.Lock()
+
+    def __init__(self, vectors, passages, embedder=None):
+        self.vectors = vectors
+        self.passages = passages
+        self.embedder = embedder or shared_embedder()
+
+    @classmethod
+    def build(cls, path, passages, embedder=None) -> "LoreIndex":
+        """Embed `passages` and write the index files at `path` (.npy and .json)."""
+        embedder = embedder or shared_embedder()
+        path = Path(path)
+        vectors = normalize(embedder.embed([p["text"] for p in passages])).astype(np.float16)
+        np.save(path.with_suffix(".npy"), vectors)
+        meta = {"fingerprint": fingerprint(passages, embedder), "passages": passages}
+        path.with_suffix(".json").write_text(json.dumps(meta), encoding="utf-8")
+        logging.info(f"Lore index built: {len(passages)} passages at {path}")
+        return cls.load(path, embedder)
+
+    @classmethod
+    def load(cls, path, embedder=None, expected=None) -> "LoreIndex":
+        """Map the index at `path`; None if missing or its fingerprint is not `expected`."""
+        path = Path(path)
+        try:
+            meta = json.loads(path.with_suffix(".json").read_text(encoding="utf-8"))
+            if expected is not None and meta.get("fingerprint") != expected:
+                return None
+            vectors = np.load(path.with_suffix(".npy"), mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        return cls(vectors, meta["passages"], embedder)
+
+    @classmethod
+    def shared(cls) -> "LoreIndex":
+        """The process-wide index: mapped from disk, (re)built first if missing or stale."""
+        if cls._shared is None:
+            with cls._lock:
+                if cls._shared is None:
+                    cls._shared = cls.open(AI_CONFIG["lore_index"])
+        return cls._shared
+
+    @classmethod
+    def open(cls, path, registry=None, embedder=None) -> "LoreIndex":
+        embedder = embedder or shared_embedder()
+        passages = collect_passages(registry)
+        index = cls.load(path, embedder, expected=fingerprint(passages, embedder))
+        if index is None:
+            try:
+                index = cls.build(path, passages, embedder)
+            except OSError as e:
+                # Read-only install: keep the index in memory for this process
+                logging.warning(f"Could not write the lore index ({e}); using it from memory")
+                vectors = normalize(embedder.embed([p["text"] for p in passages])).astype(np.float16)
+                index = cls(vectors, passages, embedder)
+        return index
+
+    def __len__(self):
+        return len(self.passages)
+
+    def search(self, query, k, exclude=()) -> list:
+        """Up to `k` passages most related to `query` (best first), skipping sources in `exclude`."""
+        if not len(self.passages) or k <= 0:
+            return []
+        query = normalize(self.embedder.embed([query]))[0].astype(np.float16)
+        scores = np.asarray(self.vectors @ query, dtype=np.float32)
+        # Only the best k (plus the ones that may be skipped) need sorting
+        m = min(len(scores), k + len(exclude))
+        top = np.argpartition(-scores, m - 1)[:m]
+        found = []
+        for i in top[np.argsort(-scores[top], kind="stable")]:
+            if scores[i] <= 0 or len(found) == k:
+                break
+            if self.passages[i]["source"] not in exclude:
+                found.append(self.passages[i])
+        return found
+
+
+if __name__ == "__main__":
+    index = LoreIndex.build(AI_CONFIG["lore_index"], collect_passages())
+    print(f"Lore index: {len(index)} passages -> {Path(AI_CONFIG['lore_index']).with_suffix('.npy')}")
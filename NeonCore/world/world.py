@@ -6,17 +6,29 @@ from ..utils import wprint
 
 from ..managers.database_manager import DatabaseManager
 
+
+def _dropped_description(item):
+    """Description for the ad-hoc template of an item no template matches."""
+    if isinstance(item, dict):
+        return item.get("notes", "A dropped item.")
+    return "A dropped item."
+
+
 class World:
-    def __init__(self, char_mngr, npc_manager, io):
+    def __init__(self, char_mngr, npc_manager, io, locations=None):
         self.char_mngr = char_mngr
         self.npc_manager = npc_manager
         self.io = io
-        self.locations: Dict[str, Dict] = self._init_locations()
+        # Sessions normally pass a copy-on-write view of the shared table
+        self.locations: Dict[str, Dict] = (
+            locations if locations is not None else self._init_locations()
+        )
         self.player_position = "start_square"
         self.inventory = []
         self.db = DatabaseManager()
 
-    def _init_locations(self) -> Dict[str, Dict]:
+    @staticmethod
+    def _init_locations() -> Dict[str, Dict]:
         # Example structure
         return {
             "start_square": {
@@ -184,24 +196,11 @@ ____/___/_________________/___/________
         
         # Look up template ID (Hack for now: Seeding assumed known IDs or Names)
         # We'll just try to create an instance for "Glitching Burner"
-        template_id = None
-        conn = self.db._get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT id FROM item_templates WHERE name LIKE ?", (item_name,))
-        row = cursor.fetchone()
-        
-        if row:
-            template_id = row[0]
-            self.db.create_instance(template_id, location_id=location_id)
-        else:
+        template_id = self.db.find_template_id(item_name)
+        if template_id is None:
             # Fallback: Create ad-hoc template so item is not lost
-            # Check for description in item dict if available
-            desc = "A dropped item."
-            if isinstance(item, dict):
-                 desc = item.get("notes", desc)
-                 
-            template_id = self.db.create_template(item_name, "gear", desc)
-            self.db.create_instance(template_id, location_id=location_id)
+            template_id = self.db.create_template(item_name, "gear", _dropped_description(item))
+        self.db.create_instance(template_id, location_id=location_id)
 
     def remove_item(self, location_id, item_name):
         """Pick up an item (Remove from Location in DB, return Instance)."""
@@ -213,14 +212,39 @@ ____/___/_________________/___/________
                 # Update State: Remove from location (Conceptually). 
                 # Caller (ActionManager) will assign Owner, so we just return it.
                 # But to prevent 'look' from finding it before Owner assignment, we set loc=None.
-                self.db.update_item_state(item["id"], location_id=None, owner_id=None)
-                return item
+                # Only if it is still there: another player may have taken it meanwhile.
+                if self.db.take_item(item["id"], location_id):
+                    return item
         return None
 
     def get_items_in_location(self, location_id):
         """Get list of items in a location (From DB)."""
         return self.db.get_items_in_location(location_id)
 
+    async def add_item_async(self, location_id, item):
+        """add_item() for commands: the queries and writes run off the event loop."""
+        if isinstance(item, dict) and "id" in item:
+            await self.db.update_item_state_async(item["id"], location_id=location_id, owner_id=None)
+            return
+        item_name = item.get('name') if isinstance(item, dict) else item
+        template_id = await self.db.find_template_id_async(item_name)
+        if template_id is None:
+            template_id = await self.db.create_template_async(item_name, "gear", _dropped_description(item))
+        await self.db.create_instance_async(template_id, location_id=location_id)
+
+    async def remove_item_async(self, location_id, item_name):
+        """remove_item() for commands: the queries run off the event loop."""
+        items = await self.db.get_items_in_location_async(location_id)
+        for item in items:
+            if item["name"].lower() == item_name.lower():
+                if await self.db.take_item_async(item["id"], location_id):
+                    return item
+        return None
+
+    async def get_items_in_location_async(self, location_id):
+        """get_items_in_location() for commands: the query runs off the event loop."""
+        return await self.db.get_items_in_location_async(location_id)
+
     async def do_look(self, arg):
         """Look around your current location or at a specific character. Usage: look [target]"""
         # Specific target lookup
@@ -282,7 +306,7 @@ ____/___/_________________/___/________
             await self.io.send(f"\nVisible Characters: {', '.join(npc_names)}")
 
         # List Items on the ground
-        items = self.get_items_in_location(self.player_position)
+        items = await self.get_items_in_location_async(self.player_position)
         if items:
             item_names = []
             for item in items:
@@ -0,0 +1,132 @@
+"""Benchmark: command latency while other sessions save.
+
+Players share one database file, like on the server. Each one looks around
+(a location query) every few milliseconds; savers repeatedly save a player
+and their inventory's stats, like `save`. Reports how long each look takes
+from the moment it was due, so time spent waiting for a blocked event loop
+counts.
+
+Modes:
+  blocking  queries and commits on the event loop, on a default (rollback
+            journal, synchronous=FULL) connection, as before AsyncSQLite
+  async     the *_async methods: WAL, reader threads, one group-committing writer
+  unit      async, with each save collected in one unit of work (one write), as `save` does
+
+Usage: python benchmarks/bench_db_saves.py [players] [savers] [seconds]
+       e.g. python benchmarks/bench_db_saves.py 20 10 3
+"""
+
+import asyncio
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from NeonCore.core.session import SessionContext
+from NeonCore.managers import database_manager
+from NeonCore.managers.database_manager import DatabaseManager
+
+LOCATIONS = ["dark_alley", "industrial_zone", "market", "bar"]
+ITEMS_PER_SAVE = 8
+THINK = 0.005
+
+
+def blocking_connect(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def session_db(db_path):
+    session = SessionContext()
+    with session:
+        return session, DatabaseManager(db_path)
+
+
+async def player(db, mode, index, until):
+    loc = LOCATIONS[index % len(LOCATIONS)]
+    waits = []
+    while time.perf_counter() < until:
+        due = time.perf_counter() + THINK
+        await asyncio.sleep(THINK)
+        if mode != "blocking":
+            await db.get_items_in_location_async(loc)
+        else:
+            db.get_items_in_location(loc)
+        waits.append(time.perf_counter() - due)
+    return waits
+
+
+async def saver(db, mode, index, item_ids, until):
+    handle = f"saver{index}"
+    saves = 0
+    while time.perf_counter() < until:
+        stats = {"attributes": {"body": 6}, "combat": {"hp": 40 - saves % 10}}
+        if mode == "unit":
+            uow = db.unit_of_work()
+            uow.save_player(handle, "dark_alley", stats, item_ids, [])
+            for i_id in item_ids:
+                uow.update_instance_stats(i_id, {"ammo": saves})
+            await uow.commit_async()
+        elif mode == "async":
+            await db.save_player_async(handle, "dark_alley", stats, item_ids, [])
+            for i_id in item_ids:
+                await db.update_instance_stats_async(i_id, {"ammo": saves})
+        else:
+            db.save_player(handle, "dark_alley", stats, item_ids, [])
+            for i_id in item_ids:
+                db.update_instance_stats(i_id, {"ammo": saves})
+        saves += 1
+        await asyncio.sleep(0)
+    return saves
+
+
+async def run(mode, db_path, players, savers, seconds):
+    sessions = [session_db(db_path) for _ in range(players + savers)]
+    seed = sessions[0][1]
+    t_id = seed.create_template("Pistol", "weapon", "Trusty.")
+    for loc in LOCATIONS:
+        for _ in range(5):
+            seed.create_instance(t_id, location_id=loc)
+    inventories = [
+        [seed.create_instance(t_id, owner_id=f"saver{i}") for _ in range(ITEMS_PER_SAVE)] for i in range(savers)
+    ]
+
+    until = time.perf_counter() + seconds
+    results = await asyncio.gather(
+        *(player(db, mode, i, until) for i, (_, db) in enumerate(sessions[:players])),
+        *(saver(db, mode, i, inventories[i], until) for i, (_, db) in enumerate(sessions[players:])),
+    )
+    for session, _ in sessions:
+        session.close()
+
+    waits = sorted(w for r in results[:players] for w in r)
+    saves = sum(results[players:])
+    p = lambda q: waits[min(len(waits) - 1, int(q * len(waits)))] * 1000
+    print(
+        f"{mode:>8}: {len(waits):6d} looks, {saves:5d} saves  "
+        f"look p50 {p(0.5):7.2f}ms  p99 {p(0.99):7.2f}ms  max {waits[-1] * 1000:7.2f}ms  "
+        f"mean {statistics.mean(waits) * 1000:7.2f}ms"
+    )
+
+
+def main():
+    players = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    savers = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 3
+
+    print(f"{players} players looking, {savers} sessions saving {ITEMS_PER_SAVE} items each, {seconds:g}s")
+    with tempfile.TemporaryDirectory() as db_dir:
+        with patch.object(database_manager, "connect", blocking_connect):
+            asyncio.run(run("blocking", os.path.join(db_dir, "blocking.db"), players, savers, seconds))
+        asyncio.run(run("async", os.path.join(db_dir, "async.db"), players, savers, seconds))
+        asyncio.run(run("unit", os.path.join(db_dir, "unit.db"), players, savers, seconds))
+
+
+if __name__ == "__main__":
+    main()
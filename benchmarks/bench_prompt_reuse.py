@@ -0,0 +1,247 @@
+"""Benchmark: prompt tokens the model evaluates per NPC conversation turn.
+
+The fake Ollama charges latency per prompt token it has to evaluate and, like
+the real server, keeps the evaluated prompts of recent requests in a few
+slots: a request only pays for the tokens after the longest prefix it shares
+with one of them. The slots are lost when the model unloads, which happens
+`keep_alive` after the last request (5m when a request does not say).
+
+"before" rebuilds the prompt every turn the way do_say used to, with the
+current social context right under the system prompt, plus the history it
+would need for multi-turn replies, and sends no keep_alive. "after" runs the
+real do_say, which extends one Conversation and sends AI_CONFIG["keep_alive"].
+The player becomes a fan mid-conversation and sometimes thinks for longer
+than five minutes between lines; time between lines is simulated.
+
+The reflect section compares the old two independent do_reflect prompts with
+the analysis extending the probe conversation.
+
+Usage: python benchmarks/bench_prompt_reuse.py [per_token_ms]
+"""
+
+import asyncio
+import os
+import re
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from NeonCore.ai_backends.ollama import OllamaBackend
+from NeonCore.ai_backends.service import AIService
+from NeonCore.config import AI_CONFIG
+from NeonCore.core.dependencies import GameDependencies
+from NeonCore.core.game_io import GameIO
+from NeonCore.managers.action_manager import ActionManager
+from tests.fake_ollama import FakeOllamaServer
+
+LINES = [
+    "hey, you the fixer?",
+    "I heard you have work for someone like me",
+    "what's the pay?",
+    "you've seen my shows?",
+    "then you know I deliver",
+    "who's the target?",
+    "and the extraction plan?",
+    "deal. send me the details",
+]
+FAN_AFTER = 3  # The NPC turns out to be a fan after this many lines
+THINK_SECONDS = [40, 40, 400, 40, 40, 400, 40, 40]  # Before each line
+
+
+class NullIO(GameIO):
+    def __init__(self, answers=()):
+        self.answers = list(answers)
+
+    async def send(self, text):
+        pass
+
+    async def display(self, data, view_type="text"):
+        pass
+
+    async def prompt(self, text=""):
+        return self.answers.pop(0) if self.answers else "quit"
+
+
+def parse_duration(value):
+    if value is None:
+        return 300.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    units = {"s": 1, "m": 60, "h": 3600}
+    return float(value[:-1]) * units[value[-1]] if value[-1] in units else float(value)
+
+
+class PromptCostServer(FakeOllamaServer):
+    """Fake Ollama whose latency is proportional to the uncached prompt tokens."""
+
+    def __init__(self, per_token, slots=4, **kwargs):
+        super().__init__(**kwargs)
+        self.per_token = per_token
+        self.slots = [[] for _ in range(slots)]
+        self.now = 0.0  # Simulated clock, advanced by the benchmark
+        self.loaded_until = None
+        self.prompt_tokens = 0
+        self.evaluated_tokens = 0
+
+    @staticmethod
+    def tokenize(messages):
+        tokens = []
+        for message in messages:
+            tokens.append(f"<{message['role']}>")
+            tokens.extend(message["content"].split())
+        return tokens
+
+    def delay_for(self, path, payload):
+        if path != "/api/chat":
+            return 0.0
+        if self.loaded_until is not None and self.now > self.loaded_until:
+            self.slots = [[] for _ in self.slots]  # Model unloaded, cache gone
+        self.loaded_until = self.now + parse_duration(payload.get("keep_alive"))
+
+        prompt = self.tokenize(payload["messages"])
+
+        def shared(slot):
+            n = 0
+            for a, b in zip(slot, prompt):
+                if a != b:
+                    break
+                n += 1
+            return n
+
+        best = max(range(len(self.slots)), key=lambda i: shared(self.slots[i]))
+        cached = shared(self.slots[best])
+        if cached == 0:
+            # Nothing reusable: take the least recently used slot
+            best = 0
+        self.slots.append(self.slots.pop(best))
+        # The slot now holds this prompt and the reply generated after it
+        self.slots[-1] = prompt + ["<assistant>"] + re.findall(r"\S+", self.reply)
+
+        self.prompt_tokens += len(prompt)
+        self.evaluated_tokens += len(prompt) - cached
+        return (len(prompt) - cached) * self.per_token
+
+
+def legacy_say_messages(npc, player, history, line):
+    """do_say's old prompt layout, with the turns so far inserted as history."""
+    return (
+        [
+            {
+                "role": "system",
+                "content": (
+                    f"You are {npc.handle}, a {npc.role}. "
+                    f"Description: {npc.description}. "
+                    f"Context: {npc.dialogue_context}. "
+                    f"You are talking to {player.handle} ({player.role}). "
+                    "Keep responses short (under 2 sentences) and in-character (Cyberpunk slang). "
+                    "Do not use quotes."
+                ),
+            },
+            {
+                "role": "system",
+                "content": player.role_ability.get_social_context(npc.relationships.get(player.handle)),
+            },
+        ]
+        + history
+        + [{"role": "user", "content": line}]
+    )
+
+
+def session(server, db_path, io):
+    am = GameDependencies.initialize_game(io=io, db_path=db_path)
+    am.ai_backend = OllamaBackend(host=server.url, model="fake")
+    am.ai_service = AIService()  # No response cache: every turn reaches the model
+    player = next(
+        (c for c in am.char_mngr.characters.values() if c.role.lower() == "rockerboy"),
+        next(iter(am.char_mngr.characters.values())),
+    )
+    am.char_mngr.set_player(player)
+    return am
+
+
+def report(label, server, turns, elapsed):
+    print(
+        f"{label:<8} prompt {server.prompt_tokens / turns:7.1f} tok/turn   "
+        f"evaluated {server.evaluated_tokens / turns:7.1f} tok/turn   "
+        f"prompt eval {server.evaluated_tokens * server.per_token / turns * 1000:7.1f} ms/turn   "
+        f"wall {elapsed / turns * 1000:7.1f} ms/turn"
+    )
+
+
+async def conversation(per_token, db_path, legacy):
+    async with PromptCostServer(per_token, reply="Talk fast, choom, clock's ticking.") as server:
+        am = session(server, db_path, NullIO())
+        npc, player = am.char_mngr.npcs[0], am.char_mngr.player
+        am.game_state, am.conversing_npc = "conversation", npc
+        if legacy:
+            am.ai_backend.keep_alive = None
+        history = []
+        start = time.perf_counter()
+        for i, (think, line) in enumerate(zip(THINK_SECONDS, LINES)):
+            server.now += think
+            if i == FAN_AFTER:
+                npc.relationships[player.handle] = "Fan"
+            if legacy:
+                reply = await am.ai_reply("say", legacy_say_messages(npc, player, history, line))
+                history += [{"role": "user", "content": line}, {"role": "assistant", "content": reply}]
+            else:
+                await am.do_say(line)
+        report("before" if legacy else "after", server, len(LINES), time.perf_counter() - start)
+
+
+async def reflect(per_token, db_path):
+    async with PromptCostServer(per_token, reply="Was the money worth the blood on it?") as server:
+        am = session(server, db_path, NullIO(["it had to be done"]))
+        am.char_mngr.player.digital_soul.recent_events.extend(
+            f"Event {i}: {line}" for i, line in enumerate(LINES)
+        )
+        start = time.perf_counter()
+        # The fake's reply is not JSON; leave out the repair call, it is not what is measured
+        with patch.dict(AI_CONFIG, {"json_repairs": 0}):
+            await am.do_reflect("")
+        elapsed = time.perf_counter() - start
+        after = (server.prompt_tokens, server.evaluated_tokens)
+
+        # Replay the same two calls with the old layout: the analysis was a
+        # separate prompt that restated the events and the question
+        probe, analysis = [p["messages"] for _, path, p in server.requests if path == "/api/chat"]
+        events_str = "; ".join(am.char_mngr.player.digital_soul.recent_events)
+        question = analysis[len(probe)]["content"]
+        legacy_analysis = [
+            {"role": "system", "content": "You are a psychological analyzer for a game character."},
+            {
+                "role": "user",
+                "content": (
+                    f"User ({am.char_mngr.player.role}) reflected on events: {events_str}. "
+                    f"Their internal monologue asked: {question}. " + analysis[-1]["content"]
+                ),
+            },
+        ]
+        server.slots = [[] for _ in server.slots]
+        server.prompt_tokens = server.evaluated_tokens = 0
+        backend = am.ai_backend
+        start = time.perf_counter()
+        await backend.get_chat_completion_async(probe)
+        await backend.get_chat_completion_async(legacy_analysis)
+        report("before", server, 2, time.perf_counter() - start)
+
+        server.prompt_tokens, server.evaluated_tokens = after
+        report("after", server, 2, elapsed)
+
+
+def main():
+    per_token = (float(sys.argv[1]) if len(sys.argv) > 1 else 0.5) / 1000
+    with tempfile.TemporaryDirectory() as tmp, \
+            patch.object(ActionManager, "select_available_backend", lambda self: None):
+        print(f"NPC conversation, {len(LINES)} lines, {per_token * 1000:.2f} ms per prompt token")
+        asyncio.run(conversation(per_token, os.path.join(tmp, "before.db"), legacy=True))
+        asyncio.run(conversation(per_token, os.path.join(tmp, "after.db"), legacy=False))
+        print("do_reflect (probe + analysis)")
+        asyncio.run(reflect(per_token, os.path.join(tmp, "reflect.db")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Benchmark: NPC reply latency under load, without a GPU.
+
+Every player is a game session talking to an NPC; replies come from the
+offline FakeBackend with a lognormal time to first token and per-token
+generation, through the shared scheduler like on the server. Reports the
+time until each player sees the first words of a reply (or a fallback line).
+
+Usage: python benchmarks/bench_say_load.py [players] [lines_per_player] [latency]
+       e.g. python benchmarks/bench_say_load.py 20 5 lognormal:0.8,0.5
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from NeonCore.ai_backends.fake import FakeBackend
+from NeonCore.ai_backends.scheduler import LLMScheduler
+from NeonCore.ai_backends.service import AIService
+from NeonCore.config import AI_CONFIG
+from NeonCore.core.content_registry import ContentRegistry
+from NeonCore.core.dependencies import GameDependencies
+from NeonCore.core.game_io import GameIO
+
+LINES = ["Where is the money?", "Who sent you?", "I need your help.", "Nice jacket.", "Later."]
+
+
+class FirstWordIO(GameIO):
+    """Records when the first fragment of each NPC reply arrives."""
+
+    def __init__(self):
+        self.first_word = []
+        self.asked = None
+
+    async def send(self, text):
+        if self.asked is not None and not text.startswith("\033[1;32mYou:"):
+            self.first_word.append(time.perf_counter() - self.asked)
+            self.asked = None
+
+    async def send_stream(self, chunks, prefix="", suffix=""):
+        parts = []
+        async for chunk in chunks:
+            if not parts and self.asked is not None:
+                self.first_word.append(time.perf_counter() - self.asked)
+                self.asked = None
+            parts.append(chunk)
+        return "".join(parts)
+
+    async def display(self, data, view_type="text"):
+        pass
+
+    async def prompt(self, text=""):
+        return "quit"
+
+
+async def player(backend, service, registry, lines, db_dir, index):
+    io = FirstWordIO()
+    am = GameDependencies.initialize_game(
+        io=io, registry=registry, ai_service=service, db_path=os.path.join(db_dir, f"p{index}.db")
+    )
+    am.ai_backend = backend
+    am.char_mngr.set_player(next(iter(am.char_mngr.characters.values())))
+    am.game_state = "conversation"
+    am.conversing_npc = am.char_mngr.npcs[index % len(am.char_mngr.npcs)]
+    with am.dependencies.session:
+        for i in range(lines):
+            io.asked = time.perf_counter()
+            await am.do_say(LINES[(index + i) % len(LINES)])
+    am.dependencies.session.close()
+    return io.first_word
+
+
+async def main():
+    players = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    lines = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    latency = sys.argv[3] if len(sys.argv) > 3 else "lognormal:0.8,0.5"
+
+    backend = FakeBackend(latency=latency, seed=1)
+    service = AIService(scheduler=LLMScheduler())
+    registry = ContentRegistry.shared()
+    with tempfile.TemporaryDirectory() as db_dir, patch.dict(AI_CONFIG, {"backend": "fake"}):
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(player(backend, service, registry, lines, db_dir, i) for i in range(players))
+        )
+        elapsed = time.perf_counter() - start
+
+    waits = sorted(w for r in results for w in r)
+    p = lambda q: waits[min(len(waits) - 1, int(q * len(waits)))]
+    print(
+        f"{players} players x {lines} lines, {latency}, max_in_flight {service.scheduler.max_in_flight}: "
+        f"{len(waits)} replies in {elapsed:.1f}s"
+    )
+    print(
+        f"first words  p50 {p(0.5):6.2f}s  p90 {p(0.9):6.2f}s  p99 {p(0.99):6.2f}s  "
+        f"max {waits[-1]:6.2f}s  mean {statistics.mean(waits):6.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+"""Benchmark: WebSocket session setup cost with and without the shared content registry.
+
+"before" rebuilds a ContentRegistry per session, i.e. re-reads characters.json,
+npcs.json and every ASCII art file and rebuilds the location table, exactly as
+each connection used to. "after" hands every session a view of one shared registry.
+
+Usage: python benchmarks/bench_session_setup.py [sessions]
+"""
+
+import gc
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from NeonCore.core.content_registry import ContentRegistry
+from NeonCore.core.dependencies import GameDependencies
+from NeonCore.core.game_io import GameIO
+from NeonCore.managers.action_manager import ActionManager
+
+
+class NullIO(GameIO):
+    async def send(self, text):
+        pass
+
+    async def display(self, data, view_type="text"):
+        pass
+
+    async def prompt(self, text=""):
+        return "quit"
+
+
+def run(label, sessions, registry_factory):
+    gc.collect()
+    tracemalloc.start()
+    base_mem, _ = tracemalloc.get_traced_memory()
+    keep = []  # Keep sessions alive, like connected players
+    start = time.perf_counter()
+    for _ in range(sessions):
+        keep.append(
+            GameDependencies.initialize_game(io=NullIO(), registry=registry_factory())
+        )
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    mem, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_session_kb = (mem - base_mem) / sessions / 1024
+    max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        f"{label:<8} setup {elapsed / sessions * 1000:7.2f} ms/session   "
+        f"heap {per_session_kb:8.1f} KiB/session   max RSS {max_rss_mb:6.1f} MiB"
+    )
+    return keep
+
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    shared = ContentRegistry.shared()
+    # Backend probing is not part of content setup
+    with patch.object(ActionManager, "select_available_backend", lambda self: None):
+        run("before", sessions, ContentRegistry)
+        gc.collect()
+        run("after", sessions, lambda: shared)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ import asyncio
 import websockets
 import sys
 import json
+import re
 from prompt_toolkit import PromptSession, print_formatted_text
 from prompt_toolkit.completion import Completer, Completion
 from prompt_toolkit.formatted_text import ANSI
@@ -12,6 +13,8 @@ from prompt_toolkit.patch_stdout import patch_stdout
 msg_queue = asyncio.Queue()
 # Queue specifically for completion responses
 completion_queue = asyncio.Queue()
+# ANSI colour/style escape sequences (SGR)
+ANSI_SGR = re.compile(r"\x1b\[[0-9;]*m")
 
 class RemoteCompleter(Completer):
     def __init__(self, websocket):
@@ -71,6 +74,7 @@ class RemoteCompleter(Completer):
 
 async def receive_messages(websocket):
     """Listen for messages from the server."""
+    stream_style = ""
     try:
         async for message in websocket:
             try:
@@ -84,6 +88,22 @@ async def receive_messages(websocket):
                     if text:
                         print_formatted_text(ANSI(text))
                     
+                elif msg_type == "stream_start":
+                    # A line that arrives in pieces (e.g. NPC reply tokens).
+                    # Each piece is rendered separately, so remember the colour codes
+                    # of the opening text and re-apply them to every piece.
+                    text = data.get("data", "")
+                    stream_style = "".join(ANSI_SGR.findall(text))
+                    print_formatted_text(ANSI(text), end="", flush=True)
+
+                elif msg_type == "stream":
+                    # Render in place, no newline until stream_end
+                    print_formatted_text(ANSI(stream_style + data.get("data", "")), end="", flush=True)
+
+                elif msg_type == "stream_end":
+                    print_formatted_text(ANSI(stream_style + data.get("data", "")), flush=True)
+                    stream_style = ""
+
                 elif msg_type == "prompt_request":
                     # Signal input loop with new prompt
                     await msg_queue.put(data.get("data", "> "))
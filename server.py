@@ -1,5 +1,6 @@
 
 import asyncio
+from contextlib import asynccontextmanager
 from typing import Any
 import json
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
@@ -7,14 +8,49 @@ from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 # Import core game components
 from NeonCore.core.game_io import GameIO
 from NeonCore.core.dependencies import GameDependencies
+from NeonCore.core.content_registry import ContentRegistry
+from NeonCore.ai_backends.http_client import AsyncHTTPClient
+from NeonCore.ai_backends.ollama import OllamaBackend
+from NeonCore.ai_backends.scheduler import LLMScheduler
+from NeonCore.ai_backends.telemetry import Telemetry
 from NeonCore.utils.console_renderer import ConsoleRenderer
+from NeonCore.world.lore import LoreIndex
 
-app = FastAPI()
+# Parse all static game content once at server start; every session shares it
+content_registry = ContentRegistry.shared()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up the shared AI and lore state before players arrive; release it on shutdown."""
+    # Learn the Ollama hosts' health in the background
+    monitors = [host.health for host in OllamaBackend().pool.hosts]
+    for health in monitors:
+        health.refresh_soon()
+    try:
+        # Map the lore index (building it if the content changed)
+        await asyncio.to_thread(LoreIndex.shared)
+        yield
+    finally:
+        for health in monitors:
+            health.cancel_probe()
+        AsyncHTTPClient.close_shared()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+@app.get("/stats")
+async def ai_stats():
+    """LLM call telemetry per call site and model, and the scheduler's queues."""
+    return {"ai_calls": Telemetry.shared().snapshot(), "scheduler": LLMScheduler.shared().snapshot()}
 
 class WebSocketIO(GameIO):
     def __init__(self, websocket: WebSocket):
         self.websocket = websocket
         self.cmd_handler = None  # Reference to AsyncCmd instance for completions
+        self.inputs = asyncio.Queue()  # User input waiting for the game loop
+        self.session_task = None  # Game loop task, cancelled when the client leaves
 
     def set_cmd_handler(self, cmd_handler):
         self.cmd_handler = cmd_handler
@@ -24,60 +60,89 @@ class WebSocketIO(GameIO):
         # Send as JSON to distinguish from other message types
         await self.websocket.send_json({"type": "output", "data": text})
 
+    async def send_stream(self, chunks, prefix: str = "", suffix: str = "") -> str:
+        """
+        Send a line piece by piece: "stream_start" opens it, each "stream"
+        frame appends text in place and "stream_end" closes it. The end frame
+        is sent even if the stream fails, so the client never keeps a dangling line.
+        """
+        parts = []
+        end = {"type": "stream_end", "data": suffix}
+        await self.websocket.send_json({"type": "stream_start", "data": prefix})
+        try:
+            async for chunk in chunks:
+                parts.append(chunk)
+                await self.websocket.send_json({"type": "stream", "data": chunk})
+        except Exception:
+            # Cancellation (client gone) skips this: there is nobody to close the line for
+            await self.websocket.send_json(end)
+            raise
+        await self.websocket.send_json(end)
+        return "".join(parts)
+
     async def prompt(self, text: str = "") -> str:
         """Send prompt and wait for response"""
         # Send a specific 'prompt' message so the client knows this is the input prompt
         # and can render it correctly (e.g. in prompt_toolkit session)
         await self.websocket.send_json({"type": "prompt_request", "data": text})
-            
-        # Wait for input from client
-        while True:
-            # We sit in a loop handling "system" messages (like completions)
-            # until we get actual "user input" to return to the game loop.
-            try:
+        # Input is delivered by pump(), which keeps reading while commands run
+        return await self.inputs.get()
+
+    async def pump(self):
+        """
+        Read client frames for the whole connection.
+        "system" messages (like completions) are answered right away and user
+        input is queued for prompt(). Reading continuously is what lets us notice
+        a disconnect while a command is still running (e.g. waiting on the LLM)
+        and cancel it instead of finishing work for a client that is gone.
+        """
+        try:
+            while True:
                 raw_data = await self.websocket.receive_text()
-                message = json.loads(raw_data)
-                
+                try:
+                    message = json.loads(raw_data)
+                except json.JSONDecodeError:
+                    # Fallback for plain text (legacy client compatibility)
+                    await self.inputs.put(raw_data)
+                    continue
+
                 msg_type = message.get("type")
-                
+
                 if msg_type == "input":
-                    cmd = message.get("data", "")
-                    # print(f"Server received command: '{cmd}'")
-                    return cmd
-                
+                    await self.inputs.put(message.get("data", ""))
                 elif msg_type == "complete":
-                    # Handle completion request
-                    if self.cmd_handler:
-                        # Extract context
-                        text_to_complete = message.get("text", "")
-                        line_buffer = message.get("line", "")
-                        begidx = message.get("begidx", 0)
-                        endidx = message.get("endidx", 0)
-                        
-                        try:
-                            matches = await self.cmd_handler.get_completions(
-                                text_to_complete, line_buffer, begidx, endidx
-                            )
-                        except Exception as e:
-                             print(f"Error getting completions: {e}")
-                             matches = []
-                        
-                        resp = {
-                            "type": "completion_result",
-                            "matches": matches
-                        }
-                        await self.websocket.send_json(resp)
-                    else:
-                        print("Warning: completion requested but cmd_handler is None")
-                        await self.websocket.send_json({"type": "completion_result", "matches": []})
+                    await self._handle_completion(message)
                 else:
                     print(f"Unknown message type: {msg_type}")
-                    
-            except json.JSONDecodeError:
-                # Fallback for plain text (legacy client compatibility)
-                return raw_data
-            except WebSocketDisconnect:
-                raise # Re-raise to let the main loop handle disconnect
+        except WebSocketDisconnect:
+            if self.session_task:
+                # Cancellation propagates into any in-flight AI request
+                self.session_task.cancel()
+
+    async def _handle_completion(self, message):
+        if self.cmd_handler:
+            # Extract context
+            text_to_complete = message.get("text", "")
+            line_buffer = message.get("line", "")
+            begidx = message.get("begidx", 0)
+            endidx = message.get("endidx", 0)
+
+            try:
+                matches = await self.cmd_handler.get_completions(
+                    text_to_complete, line_buffer, begidx, endidx
+                )
+            except Exception as e:
+                 print(f"Error getting completions: {e}")
+                 matches = []
+
+            resp = {
+                "type": "completion_result",
+                "matches": matches
+            }
+            await self.websocket.send_json(resp)
+        else:
+            print("Warning: completion requested but cmd_handler is None")
+            await self.websocket.send_json({"type": "completion_result", "matches": []})
 
     async def display(self, data: Any, view_type: str = "text"):
         """
@@ -101,17 +166,24 @@ async def websocket_endpoint(websocket: WebSocket):
     io = WebSocketIO(websocket)
     
     # Initialize a fresh game instance for this player
-    # This creates new CharacterManager, World, etc.
-    game_manager = GameDependencies.initialize_game(io=io)
+    # This creates new CharacterManager, World, etc. on top of the shared content
+    game_manager = GameDependencies.initialize_game(io=io, registry=content_registry)
     
     # Link the IO back to the game_manager (AsyncCmd) for completions
     io.set_cmd_handler(game_manager)
     
+    # Run the game loop as its own task so the reader can cancel it on disconnect
+    io.session_task = asyncio.create_task(game_manager.cmdloop())
+    reader = asyncio.create_task(io.pump())
+
     try:
-        # Start the game loop
-        # cmdloop will call io.prompt() which awaits websocket.receive_text()
-        await game_manager.cmdloop()
-    except WebSocketDisconnect:
+        # cmdloop will call io.prompt() which awaits input queued by io.pump()
+        await io.session_task
+    except asyncio.CancelledError:
+        # Only the reader cancelling the game on disconnect is handled here;
+        # cancellation of this endpoint itself (server shutdown) carries on
+        if not io.session_task.cancelled() or asyncio.current_task().cancelling():
+            raise
         print(f"Client disconnected: {websocket.client}")
     except Exception as e:
         print(f"Game session error: {e}")
@@ -120,3 +192,7 @@ async def websocket_endpoint(websocket: WebSocket):
             await websocket.close()
         except:
             pass
+    finally:
+        reader.cancel()
+        # Release this player's session-scoped services (db connection, etc.)
+        await game_manager.dependencies.session.close_async()
@@ -0,0 +1,150 @@
+"""A tiny local stand-in for the Ollama HTTP API, used by the async backend tests."""
+
+import asyncio
+import json
+import re
+
+
+class FakeOllamaServer:
+    """
+    Serves /api/chat and /api/tags on 127.0.0.1 with a configurable delay.
+    Requests with "stream": true get the reply word by word as NDJSON chunks.
+    Records every request and how many clients hung up before being answered.
+    """
+
+    def __init__(self, delay=0.0, reply="Fake reply.", token_delay=0.0):
+        self.delay = delay  # Before the first byte of the reply
+        self.reply = reply
+        self.token_delay = token_delay  # Between tokens of a streamed reply
+        self.requests = []
+        self.connections = 0
+        self.abandoned = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.received = asyncio.Event()
+        self._server = None
+        self._writers = set()
+
+    async def start(self, port=0):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", port)
+        return self
+
+    @property
+    def url(self):
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def close(self):
+        self._server.close()
+        # Drop open keep-alive connections too, like a restarted Ollama would
+        for writer in list(self._writers):
+            writer.close()
+        await self._server.wait_closed()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def respond(self, path, payload):
+        """Build the JSON reply for a request; override in tests for custom behaviour."""
+        if path == "/api/tags":
+            return {"models": [{"name": "fake"}]}
+        return {"model": payload.get("model"), "message": {"role": "assistant", "content": self.reply}, "done": True}
+
+    def delay_for(self, path, payload):
+        """Seconds to wait before answering a request; override to model prompt cost."""
+        return self.delay
+
+    def tokens(self, payload):
+        """Split the reply into the pieces a streamed response sends."""
+        return re.findall(r"\S+\s*", self.reply)
+
+    async def _wait(self, reader, delay):
+        """Sleep for `delay`; return False if the client hung up meanwhile."""
+        eof = asyncio.ensure_future(reader.read(1))
+        done, _ = await asyncio.wait({eof}, timeout=delay)
+        if done:
+            self.abandoned += 1
+            return False
+        eof.cancel()
+        try:
+            await eof  # Let the read finish cancelling before the stream is read again
+        except asyncio.CancelledError:
+            pass
+        return True
+
+    async def _stream(self, reader, writer, payload):
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+        model = payload.get("model")
+        tokens = self.tokens(payload)
+        for i, token in enumerate(tokens):
+            if i and not await self._wait(reader, self.token_delay):
+                return False
+            line = {"model": model, "message": {"role": "assistant", "content": token}, "done": False}
+            self._write_chunk(writer, json.dumps(line).encode() + b"\n")
+            await writer.drain()
+        self._write_chunk(writer, json.dumps({"model": model, "done": True}).encode() + b"\n")
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+        return True
+
+    @staticmethod
+    def _write_chunk(writer, data):
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        self._writers.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                method, path, _ = request_line.decode().split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b""):
+                        break
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                payload = json.loads(body) if body else {}
+                self.requests.append((method, path, payload))
+                self.received.set()
+
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    # Wait out the delay, but notice a client that hangs up meanwhile
+                    if not await self._wait(reader, self.delay_for(path, payload)):
+                        return
+                    if payload.get("stream"):
+                        if not await self._stream(reader, writer, payload) or not keep_alive:
+                            return
+                        continue
+                finally:
+                    self.in_flight -= 1
+
+                data = json.dumps(self.respond(path, payload)).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(data)}\r\n".encode()
+                    + (b"" if keep_alive else b"Connection: close\r\n")
+                    + b"\r\n"
+                    + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
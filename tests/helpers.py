@@ -0,0 +1,49 @@
+"""Fakes shared by the test modules: a game IO, a manual clock and a dead port."""
+
+import asyncio
+import os
+import socket
+import sys
+
+# Adjust path to import NeonCore modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from NeonCore.core.game_io import GameIO
+
+
+class ScriptedIO(GameIO):
+    """Feeds a fixed list of commands and yields to the loop on every call."""
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.output = []
+
+    async def send(self, text):
+        self.output.append(text)
+        await asyncio.sleep(0)
+
+    async def display(self, data, view_type="text"):
+        self.output.append(str(data))
+        await asyncio.sleep(0)
+
+    async def prompt(self, text=""):
+        await asyncio.sleep(0)
+        return self.script.pop(0) if self.script else "quit"
+
+
+class Clock:
+    """A clock that only moves when a test sets `now`."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def closed_port_url():
+    """URL of a local port nothing listens on."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
@@ -0,0 +1,166 @@
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+# Adjust path to import NeonCore modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from NeonCore.ai_backends.ollama import OllamaBackend
+from NeonCore.ai_backends.scheduler import LLMScheduler
+from NeonCore.ai_backends.service import AIService
+from NeonCore.core.dependencies import GameDependencies
+from NeonCore.managers.action_manager import ActionManager
+from tests.fake_ollama import FakeOllamaServer
+from tests.helpers import ScriptedIO
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+REPLY = "Eddies first, then we talk business, choom."
+
+
+class FrameSocket:
+    """Records the JSON frames WebSocketIO sends, with their arrival time."""
+
+    def __init__(self):
+        self.frames = []
+
+    async def send_json(self, data):
+        self.frames.append((time.perf_counter(), data))
+
+
+class GoneSocket(FrameSocket):
+    """A client that disconnects once the reply starts streaming."""
+
+    async def send_json(self, data):
+        if data["type"] == "stream":
+            raise ConnectionError("client went away")
+        await super().send_json(data)
+
+
+class TestAIStreaming(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "streaming.db")
+        patcher = patch.object(ActionManager, "select_available_backend", lambda self: None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _conversation(self, io, backend):
+        am = GameDependencies.initialize_game(io=io, db_path=self.db_path)
+        am.ai_backend = backend
+        am.ai_service = AIService()  # No cache: every reply must come from the fake server
+        player = next(iter(am.char_mngr.characters.values()))
+        am.char_mngr.set_player(player)
+        am.game_state = "conversation"
+        am.conversing_npc = am.char_mngr.npcs[0]
+        return am
+
+    def test_ollama_streams_tokens(self):
+        async def scenario():
+            async with FakeOllamaServer(reply=REPLY) as server:
+                backend = OllamaBackend(host=server.url, model="fake")
+                chunks = [c async for c in backend.stream_chat_completion_async(MESSAGES)]
+                self.assertTrue(server.requests[0][2]["stream"])
+                self.assertEqual(len(chunks), len(REPLY.split()))
+                self.assertEqual("".join(chunks), REPLY)
+
+        asyncio.run(scenario())
+
+    def test_stream_times_out_between_tokens(self):
+        async def scenario():
+            async with FakeOllamaServer(reply=REPLY, token_delay=2.0) as server:
+                backend = OllamaBackend(host=server.url, model="fake")
+                chunks = []
+                with self.assertRaises(asyncio.TimeoutError):
+                    async for chunk in backend.stream_chat_completion_async(MESSAGES, timeout=0.1):
+                        chunks.append(chunk)
+                self.assertEqual(chunks, ["Eddies "])
+
+        asyncio.run(scenario())
+
+    def test_first_word_arrives_before_generation_ends(self):
+        """Time to first word is the first token's latency, not the full generation."""
+        from server import WebSocketIO
+
+        async def scenario():
+            async with FakeOllamaServer(reply=REPLY, delay=0.05, token_delay=0.1) as server:
+                socket = FrameSocket()
+                am = self._conversation(WebSocketIO(socket), OllamaBackend(host=server.url, model="fake"))
+                npc = am.conversing_npc
+
+                start = time.perf_counter()
+                with am.dependencies.session:
+                    await am.do_say("Got a job for me?")
+
+                kinds = [frame["type"] for _, frame in socket.frames]
+                self.assertEqual(kinds[0], "output")  # The player's own line
+                self.assertEqual(kinds[1], "stream_start")
+                self.assertEqual(kinds[-1], "stream_end")
+                self.assertEqual(kinds[2:-1], ["stream"] * len(REPLY.split()))
+                self.assertIn(f"{npc.handle}: ", socket.frames[1][1]["data"])
+                self.assertEqual("".join(f["data"] for _, f in socket.frames[2:-1]), REPLY)
+
+                first_word = socket.frames[2][0] - start
+                full_reply = socket.frames[-1][0] - start
+                self.assertLess(first_word, 0.3)
+                self.assertGreater(full_reply, 0.6)
+                am.dependencies.session.close()
+
+        asyncio.run(scenario())
+
+    def test_failed_stream_closes_the_line(self):
+        from server import WebSocketIO
+
+        async def scenario():
+            async with FakeOllamaServer(reply=REPLY, token_delay=2.0) as server:
+                socket = FrameSocket()
+                am = self._conversation(WebSocketIO(socket), OllamaBackend(host=server.url, model="fake"))
+                am.ai_backend.timeout = 0.1
+                with am.dependencies.session:
+                    await am.do_say("Hello?")
+
+                kinds = [frame["type"] for _, frame in socket.frames]
+                self.assertEqual(kinds[1:4], ["stream_start", "stream", "stream_end"])
+                self.assertIn("glitches out", socket.frames[-1][1]["data"])
+                am.dependencies.session.close()
+
+        asyncio.run(scenario())
+
+    def test_abandoned_stream_frees_its_scheduler_slot(self):
+        from server import WebSocketIO
+
+        async def scenario():
+            async with FakeOllamaServer(reply=REPLY, token_delay=0.5) as server:
+                am = self._conversation(WebSocketIO(GoneSocket()), OllamaBackend(host=server.url, model="fake"))
+                scheduler = LLMScheduler(max_in_flight=1)
+                am.ai_service = AIService(scheduler=scheduler)
+                with am.dependencies.session:
+                    await am.do_say("Hello?")
+                # Released right away, not whenever the generator is garbage collected
+                queues = list(scheduler.queues.values())
+                self.assertEqual([(q.dispatched, q.in_flight) for q in queues], [(1, 0)])
+                am.dependencies.session.close()
+
+        asyncio.run(scenario())
+
+    def test_non_streaming_io_gets_one_line(self):
+        async def scenario():
+            async with FakeOllamaServer(reply=REPLY) as server:
+                io = ScriptedIO([])
+                am = self._conversation(io, OllamaBackend(host=server.url, model="fake"))
+                with am.dependencies.session:
+                    await am.do_say("Hey.")
+                self.assertEqual(io.output[-1], f"\033[1;35m{am.conversing_npc.handle}: {REPLY}\033[0m")
+                am.dependencies.session.close()
+
+        asyncio.run(scenario())
+
+
+if __name__ == '__main__':
+    unittest.main()
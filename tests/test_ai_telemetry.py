@@ -0,0 +1,173 @@
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+# Adjust path to import NeonCore modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from NeonCore.ai_backends.cache import ResponseCache
+from NeonCore.ai_backends.fake import FakeBackend
+from NeonCore.ai_backends.scheduler import LLMScheduler
+from NeonCore.ai_backends.service import AIService
+from NeonCore.ai_backends.telemetry import Histogram, Telemetry
+from NeonCore.config import AI_CONFIG
+from NeonCore.core.dependencies import GameDependencies
+from tests.helpers import ScriptedIO
+
+
+def prompt(line):
+    return [{"role": "system", "content": "You are Lenard, a dirty cop."}, {"role": "user", "content": line}]
+
+
+class TestHistogram(unittest.TestCase):
+    def test_quantiles(self):
+        histogram = Histogram()
+        for i in range(1, 101):
+            histogram.add(i / 100)  # 10 ms .. 1 s
+        stats = histogram.snapshot()
+        self.assertEqual(stats["count"], 100)
+        self.assertAlmostEqual(stats["mean"], 0.505)
+        self.assertEqual(stats["max"], 1.0)
+        # Bucket bounds are 1.5x apart, so a quantile is within that of the true value
+        self.assertTrue(0.5 <= stats["p50"] <= 0.75, stats["p50"])
+        self.assertTrue(0.95 <= stats["p95"] <= 1.0, stats["p95"])
+        self.assertEqual(Histogram().snapshot()["p99"], 0.0)
+
+    def test_values_past_the_last_bucket(self):
+        histogram = Histogram(bounds=(1.0, 2.0))
+        histogram.add(30.0)
+        self.assertEqual(histogram.quantile(0.5), 30.0)
+
+
+class TestCallTelemetry(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.telemetry = Telemetry()
+
+    def _stats(self, site):
+        return next(s for s in self.telemetry.snapshot()["sites"] if s["site"] == site)
+
+    def test_queue_wait_latency_and_tokens(self):
+        backend = FakeBackend(reply="one two three", latency="fixed:0.1")
+
+        async def scenario():
+            service = AIService(scheduler=LLMScheduler(max_in_flight=1), telemetry=self.telemetry)
+            await asyncio.gather(*(service.reply(backend, "say", prompt(f"Line {i}")) for i in range(3)))
+
+        asyncio.run(scenario())
+        stats = self._stats("say")
+        self.assertEqual(stats["model"], backend.model_name)
+        self.assertEqual(stats["calls"], 3)
+        self.assertEqual(stats["response_tokens"], 9)  # As reported by the backend
+        self.assertGreater(stats["prompt_tokens"], 0)
+        self.assertGreaterEqual(stats["latency"]["min"], 0.1)
+        # One slot: the last call waited for the other two
+        self.assertGreaterEqual(stats["queue_wait"]["max"], 0.2)
+        self.assertEqual(len(self.telemetry.snapshot()["recent"]), 3)
+
+    def test_stream_time_to_first_token(self):
+        async def scenario():
+            service = AIService(telemetry=self.telemetry)
+            backend = FakeBackend(reply="one two three four five six", latency="per_token:0.05,0.05")
+            async for _ in service.stream(backend, "thought", prompt("hm")):
+                pass
+
+        asyncio.run(scenario())
+        record = self.telemetry.recent[-1]
+        self.assertEqual(record.site, "thought")
+        self.assertGreaterEqual(record.first_token, 0.05)
+        self.assertLess(record.first_token, record.latency)
+        self.assertGreaterEqual(record.latency, 0.05 + 5 * 0.05)
+
+    def test_cache_hits_and_failures(self):
+        async def scenario():
+            cache = ResponseCache(db_path=os.path.join(self.tmp.name, "cache.db"), sites={"say"}, variants=1)
+            self.addCleanup(cache.close)
+            service = AIService(cache=cache, telemetry=self.telemetry)
+            backend = FakeBackend(reply="Preem.")
+            for _ in range(3):
+                await service.reply(backend, "say", prompt("Got work?"))
+            with self.assertRaises(ConnectionError):
+                await service.reply(FakeBackend(failure_rate=1.0), "reflect", prompt("Why?"))
+
+        asyncio.run(scenario())
+        say = self._stats("say")
+        self.assertEqual((say["calls"], say["cache_hits"]), (3, 2))
+        self.assertEqual(say["latency"]["count"], 1)  # Only the miss reached the model
+        self.assertEqual(self._stats("reflect")["failures"], 1)
+
+    def test_cancelled_streams_are_recorded(self):
+        async def scenario():
+            service = AIService(telemetry=self.telemetry)
+            backend = FakeBackend(reply="one two three four five six", latency="per_token:0.05,0.05")
+
+            stream = service.stream(backend, "say", prompt("hm"))
+            await anext(stream)
+            await stream.aclose()  # The player disconnected
+
+            async def read_all():
+                async for _ in service.stream(backend, "thought", prompt("hm")):
+                    pass
+
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(read_all(), 0.1)  # Past the deadline
+
+        asyncio.run(scenario())
+        for site in ("say", "thought"):
+            stats = self._stats(site)
+            self.assertEqual((stats["calls"], stats["cancelled"], stats["failures"]), (1, 1, 0))
+            self.assertEqual(stats["latency"]["count"], 0)
+        self.assertTrue(self.telemetry.recent[-1].cancelled)
+
+    def test_report_lists_heaviest_sites_first(self):
+        async def scenario():
+            service = AIService(telemetry=self.telemetry)
+            await service.reply(FakeBackend(reply="ok"), "thought", prompt("a"))
+            await service.reply(FakeBackend(reply="a much longer reply " * 20), "say", prompt("b"))
+
+        asyncio.run(scenario())
+        lines = self.telemetry.report()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].startswith("say"))
+
+
+class TestStatsViews(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.telemetry = Telemetry()
+        patcher = patch.object(Telemetry, "_shared", self.telemetry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_dev_stats_command(self):
+        io = ScriptedIO([])
+        with patch.dict(AI_CONFIG, {"backend": "fake"}):
+            am = GameDependencies.initialize_game(
+                io=io, db_path=os.path.join(self.tmp.name, "stats.db"),
+                ai_service=AIService(telemetry=self.telemetry),
+            )
+        self.addCleanup(am.dependencies.session.close)
+        asyncio.run(am.do_dev_stats(""))
+        self.assertIn("No AI calls recorded yet.", io.output[-1])
+
+        asyncio.run(am.ai_reply("say", prompt("Where is the money?")))
+        asyncio.run(am.do_dev_stats(""))
+        self.assertTrue(io.output[-1].startswith("say"))
+        self.assertIn("calls     1", io.output[-1])
+
+    def test_server_endpoint(self):
+        import server
+
+        asyncio.run(AIService(telemetry=self.telemetry).reply(FakeBackend(), "say", prompt("yo")))
+        stats = asyncio.run(server.ai_stats())
+        self.assertEqual([s["site"] for s in stats["ai_calls"]["sites"]], ["say"])
+        self.assertIn("scheduler", stats)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,205 @@
+import unittest
+import asyncio
+import gc
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+# Adjust path to import NeonCore modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from NeonCore.ai_backends.ollama import OllamaBackend
+from NeonCore.ai_backends.service import AIService
+from NeonCore.core.dependencies import GameDependencies
+from NeonCore.managers.action_manager import ActionManager
+from tests.fake_ollama import FakeOllamaServer
+from tests.helpers import ScriptedIO
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+class TestAsyncAIBackend(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "async_ai.db")
+        patcher = patch.object(ActionManager, "select_available_backend", lambda self: None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _session(self, backend=None):
+        am = GameDependencies.initialize_game(io=ScriptedIO([]), db_path=self.db_path)
+        am.ai_backend = backend
+        am.ai_service = AIService()  # No cache: every reply must come from the fake server
+        player = next(iter(am.char_mngr.characters.values()))
+        am.char_mngr.set_player(player)
+        am.game_state = "active_game"
+        return am
+
+    def test_async_completion(self):
+        async def scenario():
+            async with FakeOllamaServer(reply="Choom.") as server:
+                backend = OllamaBackend(host=server.url, model="fake")
+                response = await backend.get_chat_completion_async(MESSAGES)
+                self.assertEqual(response["message"]["content"], "Choom.")
+                self.assertEqual(server.requests[0][1], "/api/chat")
+                self.assertEqual(server.requests[0][2]["messages"], MESSAGES)
+
+        asyncio.run(scenario())
+
+    def test_timeout(self):
+        async def scenario():
+            async with FakeOllamaServer(delay=2.0) as server:
+                backend = OllamaBackend(host=server.url, model="fake")
+                start = time.perf_counter()
+                with self.assertRaises(asyncio.TimeoutError):
+                    await backend.get_chat_completion_async(MESSAGES, timeout=0.1)
+                self.assertLess(time.perf_counter() - start, 1.0)
+
+        asyncio.run(scenario())
+
+    def test_cancellation_aborts_request(self):
+        """Cancelling the awaiting task (client disconnect) hangs up on the LLM."""
+        async def scenario():
+            async with FakeOllamaServer(delay=5.0) as server:
+                backend = OllamaBackend(host=server.url, model="fake")
+                task = asyncio.create_task(backend.get_chat_completion_async(MESSAGES))
+                await server.received.wait()
+                task.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await task
+                for _ in range(50):
+                    if server.abandoned:
+                        break
+                    await asyncio.sleep(0.01)
+                self.assertEqual(server.abandoned, 1)
+
+        asyncio.run(scenario())
+
+    def test_websocket_disconnect_cancels_pending_reply(self):
+        from fastapi import WebSocketDisconnect
+        from server import WebSocketIO
+
+        class HangUpSocket:
+            def __init__(self, server):
+                self.server = server
+
+            async def receive_text(self):
+                await self.server.received.wait()
+                raise WebSocketDisconnect()
+
+            async def send_json(self, data):
+                pass
+
+        async def scenario():
+            async with FakeOllamaServer(delay=5.0) as server:
+                am = self._session(OllamaBackend(host=server.url, model="fake"))
+                am.game_state = "conversation"
+                am.conversing_npc = am.char_mngr.npcs[0]
+
+                io = WebSocketIO(HangUpSocket(server))
+                io.session_task = asyncio.create_task(am.do_say("hello?"))
+                await io.pump()
+
+                with self.assertRaises(asyncio.CancelledError):
+                    await io.session_task
+                for _ in range(50):
+                    if server.abandoned:
+                        break
+                    await asyncio.sleep(0.01)
+                self.assertEqual(server.abandoned, 1)
+                am.dependencies.session.close()
+
+        asyncio.run(scenario())
+
+    def test_endpoint_cancellation_is_not_taken_for_a_disconnect(self):
+        import server
+        from fastapi import WebSocketDisconnect
+
+        class Socket:
+            client = "test"
+
+            def __init__(self):
+                self.hang_up = asyncio.Event()
+
+            async def accept(self):
+                pass
+
+            async def receive_text(self):
+                await self.hang_up.wait()
+                raise WebSocketDisconnect()
+
+            async def send_json(self, data):
+                pass
+
+            async def close(self):
+                pass
+
+        initialize_game = GameDependencies.initialize_game
+
+        def in_tmp(io, registry):
+            return initialize_game(io=io, registry=registry, db_path=self.db_path)
+
+        async def scenario():
+            # The player hangs up: the endpoint ends quietly
+            socket = Socket()
+            endpoint = asyncio.create_task(server.websocket_endpoint(socket))
+            await asyncio.sleep(0.05)
+            socket.hang_up.set()
+            await asyncio.wait_for(endpoint, 1)
+
+            # The server shuts down: the endpoint's own cancellation goes on
+            endpoint = asyncio.create_task(server.websocket_endpoint(Socket()))
+            await asyncio.sleep(0.05)
+            endpoint.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await endpoint
+
+        with patch.object(server.GameDependencies, "initialize_game", in_tmp):
+            asyncio.run(scenario())
+
+    def test_slow_llm_does_not_stall_other_sessions(self):
+        async def scenario():
+            async with FakeOllamaServer(delay=1.0) as server:
+                slow = self._session(OllamaBackend(host=server.url, model="fake"))
+                npc = slow.char_mngr.npcs[0]
+                slow.game_state = "conversation"
+                slow.conversing_npc = npc
+                others = [self._session() for _ in range(20)]
+
+                talk = asyncio.create_task(slow.do_say("Where is the money?"))
+                await server.received.wait()
+
+                latencies = []
+                # A full collection over the whole suite's heap is not the event
+                # loop being blocked; keep it out of the measured window
+                gc.collect()
+                gc.disable()
+                try:
+                    for _ in range(5):
+                        for am in others:
+                            start = time.perf_counter()
+                            with am.dependencies.session:
+                                await am.onecmd("look")
+                            latencies.append(time.perf_counter() - start)
+                finally:
+                    gc.enable()
+
+                self.assertFalse(talk.done(), "LLM reply arrived too early for the test")
+                self.assertLess(max(latencies), 0.05)
+
+                await talk
+                self.assertIn(f"{npc.handle}: Fake reply.", slow.io.output[-1])
+
+            for am in [slow] + others:
+                am.dependencies.session.close()
+
+        asyncio.run(scenario())
+
+
+if __name__ == '__main__':
+    unittest.main()
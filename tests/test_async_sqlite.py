@@ -0,0 +1,192 @@
+import unittest
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+# Adjust path to import NeonCore modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from NeonCore.core.async_sqlite import AsyncSQLite
+from NeonCore.core.session import SessionContext
+from NeonCore.managers.database_manager import DatabaseManager
+
+
+def insert(conn, value):
+    conn.execute("INSERT INTO t (value) VALUES (?)", (value,))
+    return value
+
+
+def values(conn):
+    return [row["value"] for row in conn.execute("SELECT value FROM t ORDER BY value")]
+
+
+def reader_thread(conn):
+    return threading.current_thread().name
+
+
+class TestAsyncSQLite(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "async.db")
+        conn = sqlite3.connect(self.path)
+        conn.execute("CREATE TABLE t (value INTEGER UNIQUE)")
+        conn.commit()
+        conn.close()
+        self.store = AsyncSQLite.acquire(self.path)
+        self.addCleanup(self.store.release)
+
+    def test_wal_mode(self):
+        async def scenario():
+            mode = await self.store.read(lambda conn: conn.execute("PRAGMA journal_mode").fetchone()[0])
+            self.assertEqual(mode, "wal")
+
+        asyncio.run(scenario())
+
+    def test_concurrent_writes_share_a_commit(self):
+        async def scenario():
+            results = await asyncio.gather(*(self.store.write(insert, i) for i in range(20)))
+            self.assertEqual(results, list(range(20)))
+            self.assertEqual(await self.store.read(values), list(range(20)))
+
+        asyncio.run(scenario())
+        self.assertEqual(self.store.writes, 20)
+        self.assertLess(self.store.commits, 20)
+
+    def test_failing_write_is_rolled_back_alone(self):
+        async def scenario():
+            await self.store.write(insert, 1)
+            results = await asyncio.gather(
+                self.store.write(insert, 2),
+                self.store.write(insert, 1),  # Duplicate
+                self.store.write(insert, 3),
+                return_exceptions=True,
+            )
+            self.assertEqual(results[0], 2)
+            self.assertIsInstance(results[1], sqlite3.IntegrityError)
+            self.assertEqual(results[2], 3)
+            self.assertEqual(await self.store.read(values), [1, 2, 3])
+
+        asyncio.run(scenario())
+
+    def test_reads_run_on_worker_threads(self):
+        async def scenario():
+            names = await asyncio.gather(*(self.store.read(reader_thread) for _ in range(8)))
+            self.assertTrue(all(name.startswith("sqlite-read") for name in names))
+
+        asyncio.run(scenario())
+
+    def test_slow_writes_do_not_block_the_loop(self):
+        def slow_insert(conn, value):
+            time.sleep(0.3)  # A slow disk
+            return insert(conn, value)
+
+        async def scenario():
+            gaps = []
+
+            async def ticker():
+                last = time.perf_counter()
+                for _ in range(20):
+                    await asyncio.sleep(0.01)
+                    now = time.perf_counter()
+                    gaps.append(now - last)
+                    last = now
+
+            await asyncio.gather(self.store.write(slow_insert, 1), ticker())
+            self.assertLess(max(gaps), 0.1)
+
+        asyncio.run(scenario())
+
+    def test_store_is_shared_and_released(self):
+        other = AsyncSQLite.acquire(self.path)
+        self.assertIs(other, self.store)
+        other.release()
+        self.assertIs(AsyncSQLite._stores[self.path], self.store)
+
+    def test_queued_writes_are_committed_on_close(self):
+        def slow_insert(conn, value):
+            time.sleep(0.1)
+            return insert(conn, value)
+
+        async def scenario():
+            writes = [asyncio.ensure_future(self.store.write(slow_insert, 1))]
+            await asyncio.sleep(0.05)  # The writer thread is on it
+            writes += [asyncio.ensure_future(self.store.write(insert, i)) for i in (2, 3)]
+            await asyncio.sleep(0)  # Queued behind it
+            self.store.close()  # From the writer's own loop
+            return await asyncio.gather(*writes)
+
+        self.assertEqual(asyncio.run(scenario()), [1, 2, 3])
+        self.assertEqual(self.stored(), [1, 2, 3])
+
+    def test_close_from_another_thread_waits_for_the_writer(self):
+        async def scenario():
+            writes = [asyncio.ensure_future(self.store.write(insert, i)) for i in range(5)]
+            await asyncio.sleep(0)
+            await asyncio.to_thread(self.store.close)
+            return await asyncio.gather(*writes)
+
+        self.assertEqual(asyncio.run(scenario()), list(range(5)))
+        self.assertEqual(self.stored(), list(range(5)))
+
+    def stored(self):
+        conn = sqlite3.connect(self.path)
+        try:
+            return [row[0] for row in conn.execute("SELECT value FROM t ORDER BY value")]
+        finally:
+            conn.close()
+
+    def test_works_across_event_loops(self):
+        asyncio.run(self.store.write(insert, 1))
+        asyncio.run(self.store.write(insert, 2))
+        self.assertEqual(asyncio.run(self.store.read(values)), [1, 2])
+
+
+class TestAsyncDatabaseManager(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "game.db")
+        self.session = SessionContext()
+        self.addCleanup(self.session.close)
+        with self.session:
+            self.db = DatabaseManager(self.path)
+
+    def test_async_methods_match_the_sync_ones(self):
+        async def scenario():
+            t_id = await self.db.create_template_async("Pistol", "weapon", "Trusty.", base_stats='{"dmg": "2d6"}')
+            i_id = await self.db.create_instance_async(t_id, location_id="dark_alley")
+            self.assertEqual(await self.db.get_template_id_by_name_async("Pistol"), t_id)
+            self.assertEqual(
+                await self.db.get_items_in_location_async("dark_alley"), self.db.get_items_in_location("dark_alley")
+            )
+            self.assertTrue(await self.db.update_instance_stats_async(i_id, {"ammo": 3}))
+            self.assertTrue(await self.db.update_item_state_async(i_id, owner_id="V"))
+            self.assertEqual(await self.db.get_item_async(i_id), self.db.get_item(i_id))
+            self.assertEqual(self.db.get_item(i_id)["ammo"], 3)
+
+            self.assertTrue(await self.db.save_player_async("V", "dark_alley", {"hp": 40}, [i_id], []))
+            self.assertEqual(await self.db.load_player_async("V"), self.db.load_player("V"))
+
+        asyncio.run(scenario())
+
+    def test_failed_write_returns_the_failure_value(self):
+        async def scenario():
+            self.assertIsNone(await self.db.create_template_async(None, "gear", "No name"))  # NOT NULL
+
+        with self.assertLogs(level="ERROR"):
+            asyncio.run(scenario())
+
+    def test_close_releases_the_store(self):
+        asyncio.run(self.db.get_items_in_location_async("nowhere"))
+        self.assertIn(self.path, AsyncSQLite._stores)
+        self.db.close()
+        self.assertNotIn(self.path, AsyncSQLite._stores)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,239 @@
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+import urllib.request
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Adjust path to import NeonCore modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from NeonCore.ai_backends.fake import FakeBackend
+from NeonCore.ai_backends.health import BackendUnavailable, CircuitState, HealthMonitor
+from NeonCore.ai_backends.host_pool import HostPool
+from NeonCore.ai_backends.http_client import AsyncHTTPClient
+from NeonCore.ai_backends.ollama import OllamaBackend
+from NeonCore.config import AI_CONFIG
+from NeonCore.core.dependencies import GameDependencies
+from NeonCore.managers.action_manager import ActionManager
+from NeonCore.world.lore import LoreIndex
+from tests.fake_ollama import FakeOllamaServer
+from tests.helpers import Clock, ScriptedIO, closed_port_url
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+class TestConnectionPool(unittest.TestCase):
+    def test_sequential_requests_reuse_one_connection(self):
+        async def scenario():
+            async with FakeOllamaServer() as server:
+                backend = OllamaBackend(host=server.url, model="fake")
+                for _ in range(5):
+                    await backend.get_chat_completion_async(MESSAGES)
+                for _ in range(3):
+                    [c async for c in backend.stream_chat_completion_async(MESSAGES)]
+                self.assertEqual(server.connections, 1)
+                self.assertEqual(backend.client.connections_opened, 1)
+
+        asyncio.run(scenario())
+
+    def test_backends_for_one_host_share_the_pool(self):
+        async def scenario():
+            async with FakeOllamaServer(delay=0.05) as server:
+                backends = [OllamaBackend(host=server.url, model="fake") for _ in range(3)]
+                self.assertIs(backends[0].client, backends[2].client)
+                for _ in range(2):
+                    await asyncio.gather(*(b.get_chat_completion_async(MESSAGES) for b in backends))
+                self.assertEqual(server.connections, 3)
+
+        asyncio.run(scenario())
+
+    def test_dropped_idle_connection_is_retried(self):
+        async def scenario():
+            async with FakeOllamaServer() as server:
+                client = AsyncHTTPClient(server.url)
+                await client.get("/api/tags")
+                # Server restarts: the pooled connection is dead
+                await server.close()
+                await server.start(client.port)
+                response = await client.get("/api/tags")
+                self.assertEqual(response.json()["models"][0]["name"], "fake")
+                self.assertEqual(client.connections_opened, 2)
+
+        asyncio.run(scenario())
+
+    def test_abandoned_stream_is_not_pooled(self):
+        async def scenario():
+            async with FakeOllamaServer(reply="one two three", token_delay=0.05) as server:
+                backend = OllamaBackend(host=server.url, model="fake")
+                stream = backend.stream_chat_completion_async(MESSAGES)
+                await anext(stream)
+                await stream.aclose()
+                self.assertEqual(backend.client._idle, [])
+                await backend.get_chat_completion_async(MESSAGES)
+                self.assertEqual(backend.client.connections_opened, 2)
+
+        asyncio.run(scenario())
+
+
+class TestHealthMonitor(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+
+    def _backend(self, url):
+        health = HealthMonitor(url, threshold=2, cooldown=30, interval=10, clock=self.clock)
+        backend = OllamaBackend(host=url, model="fake", health=health)
+        health.probe = backend.probe
+        return backend
+
+    def test_circuit_opens_and_recovers(self):
+        async def scenario():
+            async with FakeOllamaServer(delay=1.0) as server:
+                backend = self._backend(server.url)
+                for _ in range(2):
+                    with self.assertRaises(asyncio.TimeoutError):
+                        await backend.get_chat_completion_async(MESSAGES, timeout=0.05)
+                self.assertEqual(backend.health.state, CircuitState.OPEN)
+                self.assertFalse(backend.is_available())
+
+                # Fails fast without touching the host
+                sent = len(server.requests)
+                with self.assertRaises(BackendUnavailable):
+                    await backend.get_chat_completion_async(MESSAGES)
+                self.assertEqual(len(server.requests), sent)
+
+                # After the cooldown one trial request decides
+                self.clock.now += 31
+                server.delay = 0
+                self.assertTrue(backend.is_available())
+                await backend.get_chat_completion_async(MESSAGES)
+                self.assertEqual(backend.health.state, CircuitState.CLOSED)
+
+        asyncio.run(scenario())
+
+    def test_failed_trial_reopens(self):
+        async def scenario():
+            backend = self._backend(closed_port_url())
+            backend.health.record_failure()
+            backend.health.record_failure()
+            self.clock.now += 31
+            with self.assertRaises(OSError):
+                await backend.get_chat_completion_async(MESSAGES)
+            self.assertEqual(backend.health.state, CircuitState.OPEN)
+
+        asyncio.run(scenario())
+
+    def test_one_trial_request_at_a_time(self):
+        health = HealthMonitor("http://trial", threshold=1, cooldown=30, clock=self.clock)
+        health.record_failure()
+        self.clock.now += 31
+        self.assertTrue(health.allow_request())  # The trial
+        self.assertFalse(health.allow_request())
+        with self.assertRaises(BackendUnavailable):
+            health.check_request()
+        self.assertFalse(health.accepts_requests())
+
+        health.record_failure()  # The trial failed: wait out another cooldown
+        self.assertFalse(health.allow_request())
+        self.clock.now += 31
+        self.assertTrue(health.allow_request())
+        self.assertFalse(health.allow_request())
+        self.clock.now += 31  # The trial never reported back
+        self.assertTrue(health.allow_request())
+        health.record_success()
+        self.assertTrue(health.allow_request())
+        self.assertTrue(health.allow_request())
+
+    def test_availability_is_cached_and_probed_in_background(self):
+        async def scenario():
+            backend = self._backend(closed_port_url())
+            # Unknown health counts as available; the probe runs in the background
+            self.assertTrue(backend.is_available())
+            await backend.health._probe_task
+            self.assertFalse(backend.is_available())
+            self.assertIsNone(backend.health._probe_task.exception())
+
+            # No new probe until the interval has passed
+            task = backend.health._probe_task
+            backend.is_available()
+            self.assertIs(backend.health._probe_task, task)
+
+        asyncio.run(scenario())
+
+    def test_selection_skips_unprobed_and_failing_endpoints(self):
+        async def scenario():
+            async with FakeOllamaServer() as server:
+                backend = self._backend(server.url)
+                fake = FakeBackend()
+                am = SimpleNamespace(ai_backends={"ollama": backend, "fake": fake})
+                select = lambda: ActionManager.select_available_backend(am)
+
+                # Never probed: new sessions go offline until the probe answers
+                self.assertIs(select(), fake)
+                await backend.health._probe_task
+                self.assertIs(select(), backend)
+
+                # Open, even after the cooldown: the half-open trial is left to requests
+                for _ in range(2):
+                    backend.health.record_failure()
+                self.assertIs(select(), fake)
+                self.clock.now += 31
+                self.assertTrue(backend.is_available())
+                self.assertIs(select(), fake)
+                await backend.get_chat_completion_async(MESSAGES)
+                self.assertIs(select(), backend)
+
+        with patch.dict(AI_CONFIG, {"backend": None}):
+            asyncio.run(scenario())
+
+    def test_session_setup_does_not_touch_the_network(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+
+        def no_network(*args, **kwargs):
+            raise AssertionError("backend selection made a network call")
+
+        async def scenario():
+            with patch.object(urllib.request, "urlopen", no_network), \
+                    patch.object(AsyncHTTPClient, "_open", no_network), \
+                    patch.object(HealthMonitor, "refresh_soon", lambda self: None):
+                for _ in range(20):
+                    am = GameDependencies.initialize_game(
+                        io=ScriptedIO([]), db_path=os.path.join(tmp.name, "setup.db")
+                    )
+                    self.assertIsNotNone(am.ai_backend)
+                    am.dependencies.session.close()
+
+        asyncio.run(scenario())
+
+    def test_server_lifespan_probes_and_cleans_up(self):
+        import server
+
+        async def scenario():
+            async with FakeOllamaServer() as up, FakeOllamaServer(delay=5.0) as slow:
+                # Fresh per-host state (earlier tests may have used these ports), and the
+                # real backend class (some test modules replace the ollama module)
+                with patch.dict(AI_CONFIG, {"ollama_hosts": [up.url, slow.url]}), \
+                        patch.dict(HealthMonitor._monitors, clear=True), \
+                        patch.dict(HostPool._shared, clear=True), \
+                        patch.dict(AsyncHTTPClient._shared, clear=True), \
+                        patch.object(server, "OllamaBackend", OllamaBackend), \
+                        patch.object(LoreIndex, "shared") as lore:
+                    async with server.lifespan(server.app):
+                        lore.assert_called_once()
+                        fast_host, slow_host = OllamaBackend().pool.hosts
+                        self.assertTrue(await fast_host.health._probe_task)
+                        self.assertEqual(len(fast_host.client._idle), 1)
+                        probe = slow_host.health._probe_task
+                    # Shutdown cancels the probe still waiting and closes the pooled connections
+                    await asyncio.wait({probe}, timeout=1)
+                    self.assertTrue(probe.cancelled())
+                    self.assertEqual(fast_host.client._idle, [])
+
+        asyncio.run(scenario())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import sys
+import os
+
+# Adjust path to import NeonCore modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from NeonCore.core.content_registry import ContentRegistry, LocationView
+from NeonCore.managers.character_manager import CharacterManager
+from NeonCore.managers.npc_manager import NPCManager
+from NeonCore.world.world import World
+
+
+class TestContentRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = ContentRegistry()
+
+    def test_shared_registry_is_loaded_once(self):
+        self.assertIs(ContentRegistry.shared(), ContentRegistry.shared())
+
+    def test_sessions_share_ascii_art(self):
+        """Large immutable content is shared by reference, not copied."""
+        a = CharacterManager(self.registry)
+        b = CharacterManager(self.registry)
+        art_a = {c.handle: c.ascii_art for c in a.characters.values()}
+        art_b = {c.handle: c.ascii_art for c in b.characters.values()}
+        self.assertTrue(art_a)
+        for handle, art in art_a.items():
+            self.assertIs(art, art_b[handle])
+
+    def test_sessions_do_not_share_mutable_state(self):
+        a = CharacterManager(self.registry)
+        b = CharacterManager(self.registry)
+        npc_a = a.get_npc("Lenard")
+        npc_b = b.get_npc("Lenard")
+        self.assertIsNotNone(npc_a)
+
+        npc_a.combat["hp"] = -1
+        npc_a.location = "street_corner"
+        npc_a.relationships["Forty"] = "Fan"
+
+        self.assertNotEqual(npc_b.combat["hp"], -1)
+        self.assertNotEqual(npc_b.location, "street_corner")
+        self.assertNotIn("Forty", npc_b.relationships)
+
+        # Gear dicts get ids attached on new game; they must be private too
+        pc_a = next(iter(a.characters.values()))
+        pc_b = next(c for c in b.characters.values() if c.handle == pc_a.handle)
+        if pc_a.inventory:
+            pc_a.inventory[0]["id"] = "abc"
+            self.assertNotIn("id", pc_b.inventory[0])
+
+    def test_location_view_is_copy_on_write(self):
+        view_a = self.registry.location_view()
+        view_b = self.registry.location_view()
+        self.assertIsInstance(view_a, LocationView)
+        self.assertEqual(set(view_a), set(World._init_locations()))
+
+        # Shared entries are read-only
+        with self.assertRaises(TypeError):
+            view_a["start_square"]["exits"]["up"] = "roof"
+
+        # Owning a location gives a private mutable copy
+        own = view_a.own("start_square")
+        own["exits"]["up"] = "roof"
+        self.assertIn("up", view_a["start_square"]["exits"])
+        self.assertNotIn("up", view_b["start_square"]["exits"])
+
+        view_a["secret_lab"] = {"description": "Hidden.", "exits": {}, "ascii_art": ""}
+        self.assertIn("secret_lab", view_a)
+        self.assertNotIn("secret_lab", view_b)
+
+    def test_world_reads_through_view(self):
+        char_mngr = CharacterManager(self.registry)
+        world = World(char_mngr, NPCManager(char_mngr), None,
+                      locations=self.registry.location_view())
+        exits = world.locations[world.player_position]["exits"]
+        self.assertIn("north", exits)
+
+
+if __name__ == '__main__':
+    unittest.main()
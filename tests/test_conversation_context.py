@@ -0,0 +1,108 @@
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+# Adjust path to import NeonCore modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from NeonCore.ai_backends.conversation import Conversation
+from NeonCore.ai_backends.ollama import OllamaBackend
+from NeonCore.ai_backends.service import AIService
+from NeonCore.config import AI_CONFIG
+from NeonCore.core.dependencies import GameDependencies
+from NeonCore.managers.action_manager import ActionManager
+from tests.fake_ollama import FakeOllamaServer
+from tests.helpers import ScriptedIO
+
+
+class TestConversation(unittest.TestCase):
+    def test_requests_only_append(self):
+        conversation = Conversation([{"role": "system", "content": "You are Rogue."}])
+        conversation.update_context("social", "Neutral.")
+        first = conversation.messages("hi")
+        conversation.record("hi", "What do you want?")
+        conversation.update_context("social", "Neutral.")  # Unchanged: nothing appended
+        second = conversation.messages("a job")
+        self.assertEqual(second[:len(first)], first)
+        self.assertEqual(len(second), len(first) + 2)
+
+        conversation.record("a job", "Talk.")
+        conversation.update_context("social", "They are a fan.")
+        third = conversation.messages("thanks")
+        self.assertEqual(third[:len(second)], second)
+        self.assertEqual(third[-2], {"role": "system", "content": "They are a fan."})
+
+
+class TestConversationRequests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = patch.object(ActionManager, "select_available_backend", lambda self: None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _session(self, io, server):
+        am = GameDependencies.initialize_game(io=io, db_path=os.path.join(self.tmp.name, "conv.db"))
+        am.ai_backend = OllamaBackend(host=server.url, model="fake")
+        am.ai_service = AIService()  # No cache: every reply must come from the fake server
+        player = next(iter(am.char_mngr.characters.values()))
+        am.char_mngr.set_player(player)
+        return am
+
+    def _talk(self, am):
+        am.game_state = "conversation"
+        am.conversing_npc = am.char_mngr.npcs[0]
+
+    def _chats(self, server):
+        return [payload for _, path, payload in server.requests if path == "/api/chat"]
+
+    def test_turns_extend_the_previous_prompt(self):
+        async def scenario():
+            async with FakeOllamaServer(reply="Talk fast.") as server:
+                am = self._session(ScriptedIO([]), server)
+                self._talk(am)
+                for line in ("hey", "got work?", "I'm in"):
+                    await am.do_say(line)
+
+                chats = self._chats(server)
+                self.assertEqual(len(chats), 3)
+                for previous, current in zip(chats, chats[1:]):
+                    self.assertEqual(current["messages"][:len(previous["messages"])], previous["messages"])
+                self.assertEqual(chats[2]["messages"][-3:-1], [
+                    {"role": "user", "content": "got work?"},
+                    {"role": "assistant", "content": "Talk fast."},
+                ])
+                self.assertTrue(all(c["keep_alive"] == AI_CONFIG["keep_alive"] for c in chats))
+
+                # The NPC remembers the player after a bye
+                await am.do_bye("")
+                self._talk(am)
+                await am.do_say("back again")
+                last = self._chats(server)[-1]["messages"]
+                self.assertEqual(last[:len(chats[2]["messages"])], chats[2]["messages"])
+
+        asyncio.run(scenario())
+
+    def test_reflect_analysis_extends_the_probe(self):
+        async def scenario():
+            async with FakeOllamaServer(reply="Was it worth it?") as server:
+                am = self._session(ScriptedIO(["it had to be done"]), server)
+                am.char_mngr.player.digital_soul.recent_events.append("Shot a ganger")
+                await am.do_reflect("")
+
+                probe, analysis = self._chats(server)[:2]
+                self.assertEqual(analysis["messages"][:len(probe["messages"])], probe["messages"])
+                self.assertEqual(
+                    analysis["messages"][len(probe["messages"])],
+                    {"role": "assistant", "content": "Was it worth it?"},
+                )
+                self.assertIn("it had to be done", analysis["messages"][-1]["content"])
+
+        asyncio.run(scenario())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+# Adjust path to import NeonCore modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from NeonCore.ai_backends.service import AIService
+from NeonCore.config import AI_CONFIG
+from NeonCore.core.dependencies import GameDependencies
+from NeonCore.core.session import SessionContext
+from NeonCore.managers import database_manager
+from NeonCore.managers.database_manager import DatabaseManager
+from tests.helpers import ScriptedIO
+
+
+class TestBulkItems(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.session = SessionContext()
+        self.addCleanup(self.session.close)
+        with self.session:
+            self.db = DatabaseManager(os.path.join(self.tmp.name, "items.db"))
+        self.pistol = self.db.create_template("Pistol", "weapon", "Trusty.", base_stats='{"dmg": "2d6", "ammo": 8}')
+        self.ids = [self.db.create_instance(self.pistol, owner_id="V") for _ in range(5)]
+        self.db.update_instance_stats(self.ids[0], {"ammo": 1})
+
+    def test_get_items_matches_get_item(self):
+        statements = []
+        conn = self.db._get_connection()
+        conn.set_trace_callback(statements.append)
+        items = self.db.get_items(self.ids + ["missing"])
+        conn.set_trace_callback(None)
+
+        self.assertEqual(len(statements), 1)  # One round trip
+        self.assertEqual(list(items), self.ids)
+        for i_id in self.ids:
+            self.assertEqual(items[i_id], self.db.get_item(i_id))
+        self.assertEqual(items[self.ids[0]]["ammo"], 1)  # Instance stats override the template's
+        self.assertEqual(items[self.ids[1]]["ammo"], 8)
+
+    def test_get_items_by_owner(self):
+        other = self.db.create_instance(self.pistol, owner_id="Judy")
+        self.assertEqual([item["id"] for item in self.db.get_items_by_owner("V")], self.ids)
+        self.assertEqual(asyncio.run(self.db.get_items_by_owner_async("Judy")), [self.db.get_item(other)])
+
+    def test_template_stats_are_parsed_once(self):
+        database_manager._template_stats.clear()
+        with patch.object(database_manager.json, "loads", wraps=database_manager.json.loads) as loads:
+            items = self.db.get_items(self.ids)
+        parsed = [call.args[0] for call in loads.call_args_list]
+        self.assertEqual(parsed.count('{"dmg": "2d6", "ammo": 8}'), 1)
+        self.assertIn(self.pistol, database_manager._template_stats)
+
+        # Items do not share the cached dict
+        items[self.ids[1]]["ammo"] = 0
+        self.assertEqual(self.db.get_item(self.ids[2])["ammo"], 8)
+
+    def test_nested_template_stats_are_not_shared(self):
+        rifle = self.db.create_template("Rifle", "weapon", "Long.", base_stats='{"mods": {"scope": 2}, "tags": ["loud"]}')
+        first, second = (self.db.create_instance(rifle, owner_id="V") for _ in range(2))
+        item = self.db.get_item(first)
+        item["mods"]["scope"] = 0
+        item["tags"].append("silenced")
+        self.assertEqual(self.db.get_item(second)["mods"], {"scope": 2})
+        self.assertEqual(self.db.get_item(second)["tags"], ["loud"])
+
+
+class TestResume(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.db_path = os.path.join(self.tmp.name, "game.db")
+
+    def new_game(self):
+        with patch.dict(AI_CONFIG, {"backend": "fake"}):
+            am = GameDependencies.initialize_game(io=ScriptedIO([]), db_path=self.db_path, ai_service=AIService())
+        self.addCleanup(am.dependencies.session.close)
+        return am
+
+    def test_resume_loads_items_in_one_query(self):
+        first = self.new_game()
+        handle = next(iter(first.char_mngr.characters.values())).handle
+
+        async def play(am, commands):
+            with am.dependencies.session:
+                for command, arg in commands:
+                    await getattr(am, f"do_{command}")(arg)
+
+        asyncio.run(play(first, [("choose", handle), ("save", "")]))
+        saved = first.char_mngr.player
+
+        second = self.new_game()
+        store = second.dependencies.db.store
+        with patch.object(store, "read", wraps=store.read) as read:
+            asyncio.run(play(second, [("choose", handle)]))
+        queries = [call.args[0] for call in read.call_args_list]
+        self.assertEqual(queries.count(database_manager._items), 1)
+        self.assertNotIn(database_manager._item, queries)
+
+        resumed = second.char_mngr.player
+        for now, before in ((resumed.inventory, saved.inventory), (resumed.weapons, saved.weapons)):
+            self.assertEqual([(item["id"], item["name"]) for item in now], [(item["id"], item["name"]) for item in before])
+
+
+if __name__ == '__main__':
+    unittest.main()
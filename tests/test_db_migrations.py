@@ -0,0 +1,120 @@
+import unittest
+import os
+import sqlite3
+import sys
+import tempfile
+
+# Adjust path to import NeonCore modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from NeonCore.core.session import SessionContext
+from NeonCore.managers.database_manager import DatabaseManager
+from NeonCore.managers.migrations import MIGRATIONS, SCHEMA_VERSION, migrate, schema_version
+
+
+class TestMigrations(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "game.db")
+        self.session = SessionContext()
+        self.addCleanup(self.session.close)
+
+    def open_db(self):
+        with self.session:
+            return DatabaseManager(self.path)
+
+    def plan(self, conn, sql, *args):
+        return " ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", args).fetchall())
+
+    def test_new_database_is_at_the_latest_version(self):
+        conn = self.open_db()._get_connection()
+        self.assertEqual(schema_version(conn), SCHEMA_VERSION)
+        self.assertEqual(migrate(conn), [])  # Nothing left to do
+        versions = [row[0] for row in conn.execute("SELECT version FROM schema_version ORDER BY version")]
+        self.assertEqual(versions, list(range(1, SCHEMA_VERSION + 1)))
+
+    def test_hot_queries_use_indexes(self):
+        conn = self.open_db()._get_connection()
+        self.assertIn(
+            "idx_item_instances_location",
+            self.plan(conn, '''
+                SELECT i.instance_id, t.name FROM item_instances i
+                JOIN item_templates t ON i.template_id = t.id
+                WHERE i.location_id = ?
+            ''', "dark_alley"),
+        )
+        self.assertIn(
+            "idx_item_instances_owner", self.plan(conn, "SELECT instance_id FROM item_instances WHERE owner_id = ?", "V")
+        )
+        self.assertIn(
+            "idx_item_templates_name", self.plan(conn, "SELECT id FROM item_templates WHERE name = ?", "Pistol")
+        )
+
+    def test_template_names_are_unique(self):
+        db = self.open_db()
+        self.assertIsNotNone(db.create_template("Pistol", "weapon", "Trusty."))
+        with self.assertLogs(level="ERROR"):
+            self.assertIsNone(db.create_template("Pistol", "weapon", "Another one."))
+
+    def test_upgrades_a_database_from_before_versioning(self):
+        conn = sqlite3.connect(self.path)
+        MIGRATIONS[0](conn)  # The schema _initialize_db used to create
+        conn.executemany("INSERT INTO item_templates (id, name, type) VALUES (?, ?, 'weapon')", [
+            ("t1", "Pistol"), ("t2", "Knife"), ("t3", "Pistol"),
+        ])
+        conn.executemany("INSERT INTO item_instances (instance_id, template_id, location_id) VALUES (?, ?, 'bar')", [
+            ("i1", "t1"), ("i2", "t2"), ("i3", "t3"),
+        ])
+        conn.commit()
+        conn.close()
+
+        db = self.open_db()
+        conn = db._get_connection()
+        self.assertEqual(schema_version(conn), SCHEMA_VERSION)
+        self.assertEqual(
+            [tuple(row) for row in conn.execute("SELECT id, name FROM item_templates ORDER BY id")],
+            [("t1", "Pistol"), ("t2", "Knife")],
+        )
+        # The instance of the dropped duplicate now uses the kept template
+        self.assertEqual(db.get_item("i3")["name"], "Pistol")
+        self.assertEqual(conn.execute("SELECT template_id FROM item_instances WHERE instance_id = 'i3'").fetchone()[0], "t1")
+
+    def test_merged_duplicates_keep_their_stats(self):
+        conn = sqlite3.connect(self.path)
+        MIGRATIONS[0](conn)
+        conn.executemany("INSERT INTO item_templates (id, name, type, base_stats) VALUES (?, 'Pistol', ?, ?)", [
+            ("t1", "weapon", '{"dmg": "2d6", "ammo": 8}'),
+            ("t2", "weapon", '{"dmg": "3d6", "ammo": 8}'),
+            ("t3", "gear", '{"dmg": "2d6", "ammo": 8}'),
+        ])
+        conn.executemany("INSERT INTO item_instances (instance_id, template_id, current_stats) VALUES (?, ?, ?)", [
+            ("i1", "t1", None), ("i2", "t2", '{"ammo": 3}'), ("i3", "t3", None),
+        ])
+        conn.commit()
+        conn.close()
+
+        with self.assertLogs(level="WARNING") as logs:
+            db = self.open_db()
+        self.assertEqual(len(logs.records), 2)  # The stats of t2, the type of t3
+        self.assertEqual((db.get_item("i2")["dmg"], db.get_item("i2")["ammo"]), ("3d6", 3))
+        self.assertEqual(db.get_item("i1")["dmg"], "2d6")
+        self.assertEqual(db.get_item("i3")["dmg"], "2d6")
+
+    def test_a_failing_step_is_rolled_back(self):
+        conn = self.open_db()._get_connection()
+
+        def broken(conn):
+            """Half a migration"""
+            conn.execute("CREATE TABLE half_done (id INTEGER)")
+            conn.execute("SELECT * FROM no_such_table")
+
+        with self.assertRaises(sqlite3.OperationalError):
+            migrate(conn, MIGRATIONS + [broken])
+        self.assertEqual(schema_version(conn), SCHEMA_VERSION)
+        tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        self.assertNotIn("half_done", tables)
+
+
+if __name__ == '__main__':
+    unittest.main()
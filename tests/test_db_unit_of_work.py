@@ -0,0 +1,123 @@
+import unittest
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+# Adjust path to import NeonCore modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from NeonCore.ai_backends.service import AIService
+from NeonCore.config import AI_CONFIG
+from NeonCore.core.dependencies import GameDependencies
+from NeonCore.core.session import SessionContext
+from NeonCore.managers import database_manager
+from NeonCore.managers.database_manager import DatabaseManager
+from tests.helpers import ScriptedIO
+
+
+class TestUnitOfWork(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.session = SessionContext()
+        self.addCleanup(self.session.close)
+        with self.session:
+            self.db = DatabaseManager(os.path.join(self.tmp.name, "uow.db"))
+
+    def count(self, table):
+        return self.db._get_connection().execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def test_templates_are_reused_by_name(self):
+        pistol = self.db.create_template("Pistol", "weapon", "Trusty.", base_stats='{"dmg": "2d6"}')
+
+        uow = self.db.unit_of_work()
+        a = uow.create_instance(uow.template("Pistol", "weapon", "Other."), owner_id="V")
+        b = uow.create_instance(uow.template("Knife", "weapon", "Sharp."), owner_id="V")
+        c = uow.create_instance(uow.template("Knife", "weapon", "Sharp."), location_id="bar")
+        self.assertEqual(self.count("item_instances"), 0)  # Nothing written yet
+        self.assertTrue(uow.commit())
+
+        self.assertEqual(self.count("item_templates"), 2)
+        self.assertEqual(self.db.get_item(a)["dmg"], "2d6")  # The existing Pistol
+        self.assertEqual(self.db.get_item(b)["description"], "Sharp.")
+        self.assertEqual(self.db.get_items_in_location("bar"), [
+            {"id": c, "name": "Knife", "type": "weapon", "description": "Sharp."}
+        ])
+
+    def test_save_is_one_write(self):
+        t_id = self.db.create_template("Pistol", "weapon", "Trusty.")
+        ids = [self.db.create_instance(t_id, owner_id="V") for _ in range(10)]
+
+        async def scenario():
+            uow = self.db.unit_of_work()
+            uow.save_player("V", "bar", {"combat": {"hp": 30}}, ids, ids[:1])
+            for n, i_id in enumerate(ids):
+                uow.update_instance_stats(i_id, {"ammo": n})
+            self.assertTrue(await uow.commit_async())
+
+        asyncio.run(scenario())
+        self.assertEqual((self.db.store.writes, self.db.store.commits), (1, 1))
+        self.assertEqual([self.db.get_item(i_id)["ammo"] for i_id in ids], list(range(10)))
+        self.assertEqual(json.loads(self.db.load_player("V")["inventory_ids"]), ids)
+
+    def test_a_failed_unit_stores_nothing(self):
+        uow = self.db.unit_of_work()
+        uow.create_instance(uow.template("Knife", "weapon", "Sharp."), owner_id="V")
+        uow.create_instance(None, owner_id="V")  # template_id is NOT NULL
+        uow.save_player("V", "bar", {}, [], [])
+
+        with self.assertLogs(level="ERROR"):
+            self.assertFalse(uow.commit())
+        for table in ("item_templates", "item_instances", "player_saves"):
+            self.assertEqual(self.count(table), 0)
+
+
+class TestNewGameAndSave(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        with patch.dict(AI_CONFIG, {"backend": "fake"}):
+            self.am = GameDependencies.initialize_game(
+                io=ScriptedIO([]), db_path=os.path.join(self.tmp.name, "game.db"), ai_service=AIService()
+            )
+        self.addCleanup(self.am.dependencies.session.close)
+
+    def test_starting_gear_and_saves_are_one_write_each(self):
+        db = self.am.dependencies.db
+        handle = next(iter(self.am.char_mngr.characters.values())).handle
+
+        async def scenario():
+            with self.am.dependencies.session:
+                await self.am.do_choose(handle)
+                self.assertEqual(db.store.writes, 1)
+                await self.am.do_save("")
+                self.assertEqual(db.store.writes, 2)
+
+        asyncio.run(scenario())
+        player = self.am.char_mngr.player
+        self.assertTrue(any("Glitching Burner" in item["name"] for item in player.inventory))
+        for item in player.inventory + player.weapons:
+            stored = db.get_item(item["id"])
+            self.assertEqual(stored["name"], item["name"])
+        self.assertIn("[SYSTEM] Progress Saved.", self.am.io.output[-1])
+        saved = db.load_player(handle)
+        self.assertEqual(json.loads(saved["inventory_ids"]), player.to_dict()["inventory_ids"])
+
+    def test_failed_new_game_write_is_reported(self):
+        handle = next(iter(self.am.char_mngr.characters.values())).handle
+
+        async def scenario():
+            with self.am.dependencies.session:
+                with patch.object(database_manager.UnitOfWork, "commit_async", return_value=False):
+                    await self.am.do_choose(handle)
+
+        asyncio.run(scenario())
+        self.assertTrue(any("[ERROR] Save Failed" in line for line in self.am.io.output))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
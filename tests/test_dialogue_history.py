@@ -0,0 +1,142 @@
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+# Adjust path to import NeonCore modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from NeonCore.ai_backends.conversation import Conversation, DialogueStore, estimate_tokens
+from NeonCore.ai_backends.ollama import OllamaBackend
+from NeonCore.ai_backends.service import AIService
+from NeonCore.core.dependencies import GameDependencies
+from NeonCore.managers.action_manager import ActionManager
+from tests.fake_ollama import FakeOllamaServer
+from tests.helpers import ScriptedIO
+
+PREFIX = [{"role": "system", "content": "You are Rogue."}]
+LINE = "tell me more about the job, the pay and who else is in on it"
+
+
+def chat(conversation, n, start=0):
+    for i in range(start, start + n):
+        conversation.record(f"{i}: {LINE}", f"{i}: Talk to Padre, he knows the rest.")
+
+
+class TestConversationBudget(unittest.TestCase):
+    def test_compaction_keeps_recent_turns_verbatim(self):
+        async def scenario():
+            conversation = Conversation(PREFIX, key=("Rogue", "V"), budget=100)
+            conversation.update_context("social", "They are a fan.")
+            chat(conversation, 6)
+            self.assertTrue(conversation.needs_compaction())
+
+            seen = []
+
+            async def summarize(conv, summary, turns):
+                seen.extend(turns)
+                chat(conv, 1, start=6)  # The player keeps talking meanwhile
+                return "V asked about a job; Rogue sent them to Padre."
+
+            await conversation.compact(summarize)
+
+            self.assertTrue(all(m["role"] != "system" for m in seen))
+            self.assertEqual(seen[0]["content"], f"0: {LINE}")
+            self.assertLessEqual(conversation.history_tokens(), conversation.budget)
+            messages = conversation.messages("so?")
+            self.assertEqual(messages[0], PREFIX[0])
+            self.assertIn("Rogue sent them to Padre", messages[1]["content"])
+            # Still-current context survives, the newest exchanges stay verbatim
+            self.assertIn({"role": "system", "content": "They are a fan."}, messages)
+            self.assertEqual(messages[-2]["content"], "6: Talk to Padre, he knows the rest.")
+            self.assertEqual(messages[-4]["content"], "5: Talk to Padre, he knows the rest.")
+            self.assertEqual(messages[-1], {"role": "user", "content": "so?"})
+
+        asyncio.run(scenario())
+
+    def test_latest_exchange_is_never_summarized(self):
+        conversation = Conversation(PREFIX, budget=10)
+        chat(conversation, 1)
+        self.assertFalse(conversation.needs_compaction())
+        chat(conversation, 1, start=1)
+        self.assertEqual(conversation._split(), 2)
+
+    def test_failed_summary_keeps_turns(self):
+        async def scenario():
+            conversation = Conversation(PREFIX, budget=50)
+            chat(conversation, 4)
+            turns = list(conversation.turns)
+
+            async def summarize(conv, summary, turns):
+                raise ConnectionError("model down")
+
+            await conversation.compact(summarize)
+            self.assertEqual(conversation.turns, turns)
+            self.assertEqual(conversation.summary, "")
+
+        asyncio.run(scenario())
+
+    def test_store_close_cancels_pending_summary(self):
+        async def scenario():
+            store = DialogueStore(budget=50)
+            conversation = store.conversation(("Rogue", "V"), lambda: PREFIX)
+            self.assertIs(store.conversation(("Rogue", "V"), lambda: []), conversation)
+            chat(conversation, 4)
+
+            async def summarize(conv, summary, turns):
+                await asyncio.sleep(10)
+
+            task = conversation.compact_soon(summarize)
+            self.assertIs(conversation.compact_soon(summarize), None)  # One at a time
+            await asyncio.sleep(0)
+            store.close()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(scenario())
+
+
+class TestDialogueHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = patch.object(ActionManager, "select_available_backend", lambda self: None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_prompt_size_stays_flat(self):
+        async def scenario():
+            async with FakeOllamaServer(reply="Padre has the rest, choom.") as server:
+                am = GameDependencies.initialize_game(
+                    io=ScriptedIO([]), db_path=os.path.join(self.tmp.name, "history.db")
+                )
+                am.ai_backend = OllamaBackend(host=server.url, model="fake")
+                am.ai_service = AIService()
+                am.dialogue.budget = 120
+                am.char_mngr.set_player(next(iter(am.char_mngr.characters.values())))
+                am.game_state = "conversation"
+                am.conversing_npc = am.char_mngr.npcs[0]
+
+                for i in range(30):
+                    await am.do_say(f"{i}: {LINE}")
+                    await asyncio.sleep(0.01)  # Let background summaries land
+
+                chats = [p["messages"] for _, path, p in server.requests if path == "/api/chat"]
+                says = [m for m in chats if not m[0]["content"].startswith("You keep the memory")]
+                summaries = [m for m in chats if m[0]["content"].startswith("You keep the memory")]
+                self.assertEqual(len(says), 30)
+                self.assertGreater(len(summaries), 3)
+                sizes = [estimate_tokens(m) for m in says]
+                self.assertLess(max(sizes[10:]), sizes[0] + 2 * am.dialogue.budget)
+                # Later summaries build on the earlier ones
+                self.assertIn("Summary so far: Padre has the rest", summaries[-1][1]["content"])
+                self.assertIn("Earlier in this conversation: Padre has the rest", says[-1][1]["content"])
+                am.dependencies.session.close()
+
+        asyncio.run(scenario())
+
+
+if __name__ == '__main__':
+    unittest.main()
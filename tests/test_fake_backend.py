@@ -0,0 +1,142 @@
+import unittest
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+# Adjust path to import NeonCore modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from NeonCore.ai_backends.fake import CANNED, FakeBackend, Latency
+from NeonCore.ai_backends.service import AIService
+from NeonCore.ai_backends.structured import field_errors
+from NeonCore.config import AI_CONFIG
+from NeonCore.core.dependencies import GameDependencies
+from NeonCore.managers.trait_manager import REFLECTION_SCHEMA
+from tests.helpers import ScriptedIO
+
+
+def prompt(i):
+    return [{"role": "system", "content": "You are Lenard."}, {"role": "user", "content": f"Line {i}"}]
+
+
+class TestFakeBackend(unittest.TestCase):
+    def test_same_seed_same_replies_in_any_order(self):
+        async def scenario():
+            a, b = FakeBackend(seed=7), FakeBackend(seed=7)
+            forward = [await a.get_chat_completion_async(prompt(i)) for i in range(10)]
+            backward = [await b.get_chat_completion_async(prompt(i)) for i in reversed(range(10))]
+            self.assertEqual(forward, backward[::-1])
+            self.assertTrue(all(r["message"]["content"] in CANNED for r in forward))
+            # Asking again is a new sample, as with a real model
+            again = [await a.get_chat_completion_async(prompt(0)) for _ in range(5)]
+            self.assertGreater(len({r["message"]["content"] for r in again}), 1)
+
+        asyncio.run(scenario())
+
+    def test_templated_reply(self):
+        backend = FakeBackend(reply="You said: {last} (#{n})")
+        self.assertEqual(backend.get_chat_completion(prompt(3))["message"]["content"], "You said: Line 3 (#1)")
+        backend = FakeBackend(reply=lambda messages: str(len(messages)))
+        self.assertEqual(backend.get_chat_completion(prompt(3))["message"]["content"], "2")
+
+    def test_lognormal_latency(self):
+        latency = Latency.parse("lognormal:0.8,0.5")
+        rng = random.Random(0)
+        samples = [latency.first_token(rng) for _ in range(2000)]
+        self.assertAlmostEqual(statistics.median(samples), 0.8, delta=0.05)
+        self.assertGreater(max(samples), 3 * 0.8)  # The long tail
+        self.assertEqual(Latency.parse("fixed:0.25").first_token(rng), 0.25)
+        with self.assertRaises(ValueError):
+            Latency.parse("uniform:1")
+
+    def test_per_token_streaming(self):
+        async def scenario():
+            backend = FakeBackend(reply="one two three four five", latency="per_token:0.1,0.03")
+            start = time.perf_counter()
+            times = []
+            async for chunk in backend.stream_chat_completion_async(prompt(0)):
+                times.append(time.perf_counter() - start)
+            self.assertEqual(len(times), 5)
+            self.assertGreaterEqual(times[0], 0.1)
+            self.assertLess(times[0], 0.13)
+            self.assertGreaterEqual(times[-1], 0.1 + 4 * 0.03)
+
+        asyncio.run(scenario())
+
+    def test_failure_injection(self):
+        async def scenario():
+            async def failures(seed):
+                backend = FakeBackend(failure_rate=0.3, seed=seed)
+                failed = []
+                for i in range(200):
+                    try:
+                        await backend.get_chat_completion_async(prompt(i))
+                    except ConnectionError:
+                        failed.append(i)
+                self.assertEqual(backend.failures, len(failed))
+                return failed
+
+            failed = await failures(1)
+            self.assertTrue(40 <= len(failed) <= 80)
+            self.assertEqual(await failures(1), failed)  # Reproducible
+
+        asyncio.run(scenario())
+
+    def test_timeout(self):
+        async def scenario():
+            backend = FakeBackend(latency="fixed:5")
+            start = time.perf_counter()
+            with self.assertRaises(asyncio.TimeoutError):
+                await backend.get_chat_completion_async(prompt(0), timeout=0.05)
+            self.assertLess(time.perf_counter() - start, 1.0)
+
+        asyncio.run(scenario())
+
+    def test_structured_reply_is_valid(self):
+        async def scenario():
+            analysis = await AIService().structured(FakeBackend(), "reflect", prompt(0), REFLECTION_SCHEMA)
+            self.assertEqual(field_errors(REFLECTION_SCHEMA, analysis), {})
+
+        asyncio.run(scenario())
+
+
+class TestOfflineGame(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _game(self):
+        return GameDependencies.initialize_game(
+            io=ScriptedIO([]), db_path=os.path.join(self.tmp.name, "offline.db"), ai_service=AIService()
+        )
+
+    def test_starts_without_a_reachable_model(self):
+        with patch.dict(AI_CONFIG, {"gemini_api_key": None}), \
+                patch("NeonCore.managers.action_manager.OllamaBackend.is_known_available", lambda self: False):
+            am = self._game()
+        self.assertIsInstance(am.ai_backend, FakeBackend)
+        am.dependencies.session.close()
+
+    def test_forced_fake_backend_answers_npc_lines(self):
+        async def scenario():
+            with patch.dict(AI_CONFIG, {"backend": "fake"}):
+                am = self._game()
+            self.assertIs(am.ai_backend, am.ai_backends["fake"])
+            am.char_mngr.set_player(next(iter(am.char_mngr.characters.values())))
+            am.game_state = "conversation"
+            am.conversing_npc = am.char_mngr.npcs[0]
+            with am.dependencies.session:
+                await am.do_say("Where is the money?")
+            self.assertTrue(any(line in am.io.output[-1] for line in CANNED))
+            am.dependencies.session.close()
+
+        asyncio.run(scenario())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,182 @@
+import unittest
+import asyncio
+import json
+import os
+import sys
+from collections import OrderedDict
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Adjust path to import NeonCore modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from NeonCore.ai_backends import gemini
+from NeonCore.ai_backends.conversation import Conversation
+from NeonCore.ai_backends.gemini import GeminiBackend, split_messages
+from NeonCore.config import AI_CONFIG
+
+
+class StubChat:
+    """Stands in for genai.ChatSession: keeps its history and records what each request sent."""
+
+    def __init__(self, model, history):
+        self.model = model
+        self.history = [dict(c, parts=list(c["parts"])) for c in history]
+        self.sent = []  # The new content of each request
+
+    def _reply(self, parts):
+        self.sent.append(parts)
+        text = f"{self.model.system_instruction or 'Model'} reply {len(self.history) // 2 + 1}"
+        self.history += [{"role": "user", "parts": list(parts)}, {"role": "model", "parts": [text]}]
+        return text
+
+    def send_message(self, parts):
+        return SimpleNamespace(text=self._reply(parts))
+
+    async def send_message_async(self, parts, stream=False):
+        text = self._reply(parts)
+        if not stream:
+            return SimpleNamespace(text=text)
+
+        async def chunks():
+            for word in text.split(" "):
+                yield SimpleNamespace(text=word + " ")
+
+        return chunks()
+
+
+class StubModel:
+    built = []
+
+    def __init__(self, name, system_instruction=None):
+        self.name = name
+        self.system_instruction = system_instruction
+        self.chats = []
+        self.requests = []
+        StubModel.built.append(self)
+
+    def start_chat(self, history=None):
+        chat = StubChat(self, history or [])
+        self.chats.append(chat)
+        return chat
+
+    async def generate_content_async(self, contents, generation_config=None):
+        self.requests.append((contents, generation_config))
+        return SimpleNamespace(text=json.dumps({"stress": 10}))
+
+
+class TestGeminiBackend(unittest.TestCase):
+    def setUp(self):
+        StubModel.built = []
+        stub = SimpleNamespace(configure=lambda api_key: None, GenerativeModel=StubModel)
+        for patcher in (
+            patch.object(gemini, "genai", stub),
+            patch.object(GeminiBackend, "_models", OrderedDict()),
+            patch.dict(AI_CONFIG, {"gemini_api_key": "test-key"}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _models(self, instruction):
+        return [m for m in StubModel.built if m.system_instruction == instruction]
+
+    def _talk(self, backend, conversation, lines):
+        replies = []
+        for line in lines:
+            text = backend.get_chat_completion(conversation.messages(line))["message"]["content"]
+            conversation.record(line, text)
+            replies.append(text)
+        return replies
+
+    def test_split_messages(self):
+        instruction, contents = split_messages([
+            {"role": "system", "content": "You are Lenard."},
+            {"role": "system", "content": "Sweaty."},
+            {"role": "user", "content": "hey"},
+            {"role": "assistant", "content": "what"},
+            {"role": "system", "content": "The player is now a Fan."},
+            {"role": "user", "content": "sign this"},
+        ])
+        self.assertEqual(instruction, "You are Lenard.\nSweaty.")
+        self.assertEqual(contents, [
+            {"role": "user", "parts": ["hey"]},
+            {"role": "model", "parts": ["what"]},
+            {"role": "user", "parts": ["[Context] The player is now a Fan.", "sign this"]},
+        ])
+
+    def test_conversation_is_one_chat_session(self):
+        backend = GeminiBackend()
+        conversation = Conversation([{"role": "system", "content": "Lenard"}])
+        replies = self._talk(backend, conversation, ["hey", "got work?", "I'm in"])
+        self.assertEqual(replies, ["Lenard reply 1", "Lenard reply 2", "Lenard reply 3"])
+
+        [model] = self._models("Lenard")
+        [chat] = model.chats
+        # Each turn sent only its new message; the chat already held the rest
+        self.assertEqual(chat.sent, [["hey"], ["got work?"], ["I'm in"]])
+        self.assertEqual(len(chat.history), 6)
+
+    def test_models_are_shared_per_instruction(self):
+        lenard, judy = GeminiBackend(), GeminiBackend()  # Two player sessions
+        self._talk(lenard, Conversation([{"role": "system", "content": "Lenard"}]), ["hey"])
+        self._talk(judy, Conversation([{"role": "system", "content": "Lenard"}]), ["yo"])
+        self._talk(judy, Conversation([{"role": "system", "content": "Judy"}]), ["hi"])
+        self.assertEqual(len(self._models("Lenard")), 1)
+        self.assertEqual(len(self._models("Judy")), 1)
+        # Same model, but each conversation has its own chat
+        self.assertEqual(len(self._models("Lenard")[0].chats), 2)
+
+    def test_context_notes_keep_the_session(self):
+        backend = GeminiBackend()
+        conversation = Conversation([{"role": "system", "content": "Lenard"}])
+        self._talk(backend, conversation, ["hey"])
+        conversation.update_context("social", "The player is now a Fan.")
+        self._talk(backend, conversation, ["sign this"])
+        [model] = self._models("Lenard")
+        self.assertEqual(len(model.chats), 1)
+        self.assertEqual(model.chats[0].sent[-1], ["[Context] The player is now a Fan.", "sign this"])
+
+    def test_foreign_history_starts_a_new_chat(self):
+        backend = GeminiBackend()
+        conversation = Conversation([{"role": "system", "content": "Lenard"}])
+        self._talk(backend, conversation, ["hey"])
+        conversation.record("where's the money?", "(a pre-generated line)")  # Not from this chat
+        self._talk(backend, conversation, ["answer me"])
+        [model] = self._models("Lenard")
+        self.assertEqual(len(model.chats), 2)
+        self.assertEqual(len(model.chats[1].history), 6)  # Started from the whole conversation
+
+    def test_streamed_turns_continue_the_chat(self):
+        async def scenario():
+            backend = GeminiBackend()
+            conversation = Conversation([{"role": "system", "content": "Lenard"}])
+            for line in ("hey", "again"):
+                parts = [p async for p in backend.stream_chat_completion_async(conversation.messages(line))]
+                conversation.record(line, "".join(parts))
+            [model] = self._models("Lenard")
+            self.assertEqual(len(model.chats), 1)
+
+            # An abandoned stream does not leave its chat behind
+            stream = backend.stream_chat_completion_async(conversation.messages("and?"))
+            await anext(stream)
+            await stream.aclose()
+            self.assertEqual(len(backend._chats), 0)
+
+        asyncio.run(scenario())
+
+    def test_structured_requests_are_stateless(self):
+        async def scenario():
+            backend = GeminiBackend()
+            schema = {"type": "object", "properties": {"stress": {"type": "integer"}}}
+            messages = [{"role": "system", "content": "Analyst"}, {"role": "user", "content": "Shot a ganger"}]
+            response = await backend.get_chat_completion_async(messages, schema=schema)
+            self.assertEqual(json.loads(response["message"]["content"]), {"stress": 10})
+            [model] = self._models("Analyst")
+            self.assertEqual(model.chats, [])
+            self.assertEqual(model.requests[0][1]["response_schema"], schema)
+
+        asyncio.run(scenario())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import unittest
+import asyncio
+import os
+import sys
+from collections import Counter
+
+# Adjust path to import NeonCore modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from NeonCore.ai_backends.health import BackendUnavailable, HealthMonitor
+from NeonCore.ai_backends.host_pool import HostPool
+from NeonCore.ai_backends.ollama import OllamaBackend
+from NeonCore.ai_backends.scheduler import LLMScheduler
+from NeonCore.ai_backends.service import AIService
+from tests.fake_ollama import FakeOllamaServer
+from tests.helpers import closed_port_url
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+def chats(server):
+    return [payload for _, path, payload in server.requests if path == "/api/chat"]
+
+
+class TestHostPool(unittest.TestCase):
+    def setUp(self):
+        # Health and routing state are per URL; a port freed by one test can be reused by the next
+        HealthMonitor._monitors.clear()
+        HostPool._shared.clear()
+
+    def test_least_outstanding_spreads_concurrent_requests(self):
+        async def scenario():
+            servers = [await FakeOllamaServer(delay=0.1).start() for _ in range(3)]
+            try:
+                backend = OllamaBackend(hosts=[s.url for s in servers], model="fake")
+                await asyncio.gather(*(backend.get_chat_completion_async(MESSAGES) for _ in range(6)))
+                self.assertEqual([len(chats(s)) for s in servers], [2, 2, 2])
+                self.assertEqual([s.max_in_flight for s in servers], [2, 2, 2])
+                self.assertTrue(all(h.outstanding == 0 for h in backend.pool.hosts))
+            finally:
+                for server in servers:
+                    await server.close()
+
+        asyncio.run(scenario())
+
+    def test_faster_host_takes_more_of_the_load(self):
+        async def scenario():
+            slow = await FakeOllamaServer(delay=0.08).start()
+            fast = await FakeOllamaServer(delay=0.01).start()
+            try:
+                backend = OllamaBackend(hosts=[slow.url, fast.url], model="fake")
+
+                async def player():
+                    for _ in range(8):
+                        await backend.get_chat_completion_async(MESSAGES)
+
+                await asyncio.gather(*(player() for _ in range(3)))
+                self.assertEqual(len(chats(slow)) + len(chats(fast)), 24)
+                self.assertGreater(len(chats(fast)), 2 * len(chats(slow)))
+            finally:
+                await slow.close()
+                await fast.close()
+
+        asyncio.run(scenario())
+
+    def test_model_affinity(self):
+        async def scenario():
+            a = await FakeOllamaServer().start()
+            b = await FakeOllamaServer().start()
+            try:
+                hosts = [a.url, b.url]
+                small = OllamaBackend(hosts=hosts, model="small")
+                large = OllamaBackend(hosts=hosts, model="large")
+                self.assertIs(small.pool, large.pool)
+                for _ in range(4):
+                    await small.get_chat_completion_async(MESSAGES)
+                    await large.get_chat_completion_async(MESSAGES)
+                self.assertEqual(Counter(p["model"] for p in chats(a)), {"small": 4})
+                self.assertEqual(Counter(p["model"] for p in chats(b)), {"large": 4})
+            finally:
+                await a.close()
+                await b.close()
+
+        asyncio.run(scenario())
+
+    def test_failover_to_a_healthy_host(self):
+        async def scenario():
+            async with FakeOllamaServer(reply="Still here.") as server:
+                dead = closed_port_url()
+                backend = OllamaBackend(hosts=[dead, server.url], model="fake")
+                for _ in range(5):
+                    response = await backend.get_chat_completion_async(MESSAGES)
+                    self.assertEqual(response["message"]["content"], "Still here.")
+                chunks = [c async for c in backend.stream_chat_completion_async(MESSAGES)]
+                self.assertEqual("".join(chunks), "Still here.")
+
+                # Tried once; after that the warm, healthy host is preferred
+                down = backend.pool.hosts[0]
+                self.assertEqual(down.health.failures, 1)
+                self.assertEqual(len(chats(server)), 6)
+                self.assertEqual(backend.pool.snapshot()[server.url]["served"], 6)
+
+        asyncio.run(scenario())
+
+    def test_all_hosts_down(self):
+        async def scenario():
+            backend = OllamaBackend(hosts=[closed_port_url(), closed_port_url()], model="fake")
+            with self.assertRaises(OSError):
+                await backend.get_chat_completion_async(MESSAGES)
+            for host in backend.pool.hosts:
+                host.failed(OSError("down"))
+                host.failed(OSError("down"))
+            self.assertFalse(backend.is_available())
+            with self.assertRaises(BackendUnavailable):
+                await backend.get_chat_completion_async(MESSAGES)
+
+        asyncio.run(scenario())
+
+    def test_scheduler_capacity_scales_with_hosts(self):
+        async def scenario():
+            servers = [await FakeOllamaServer(delay=0.05).start() for _ in range(2)]
+            try:
+                scheduler = LLMScheduler(max_in_flight=1)
+                backend = OllamaBackend(hosts=[s.url for s in servers], model="fake")
+                service = AIService(scheduler=scheduler)
+                await asyncio.gather(*(service.reply(backend, "say", MESSAGES) for _ in range(4)))
+                stats = scheduler.snapshot()[backend.endpoint][backend.model_name]
+                self.assertEqual(stats["limit"], 2)
+                self.assertEqual([s.max_in_flight for s in servers], [1, 1])
+            finally:
+                for server in servers:
+                    await server.close()
+
+        asyncio.run(scenario())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+# Adjust path to import NeonCore modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from NeonCore.ai_backends.ollama import OllamaBackend
+from NeonCore.ai_backends.service import AIService
+from NeonCore.core.dependencies import GameDependencies
+from NeonCore.managers.action_manager import ActionManager
+from NeonCore.managers.thought_manager import ThoughtManager
+from tests.fake_ollama import FakeOllamaServer
+from tests.helpers import Clock, ScriptedIO
+
+THOUGHT = "Blood dries fast in this city."
+
+
+class TestThoughtManager(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.shown = []
+
+    def _manager(self, generate, interval=30):
+        async def deliver(text):
+            self.shown.append(text)
+
+        return ThoughtManager(generate, deliver, interval=interval, max_age=20, clock=self.clock)
+
+    def test_rate_limited_per_player(self):
+        async def scenario():
+            async def generate(event):
+                return f"thought about {event}"
+
+            thoughts = self._manager(generate)
+            await thoughts.trigger("V", "a")
+            self.assertIsNone(thoughts.trigger("V", "b"))
+            await thoughts.trigger("Rogue", "c")  # Other players are not affected
+            self.clock.now += 31
+            await thoughts.trigger("V", "d")
+            self.assertEqual(self.shown, ["thought about a", "thought about c", "thought about d"])
+            self.assertEqual(thoughts.dropped["rate_limited"], 1)
+
+        asyncio.run(scenario())
+
+    def test_one_in_flight_per_player(self):
+        async def scenario():
+            release = asyncio.Event()
+
+            async def generate(event):
+                await release.wait()
+                return event
+
+            thoughts = self._manager(generate, interval=0)
+            task = thoughts.trigger("V", "a")
+            # No interval, but the first thought is still being generated
+            self.assertIsNone(thoughts.trigger("V", "b"))
+            release.set()
+            await task
+            self.assertEqual(self.shown, ["a"])
+
+        asyncio.run(scenario())
+
+    def test_stale_thought_is_dropped(self):
+        async def scenario():
+            async def generate(event):
+                self.clock.now += 25  # The model took longer than max_age
+                return "too late"
+
+            thoughts = self._manager(generate)
+            await thoughts.trigger("V", "a")
+            self.assertEqual(self.shown, [])
+            self.assertEqual(thoughts.dropped["stale"], 1)
+
+        asyncio.run(scenario())
+
+    def test_slow_model_is_cut_off_at_max_age(self):
+        async def scenario():
+            cancelled = asyncio.Event()
+
+            async def generate(event):
+                try:
+                    await asyncio.sleep(60)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+
+            thoughts = ThoughtManager(generate, self.shown.append, max_age=0.05)
+            await asyncio.wait_for(thoughts.trigger("V", "a"), 1)
+            self.assertTrue(cancelled.is_set())
+            self.assertEqual((self.shown, thoughts.dropped["stale"]), ([], 1))
+
+        asyncio.run(scenario())
+
+    def test_failure_is_silent(self):
+        async def scenario():
+            async def generate(event):
+                raise ConnectionError("model down")
+
+            thoughts = self._manager(generate)
+            await thoughts.trigger("V", "a")
+            self.assertEqual((self.shown, thoughts.dropped["failed"]), ([], 1))
+
+        asyncio.run(scenario())
+
+
+class TestIntrusiveThoughtsInGame(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        for patcher in (
+            patch.object(ActionManager, "select_available_backend", lambda self: None),
+            patch("NeonCore.managers.action_manager.random.random", return_value=0.0),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _session(self, server):
+        am = GameDependencies.initialize_game(
+            io=ScriptedIO([]), db_path=os.path.join(self.tmp.name, "thoughts.db")
+        )
+        am.ai_backend = OllamaBackend(host=server.url, model="fake")
+        am.ai_service = AIService()
+        am.char_mngr.set_player(next(iter(am.char_mngr.characters.values())))
+        return am
+
+    def test_event_does_not_wait_for_the_model(self):
+        async def scenario():
+            async with FakeOllamaServer(delay=0.3, reply=THOUGHT) as server:
+                am = self._session(server)
+                start = time.perf_counter()
+                await am.log_event("Shot a ganger")
+                self.assertLess(time.perf_counter() - start, 0.1)
+                self.assertNotIn(THOUGHT, "".join(am.io.output))
+
+                await am.thoughts._pending[am.char_mngr.player.handle]
+                self.assertIn(THOUGHT, am.io.output[-1])
+                am.dependencies.session.close()
+
+        asyncio.run(scenario())
+
+    def test_session_close_cancels_pending_thought(self):
+        async def scenario():
+            async with FakeOllamaServer(delay=5.0, reply=THOUGHT) as server:
+                am = self._session(server)
+                await am.log_event("Shot a ganger")
+                task = am.thoughts._pending[am.char_mngr.player.handle]
+                await server.received.wait()
+
+                am.dependencies.session.close()
+                with self.assertRaises(asyncio.CancelledError):
+                    await task
+                for _ in range(50):
+                    if server.abandoned:
+                        break
+                    await asyncio.sleep(0.01)
+                self.assertEqual(server.abandoned, 1)
+                self.assertNotIn(THOUGHT, "".join(am.io.output))
+
+        asyncio.run(scenario())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import unittest
+import asyncio
+import os
+import sys
+
+# Adjust path to import NeonCore modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from NeonCore.ai_backends.ollama import OllamaBackend
+from NeonCore.ai_backends.scheduler import LLMScheduler
+from NeonCore.ai_backends.service import AIService
+from NeonCore.core.session import SessionContext
+from tests.fake_ollama import FakeOllamaServer
+
+
+def ask(text):
+    return [{"role": "user", "content": text}]
+
+
+class TestLLMScheduler(unittest.TestCase):
+    def _served(self, server):
+        """Prompts in the order the fake Ollama received them."""
+        return [payload["messages"][-1]["content"] for _, path, payload in server.requests if path == "/api/chat"]
+
+    async def _call(self, service, backend, site, text, session_id):
+        with SessionContext(session_id):
+            return await service.reply(backend, site, ask(text))
+
+    async def _queue_behind_blocker(self, service, backend, calls):
+        """Occupy the single slot, queue `calls`, then let them all run."""
+        blocker = asyncio.create_task(self._call(service, backend, "say", "blocker", "x"))
+        await asyncio.sleep(0.02)
+        tasks = []
+        for site, text, session_id in calls:
+            tasks.append(asyncio.create_task(self._call(service, backend, site, text, session_id)))
+            await asyncio.sleep(0)  # Deterministic arrival order
+        await asyncio.gather(blocker, *tasks)
+
+    def test_bounded_in_flight(self):
+        async def scenario():
+            async with FakeOllamaServer(delay=0.05) as server:
+                scheduler = LLMScheduler(max_in_flight=2)
+                service = AIService(scheduler=scheduler)
+                backend = OllamaBackend(host=server.url, model="fake")
+                await asyncio.gather(
+                    *(self._call(service, backend, "say", f"q{i}", f"s{i}") for i in range(10))
+                )
+                self.assertEqual(server.max_in_flight, 2)
+                stats = scheduler.snapshot()[server.url]["ollama/fake"]
+                self.assertEqual(stats["dispatched"], 10)
+                self.assertEqual(stats["in_flight"], 0)
+                self.assertEqual(stats["queued"], 0)
+                self.assertEqual(stats["max_queued"], 8)
+                self.assertGreater(stats["mean_wait_seconds"], 0)
+
+        asyncio.run(scenario())
+
+    def test_priority_classes(self):
+        async def scenario():
+            async with FakeOllamaServer(delay=0.05) as server:
+                service = AIService(scheduler=LLMScheduler(max_in_flight=1))
+                backend = OllamaBackend(host=server.url, model="fake")
+                await self._queue_behind_blocker(service, backend, [
+                    ("thought", "thought-1", "a"),
+                    ("thought", "thought-2", "b"),
+                    ("reflect", "reflect-1", "c"),
+                    ("say", "say-1", "d"),
+                ])
+                self.assertEqual(
+                    self._served(server),
+                    ["blocker", "say-1", "reflect-1", "thought-1", "thought-2"],
+                )
+
+        asyncio.run(scenario())
+
+    def test_sessions_take_turns(self):
+        async def scenario():
+            async with FakeOllamaServer(delay=0.05) as server:
+                service = AIService(scheduler=LLMScheduler(max_in_flight=1))
+                backend = OllamaBackend(host=server.url, model="fake")
+                chatty = [("say", f"a{i}", "a") for i in range(4)]
+                await self._queue_behind_blocker(service, backend, chatty + [("say", "b0", "b")])
+                self.assertEqual(self._served(server), ["blocker", "a0", "b0", "a1", "a2", "a3"])
+
+        asyncio.run(scenario())
+
+    def test_queue_depth_and_cancellation(self):
+        async def scenario():
+            async with FakeOllamaServer(delay=0.2) as server:
+                scheduler = LLMScheduler(max_in_flight=1)
+                service = AIService(scheduler=scheduler)
+                backend = OllamaBackend(host=server.url, model="fake")
+
+                blocker = asyncio.create_task(self._call(service, backend, "say", "blocker", "x"))
+                await asyncio.sleep(0.02)
+                waiting = [
+                    asyncio.create_task(self._call(service, backend, site, site, "y"))
+                    for site in ("say", "thought", "thought")
+                ]
+                await asyncio.sleep(0.02)
+                stats = scheduler.snapshot()[server.url]["ollama/fake"]
+                self.assertEqual(stats["in_flight"], 1)
+                self.assertEqual(stats["queued_by_priority"], {"say": 1, "reflect": 0, "thought": 2})
+
+                # A player leaving removes their queued requests without leaking slots
+                for task in waiting[1:]:
+                    task.cancel()
+                await asyncio.gather(*waiting[1:], return_exceptions=True)
+                self.assertEqual(scheduler.snapshot()[server.url]["ollama/fake"]["queued"], 1)
+
+                await asyncio.gather(blocker, waiting[0])
+                stats = scheduler.snapshot()[server.url]["ollama/fake"]
+                self.assertEqual((stats["in_flight"], stats["queued"]), (0, 0))
+                self.assertEqual(self._served(server), ["blocker", "say"])
+
+        asyncio.run(scenario())
+
+
+if __name__ == '__main__':
+    unittest.main()
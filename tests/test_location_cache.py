@@ -0,0 +1,281 @@
+import unittest
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+from unittest.mock import patch
+
+# Adjust path to import NeonCore modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from NeonCore.ai_backends.service import AIService
+from NeonCore.config import AI_CONFIG
+from NeonCore.core.async_sqlite import AsyncSQLite
+from NeonCore.core.dependencies import GameDependencies
+from NeonCore.core.session import SessionContext
+from NeonCore.managers import database_manager
+from NeonCore.managers.database_manager import DatabaseManager
+from NeonCore.managers.location_cache import LocationItemCache
+from NeonCore.world.world import World
+from tests.helpers import Clock, ScriptedIO
+
+
+def stored_location(db_path, instance_id):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT location_id FROM item_instances WHERE instance_id = ?", (instance_id,)).fetchone()[0]
+    finally:
+        conn.close()
+
+
+class TestLocationItemCache(unittest.TestCase):
+    def test_reads_older_than_a_change_are_not_cached(self):
+        cache = LocationItemCache("unused.db")
+        version = cache.version("bar")
+        cache.move("i1", location_id="bar")  # While the read was under way
+        cache.fill("bar", [], version)
+        self.assertIsNone(cache.get("bar"))
+
+        version = cache.version("bar")
+        cache.fill("bar", [{"id": "i1", "name": "Knife"}], version)
+        self.assertEqual(cache.get("bar"), [{"id": "i1", "name": "Knife"}])
+        cache.invalidate("bar")
+        self.assertIsNone(cache.get("bar"))
+
+    def test_moves_between_cached_locations(self):
+        cache = LocationItemCache("unused.db")
+        cache.fill("bar", [{"id": "i1", "name": "Knife"}], cache.version("bar"))
+        cache.fill("alley", [], cache.version("alley"))
+        cache.move("i1", location_id="alley")
+        cache.move("i1", location_id="bar")
+        cache.move("i1", location_id="alley")
+        self.assertEqual(cache.get("bar"), [])
+        self.assertEqual(cache.get("alley"), [{"id": "i1", "name": "Knife"}])
+        self.assertEqual(cache.dirty(), [("alley", None, "i1")])  # Only the last move is written
+
+    def test_pickups_only_from_where_the_item_is(self):
+        cache = LocationItemCache("unused.db")
+        cache.fill("bar", [{"id": "i1", "name": "Knife"}], cache.version("bar"))
+        self.assertTrue(cache.move("i1", from_location="bar"))
+        self.assertFalse(cache.move("i1", from_location="bar"))  # Already taken
+        self.assertEqual(cache.dirty(), [(None, None, "i1")])
+
+        cache.move("i2", location_id="alley")  # Dropped, not written yet
+        self.assertFalse(cache.move("i2", from_location="bar"))
+        self.assertTrue(cache.move("i2", from_location="alley"))
+        self.assertTrue(cache.move("i3", from_location="roof"))  # Unknown to the cache: taken to be there
+
+    def test_flush_policy(self):
+        clock = Clock()
+        cache = LocationItemCache("unused.db", max_dirty=3, delay=5, clock=clock)
+        cache.move("i1")
+        cache.move("i2")
+        self.assertFalse(cache.due())
+        clock.now = 5
+        self.assertTrue(cache.due())  # Too old
+        clock.now = 0
+        cache.move("i3")
+        self.assertTrue(cache.due())  # Too many
+
+        rows = cache.dirty()
+        cache.move("i1", location_id="bar")  # Moved again while being written
+        cache.written(rows)
+        self.assertEqual(cache.dirty(), [("bar", None, "i1")])
+
+
+class TestCachedItemQueries(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "items.db")
+        self.session = SessionContext()
+        self.addCleanup(self.session.close)
+        with self.session:
+            self.db = DatabaseManager(self.path)
+        self.knife = self.db.create_template("Knife", "weapon", "Sharp.")
+        self.item = self.db.create_instance(self.knife, location_id="bar")
+
+    def test_looks_and_pickups_stay_in_memory(self):
+        async def scenario():
+            self.assertEqual([i["name"] for i in await self.db.get_items_in_location_async("bar")], ["Knife"])
+            with patch.object(self.db.store, "read", side_effect=AssertionError("read from disk")), \
+                 patch.object(self.db.store, "write", side_effect=AssertionError("wrote to disk")):
+                self.assertEqual(len(await self.db.get_items_in_location_async("bar")), 1)
+                self.assertTrue(await self.db.update_item_state_async(self.item, location_id=None))
+                self.assertEqual(await self.db.get_items_in_location_async("bar"), [])
+
+            self.assertEqual(stored_location(self.path, self.item), "bar")  # Not written yet
+            self.assertTrue(await self.db.flush_async())
+            self.assertIsNone(stored_location(self.path, self.item))
+
+        asyncio.run(scenario())
+
+    def test_a_single_move_is_written_after_the_delay(self):
+        async def scenario():
+            with patch.object(self.db.location_cache, "delay", 0.05):
+                self.assertTrue(await self.db.update_item_state_async(self.item, location_id="alley"))
+                self.assertEqual(stored_location(self.path, self.item), "bar")
+                await asyncio.sleep(0.3)
+            self.assertEqual(stored_location(self.path, self.item), "alley")
+            self.assertEqual(self.db.location_cache.dirty(), [])
+
+        asyncio.run(scenario())
+
+    def test_callers_get_copies(self):
+        self.db.get_items_in_location("bar")[0]["name"] = "Spoon"
+        self.assertEqual(self.db.get_items_in_location("bar")[0]["name"], "Knife")
+
+    def test_new_instances_invalidate_their_location(self):
+        self.db.get_items_in_location("bar")
+        self.db.create_instance(self.knife, location_id="bar")
+        self.assertEqual(len(self.db.get_items_in_location("bar")), 2)
+
+    def test_sync_queries_see_pending_moves_without_writing(self):
+        self.db.update_item_state(self.item, owner_id="V")
+        self.assertEqual([i["id"] for i in self.db.get_items_by_owner("V")], [self.item])
+        self.assertEqual(self.db.get_items_in_location("bar"), [])
+
+        self.db.update_item_state(self.item, location_id="alley")
+        self.assertEqual(self.db.get_items_by_owner("V"), [])
+        self.assertEqual(self.db.get_items_in_location("alley"), [
+            {"id": self.item, "name": "Knife", "type": "weapon", "description": "Sharp."}
+        ])
+        self.assertEqual(stored_location(self.path, self.item), "bar")  # Still pending
+
+    def test_async_queries_flush_first(self):
+        async def scenario():
+            await self.db.update_item_state_async(self.item, owner_id="V")
+            self.assertEqual([i["id"] for i in await self.db.get_items_by_owner_async("V")], [self.item])
+            self.assertIsNone(stored_location(self.path, self.item))
+
+        asyncio.run(scenario())
+
+    def test_saves_carry_the_pending_moves(self):
+        self.db.get_items_in_location("bar")
+        self.db.update_item_state(self.item, location_id=None, owner_id="V")
+
+        async def scenario():
+            uow = self.db.unit_of_work()
+            uow.save_player("V", "bar", {}, [self.item], [])
+            self.assertTrue(await uow.commit_async())
+
+        asyncio.run(scenario())
+        self.assertEqual((self.db.store.writes, self.db.store.commits), (1, 1))
+        self.assertEqual(self.db.location_cache.dirty(), [])
+        self.assertIsNone(stored_location(self.path, self.item))
+
+    def test_many_moves_are_written_together(self):
+        ids = [self.db.create_instance(self.knife, location_id="alley") for _ in range(5)]
+        with patch.object(self.db.location_cache, "max_dirty", 3):
+            with patch.object(database_manager, "_move_items", wraps=database_manager._move_items) as move:
+                for i_id in ids:
+                    self.db.update_item_state(i_id, owner_id="V")
+        self.assertEqual([len(call.args[1]) for call in move.call_args_list], [3])
+        self.assertEqual(len(self.db.location_cache.dirty()), 2)
+
+    def test_an_item_is_picked_up_once(self):
+        world = World.__new__(World)
+        world.db = self.db
+
+        async def scenario():
+            return await asyncio.gather(*(world.remove_item_async("bar", "knife") for _ in range(2)))
+
+        picked = asyncio.run(scenario())
+        self.assertEqual(sorted(item is None for item in picked), [False, True])
+        self.assertEqual(self.db.location_cache.dirty(), [(None, None, self.item)])
+        self.assertEqual(self.db.get_items_in_location("bar"), [])
+
+    def test_dropped_item_can_be_picked_up_before_the_flush(self):
+        self.db.update_item_state(self.item, location_id="alley")
+        self.assertTrue(self.db.take_item(self.item, "alley"))
+        self.assertFalse(self.db.take_item(self.item, "alley"))
+        self.assertEqual(self.db.location_cache.dirty(), [(None, None, self.item)])
+        self.assertTrue(self.db.flush())
+        self.assertIsNone(stored_location(self.path, self.item))
+
+    def test_closing_writes_pending_moves(self):
+        self.db.update_item_state(self.item, location_id="alley")
+        self.session.close()
+        self.assertEqual(stored_location(self.path, self.item), "alley")
+        self.assertNotIn(self.path, LocationItemCache._caches)
+
+    def test_closing_on_the_event_loop_writes_through_the_store(self):
+        async def scenario():
+            await self.db.update_item_state_async(self.item, location_id="alley")
+            with patch.object(self.db, "flush", side_effect=AssertionError("flushed on the loop")):
+                await self.session.close_async()
+
+        asyncio.run(scenario())
+        self.assertEqual(stored_location(self.path, self.item), "alley")
+        self.assertNotIn(self.path, LocationItemCache._caches)
+        self.assertNotIn(self.path, AsyncSQLite._stores)
+
+    def test_sync_close_on_the_event_loop_is_handed_to_the_store(self):
+        async def scenario():
+            await self.db.update_item_state_async(self.item, location_id="alley")
+            with patch.object(self.db, "flush", side_effect=AssertionError("flushed on the loop")):
+                self.session.close()
+                await asyncio.gather(*DatabaseManager._closing)
+
+        asyncio.run(scenario())
+        self.assertEqual(stored_location(self.path, self.item), "alley")
+        self.assertNotIn(self.path, AsyncSQLite._stores)
+
+
+class TestLookAndTake(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "game.db")
+        with patch.dict(AI_CONFIG, {"backend": "fake"}):
+            self.am = GameDependencies.initialize_game(io=ScriptedIO([]), db_path=self.path, ai_service=AIService())
+        self.addCleanup(self.am.dependencies.session.close)
+        self.am.char_mngr.set_player(next(iter(self.am.char_mngr.characters.values())))
+        self.am.game_state = "active_game"
+        world = self.am.dependencies.world
+        world.player_position = "dark_alley"
+        self.item = world.db.create_instance(world.db.create_template("Data Shard", "gear", "Encrypted."), location_id="dark_alley")
+
+    def test_one_query_for_repeated_looks_and_a_pickup(self):
+        world = self.am.dependencies.world
+        store = world.db.store
+
+        async def scenario():
+            with self.am.dependencies.session:
+                await world.do_look("")
+                await world.do_look("")
+                await self.am.do_take("data shard")
+                await world.do_look("")
+
+        with patch.object(store, "read", wraps=store.read) as read:
+            asyncio.run(scenario())
+        queries = [call.args[0] for call in read.call_args_list]
+        self.assertEqual(queries.count(database_manager._items_in_location), 1)
+        self.assertEqual(store.writes, 0)
+
+        grounds = [line for line in self.am.io.output if "Items on ground" in line]
+        self.assertEqual(len(grounds), 2)  # Not after the pickup
+        self.assertIn("You pick up the \033[1mData Shard\033[0m.", self.am.io.output)
+
+        self.am.dependencies.session.close()
+        self.assertIsNone(stored_location(self.path, self.item))
+
+    def test_drops_do_not_use_the_session_connection(self):
+        world = self.am.dependencies.world
+        player = self.am.char_mngr.player
+        player.inventory.extend(["data shard", "Rubber Duck"])
+
+        async def scenario():
+            with self.am.dependencies.session, \
+                    patch.object(world.db, "_get_connection", side_effect=AssertionError("sync query")):
+                await self.am.do_drop("data shard")
+                await self.am.do_drop("rubber duck")
+            return await world.get_items_in_location_async("dark_alley")
+
+        names = [item["name"] for item in asyncio.run(scenario())]
+        self.assertEqual(sorted(names), ["Data Shard", "Data Shard", "Rubber Duck"])
+
+
+if __name__ == '__main__':
+    unittest.main()
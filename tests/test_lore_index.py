@@ -0,0 +1,126 @@
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+import numpy as np
+
+# Adjust path to import NeonCore modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from NeonCore.ai_backends.embedding import HashingEmbedder
+from NeonCore.ai_backends.fake import FakeBackend
+from NeonCore.ai_backends.service import AIService
+from NeonCore.config import AI_CONFIG
+from NeonCore.core.dependencies import GameDependencies
+from NeonCore.world.lore import LoreIndex, collect_passages
+from tests.helpers import ScriptedIO
+
+PASSAGES = [
+    {"source": "lore:gangs", "text": "The Maelstrom gang holds the All Foods plant and trades in cyberware."},
+    {"source": "lore:bars", "text": "The Afterlife is a merc bar built in an old morgue; Rogue runs it."},
+    {"source": "lore:corps", "text": "Arasaka tower dominates the Night City skyline downtown."},
+]
+
+
+class TestLoreIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "lore_index")
+        self.embedder = HashingEmbedder(dim=256)
+
+    def test_built_index_is_memory_mapped(self):
+        LoreIndex.build(self.path, PASSAGES, self.embedder)
+        index = LoreIndex.load(self.path, self.embedder)
+        self.assertIsInstance(index.vectors, np.memmap)
+        self.assertEqual(index.vectors.dtype, np.float16)
+        self.assertEqual(index.vectors.shape, (3, 256))
+        found = index.search("Who runs the Afterlife?", 2)
+        self.assertEqual(found[0]["source"], "lore:bars")
+        self.assertEqual(index.search("Maelstrom cyberware", 2, exclude={"lore:gangs"})[:1], [])
+
+    def test_missing_index_loads_as_none(self):
+        self.assertIsNone(LoreIndex.load(self.path, self.embedder))
+
+    def test_fresh_index_is_reused_stale_one_rebuilt(self):
+        LoreIndex.open(self.path, embedder=self.embedder)
+        with patch.object(LoreIndex, "build", wraps=LoreIndex.build) as build:
+            index = LoreIndex.open(self.path, embedder=self.embedder)
+            build.assert_not_called()
+        self.assertEqual(len(index), len(collect_passages()))
+
+        # Content changed since the index was written
+        LoreIndex.build(self.path, PASSAGES, self.embedder)
+        with patch.object(LoreIndex, "build", wraps=LoreIndex.build) as build:
+            index = LoreIndex.open(self.path, embedder=self.embedder)
+            build.assert_called_once()
+        self.assertEqual(len(index), len(collect_passages()))
+
+        # So did the embedder: old vectors are not comparable
+        with patch.object(LoreIndex, "build", wraps=LoreIndex.build) as build:
+            LoreIndex.open(self.path, embedder=HashingEmbedder(dim=128))
+            build.assert_called_once()
+
+    def test_game_content_is_indexed(self):
+        index = LoreIndex.open(self.path, embedder=self.embedder)
+        sources = {p["source"].split(":")[0] for p in index.passages}
+        self.assertEqual(sources, {"character", "npc", "story", "location"})
+        found = index.search("Heywood alley", 2)
+        self.assertTrue(found)
+        self.assertTrue(all("Heywood" in p["text"] for p in found))
+
+
+class TestLoreInPrompts(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        shared = LoreIndex.open(os.path.join(self.tmp.name, "lore_index"))
+        patcher = patch.object(LoreIndex, "_shared", shared)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.prompts = []
+        with patch.dict(AI_CONFIG, {"backend": "fake"}):
+            self.am = GameDependencies.initialize_game(
+                io=ScriptedIO([]), db_path=os.path.join(self.tmp.name, "lore.db"), ai_service=AIService()
+            )
+        self.addCleanup(self.am.dependencies.session.close)
+        self.am.ai_backend = FakeBackend(reply=lambda messages: self.prompts.append(messages) or "Yeah, choom.")
+        self.am.char_mngr.set_player(next(iter(self.am.char_mngr.characters.values())))
+        self.npc = self.am.char_mngr.npcs[0]
+        self.am.game_state = "conversation"
+        self.am.conversing_npc = self.npc
+
+    def _say(self, line):
+        with self.am.dependencies.session:
+            asyncio.run(self.am.do_say(line))
+        return [m["content"] for m in self.prompts[-1] if m["role"] == "system"]
+
+    def test_say_prompt_gets_a_few_lore_passages(self):
+        notes = [c for c in self._say("What's going on around Heywood?") if c.startswith("World notes: ")]
+        self.assertEqual(len(notes), 1)
+        passages = notes[0][len("World notes: "):].split(" | ")
+        self.assertLessEqual(len(passages), AI_CONFIG["lore_top_k"])
+        own = next(p["text"] for p in LoreIndex._shared.passages if p["source"] == f"npc:{self.npc.handle}")
+        self.assertNotIn(own, notes[0])
+
+        # Looked up once per conversation: later turns extend the same prompt
+        self._say("And the money?")
+        self.assertEqual(
+            [m for m in self.prompts[-1] if m["content"].startswith("World notes: ")],
+            [m for m in self.prompts[0] if m["content"].startswith("World notes: ")],
+        )
+
+    def test_nothing_found_is_not_searched_again(self):
+        with patch.object(LoreIndex._shared, "search", return_value=[]) as search:
+            self._say("Nice jacket.")
+            self._say("Where'd you get it?")
+        self.assertEqual(search.call_count, 1)
+        self.assertFalse([m for m in self.prompts[-1] if m["content"].startswith("World notes: ")])
+
+
+if __name__ == '__main__':
+    unittest.main()
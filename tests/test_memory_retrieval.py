@@ -0,0 +1,129 @@
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+import numpy as np
+
+# Adjust path to import NeonCore modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from NeonCore.ai_backends.embedding import HashingEmbedder, VectorIndex
+from NeonCore.ai_backends.fake import FakeBackend
+from NeonCore.ai_backends.service import AIService
+from NeonCore.config import AI_CONFIG
+from NeonCore.core.dependencies import GameDependencies
+from NeonCore.managers.trait_manager import DigitalSoul
+from tests.helpers import ScriptedIO
+
+FILLER = [
+    "Bought noodles at the night market -> the broth was cold",
+    "Slept in the capsule hotel -> dreamed of static",
+    "Fixed the bike's cooling loop -> grease everywhere",
+    "Watched a braindance of the ocean -> never seen it for real",
+]
+
+
+def filler(n):
+    return [f"{FILLER[i % len(FILLER)]} (day {i})" for i in range(n)]
+
+
+class TestVectorIndex(unittest.TestCase):
+    def test_hashing_embedder_is_stable(self):
+        embedder = HashingEmbedder(dim=64)
+        a, b = embedder.embed(["Lenard owes me eddies", "Lenard owes me eddies"])
+        self.assertEqual(a.shape, (64,))
+        np.testing.assert_array_equal(a, b)
+        # Stopwords alone carry no meaning
+        self.assertFalse(embedder.embed(["it was the"]).any())
+
+    def test_top_k_most_similar_first(self):
+        index = VectorIndex(HashingEmbedder(dim=256))
+        index.add(filler(30))
+        index.add(["Lenard the dirty cop took my gun", "Lenard lied about the money"])
+        self.assertEqual(len(index), 32)  # Grew past its initial capacity
+        found = [text for text, _ in index.search("Where is Lenard's money?", 2)]
+        self.assertEqual(found, ["Lenard lied about the money", "Lenard the dirty cop took my gun"])
+
+    def test_unrelated_texts_are_left_out(self):
+        index = VectorIndex(HashingEmbedder(dim=512))
+        index.add(["Lenard the dirty cop took my gun", "Lenard lied about the money"])
+        self.assertEqual(index.search("corporate espionage", 3), [])
+
+    def test_pluggable_embedder(self):
+        class Constant:
+            dim = 2
+
+            def embed(self, texts):
+                return np.ones((len(texts), 2))
+
+        index = VectorIndex(Constant())
+        index.add(["a", "b", "c"])
+        self.assertEqual(len(index.search("anything", 2)), 2)
+
+
+class TestSoulMemories(unittest.TestCase):
+    def test_relevant_memories(self):
+        soul = DigitalSoul(memories=filler(200))
+        soul.memories.append("Shot a ganger in Heywood -> the guilt stays")
+        self.assertEqual(soul.relevant_memories("Back in Heywood with a ganger", k=1),
+                         ["Shot a ganger in Heywood -> the guilt stays"])
+        self.assertLessEqual(len(soul.relevant_memories("noodles at the market")), AI_CONFIG["memory_top_k"])
+
+    def test_saved_soul_is_reindexed(self):
+        soul = DigitalSoul(memories=["Judy fixed my arm -> trust her"])
+        soul.relevant_memories("Judy")
+        loaded = DigitalSoul.from_dict(soul.to_dict())
+        self.assertNotIn("memory_index", soul.to_dict())
+        self.assertEqual(loaded.relevant_memories("Judy"), ["Judy fixed my arm -> trust her"])
+        # Editing the list (not just appending) rebuilds the index
+        loaded.memories[0] = "Judy sold me out -> never again"
+        self.assertEqual(loaded.relevant_memories("Judy"), ["Judy sold me out -> never again"])
+
+
+class TestMemoriesInPrompts(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.prompts = []
+        self.backend = FakeBackend(reply=lambda messages: self.prompts.append(messages) or "Yeah, choom.")
+        with patch.dict(AI_CONFIG, {"backend": "fake"}):
+            self.am = GameDependencies.initialize_game(
+                io=ScriptedIO([]), db_path=os.path.join(self.tmp.name, "memories.db"), ai_service=AIService()
+            )
+        self.addCleanup(self.am.dependencies.session.close)
+        self.am.ai_backend = self.backend
+        self.player = next(iter(self.am.char_mngr.characters.values()))
+        self.am.char_mngr.set_player(self.player)
+        self.npc = self.am.char_mngr.npcs[0]
+        self.am.game_state = "conversation"
+        self.am.conversing_npc = self.npc
+
+    def _say_prompt_size(self, memories):
+        self.player.digital_soul.memories = memories + [f"{self.npc.handle} pulled a knife on me -> watch the hands"]
+        self.am.dialogue = type(self.am.dialogue)()  # A fresh conversation
+        with self.am.dependencies.session:
+            asyncio.run(self.am.do_say("Remember me?"))
+        return self.prompts[-1]
+
+    def test_say_prompt_gets_related_memories_only(self):
+        messages = self._say_prompt_size(filler(50))
+        context = "\n".join(m["content"] for m in messages if m["role"] == "system")
+        self.assertIn("pulled a knife on me", context)
+        self.assertNotIn("capsule hotel", context)
+
+    def test_prompt_size_does_not_grow_with_age(self):
+        young = sum(len(m["content"]) for m in self._say_prompt_size(filler(5)))
+        old = sum(len(m["content"]) for m in self._say_prompt_size(filler(2000)))
+        self.assertLess(old, young * 1.5)
+
+    def test_thought_prompt(self):
+        self.player.digital_soul.memories = filler(20) + ["Shot a ganger in Heywood -> the guilt stays"]
+        asyncio.run(self.am._intrusive_thought("Shot another ganger"))
+        self.assertIn("the guilt stays", self.prompts[-1][0]["content"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import unittest
+import asyncio
+import os
+import sys
+import time
+from collections import Counter
+
+# Adjust path to import NeonCore modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from NeonCore.ai_backends.gemini import GeminiBackend
+from NeonCore.ai_backends.health import HealthMonitor
+from NeonCore.ai_backends.host_pool import HostPool
+from NeonCore.ai_backends.ollama import OllamaBackend
+from NeonCore.ai_backends.routing import ModelRouter
+from NeonCore.ai_backends.scheduler import LLMScheduler
+from NeonCore.ai_backends.service import AIService
+from NeonCore.config import AI_CONFIG
+from tests.fake_ollama import FakeOllamaServer
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+TIERS = {"small": "tiny", "large": "huge"}
+TASKS = {"thought": "small", "say": "large", "reflect": "large"}
+
+
+class SizedServer(FakeOllamaServer):
+    """The large model is slow, the small one fast."""
+
+    def delay_for(self, path, payload):
+        return 0.2 if payload.get("model") == "huge" else 0.01
+
+
+def models(server):
+    return [payload["model"] for _, path, payload in server.requests if path == "/api/chat"]
+
+
+class TestModelRouting(unittest.TestCase):
+    def setUp(self):
+        HealthMonitor._monitors.clear()
+        HostPool._shared.clear()
+
+    def test_with_model_shares_the_hosts(self):
+        backend = OllamaBackend(host="http://127.0.0.1:1", model="huge")
+        small = backend.with_model("tiny")
+        self.assertEqual((small.model, small.model_name), ("tiny", "ollama/tiny"))
+        self.assertIs(small.pool, backend.pool)
+        self.assertEqual(small.endpoint, backend.endpoint)
+        self.assertIs(backend.with_model("tiny"), small)
+        self.assertIs(small.with_model("huge"), backend)
+        self.assertEqual(backend.model, "huge")
+
+    def test_single_model_backend_ignores_tiers(self):
+        backend = GeminiBackend()
+        router = ModelRouter(TIERS, TASKS, {})
+        self.assertIs(router.route(backend, "thought"), backend)
+
+    def test_no_fallback_to_the_same_model(self):
+        router = ModelRouter(TIERS, TASKS, {"say": 0.5}, scheduler=LLMScheduler(max_in_flight=1))
+        backend = GeminiBackend()
+        router.observe(backend, 10.0)  # Far over budget, but there is no smaller model
+        self.assertIs(router.route(backend, "say"), backend)
+        self.assertEqual(router.fallbacks, 0)
+
+    def test_default_tiers_keep_shared_prompts_on_one_model(self):
+        tiers = AI_CONFIG["task_tiers"]
+        self.assertEqual(tiers["probe"], tiers["reflect"])
+        self.assertEqual(tiers["greeting"], tiers["say"])
+
+    def test_call_sites_use_their_tier(self):
+        async def scenario():
+            async with SizedServer() as server:
+                backend = OllamaBackend(host=server.url, model="huge")
+                service = AIService(router=ModelRouter(TIERS, TASKS, {}))
+                await service.reply(backend, "thought", MESSAGES)
+                await service.reply(backend, "say", MESSAGES)
+                await service.reply(backend, "unknown", MESSAGES)  # Unlisted sites get the largest tier
+                self.assertEqual(models(server), ["tiny", "huge", "huge"])
+
+        asyncio.run(scenario())
+
+    def test_deep_queue_falls_back_to_the_small_model(self):
+        async def scenario():
+            async with SizedServer() as server:
+                scheduler = LLMScheduler(max_in_flight=1)
+                router = ModelRouter(TIERS, TASKS, {"say": 0.5}, scheduler=scheduler)
+                service = AIService(scheduler=scheduler, router=router)
+                backend = OllamaBackend(host=server.url, model="huge")
+
+                await service.reply(backend, "say", MESSAGES)  # Learns the large model's latency
+                # Six players talk at once: after the first two the large queue is over budget
+                await asyncio.gather(*(service.reply(backend, "say", MESSAGES) for _ in range(6)))
+                counts = Counter(models(server)[1:])
+                self.assertGreater(counts["tiny"], 0)
+                self.assertGreater(counts["huge"], 0)
+                self.assertEqual(router.fallbacks, counts["tiny"])
+
+                # The queue has drained: back to the large model
+                await service.reply(backend, "say", MESSAGES)
+                self.assertEqual(models(server)[-1], "huge")
+
+        asyncio.run(scenario())
+
+    def test_small_model_does_not_queue_behind_the_large_one(self):
+        async def scenario():
+            async with SizedServer() as server:
+                scheduler = LLMScheduler(max_in_flight=1)
+                service = AIService(scheduler=scheduler, router=ModelRouter(TIERS, TASKS, {}, scheduler=scheduler))
+                backend = OllamaBackend(host=server.url, model="huge")
+                busy = [asyncio.create_task(service.reply(backend, "say", MESSAGES)) for _ in range(3)]
+                await asyncio.sleep(0.02)
+                self.assertEqual(scheduler.queue_for(backend).queued, 2)
+
+                started = time.perf_counter()
+                await service.reply(backend, "thought", MESSAGES)
+                self.assertLess(time.perf_counter() - started, 0.15)  # The large queue needs ~0.6s
+                self.assertEqual(scheduler.queue_for(backend).queued, 2)
+                await asyncio.gather(*busy)
+                self.assertEqual(set(scheduler.snapshot()[server.url]), {"ollama/huge", "ollama/tiny"})
+
+        asyncio.run(scenario())
+
+    def test_no_budget_means_no_fallback(self):
+        async def scenario():
+            async with SizedServer() as server:
+                scheduler = LLMScheduler(max_in_flight=1)
+                router = ModelRouter(TIERS, TASKS, {}, scheduler=scheduler)
+                service = AIService(scheduler=scheduler, router=router)
+                backend = OllamaBackend(host=server.url, model="huge")
+                await service.reply(backend, "reflect", MESSAGES)
+                await asyncio.gather(*(service.reply(backend, "reflect", MESSAGES) for _ in range(4)))
+                self.assertEqual(set(models(server)), {"huge"})
+                self.assertIn("ollama/huge", router.snapshot()["latency_seconds"])
+
+        asyncio.run(scenario())
+
+
+if __name__ == '__main__':
+    unittest.main()
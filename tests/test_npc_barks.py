@@ -0,0 +1,175 @@
+import unittest
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+# Adjust path to import NeonCore modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from NeonCore.ai_backends.ollama import OllamaBackend
+from NeonCore.ai_backends.service import AIService
+from NeonCore.config import AI_CONFIG
+from NeonCore.core.dependencies import GameDependencies
+from NeonCore.core.session import SessionContext
+from NeonCore.generate_barks import generate_barks
+from NeonCore.managers.action_manager import ActionManager
+from NeonCore.managers.bark_manager import INTENTS, NEUTRAL, BarkManager, classify_intent
+from NeonCore.managers.database_manager import DatabaseManager
+from tests.fake_ollama import FakeOllamaServer
+from tests.helpers import ScriptedIO
+
+BARK = "Not now, choom. Come back with eddies."
+
+
+class TestBarkLibrary(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.session = SessionContext()
+        self.addCleanup(self.session.close)
+        patcher = patch.object(ActionManager, "select_available_backend", lambda self: None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        with self.session:
+            self.db = DatabaseManager(os.path.join(self.tmp.name, "barks.db"))
+
+    def test_classify_intent(self):
+        self.assertEqual(classify_intent("Talk or I'll kill you"), "threat")
+        self.assertEqual(classify_intent("Please, I need a favour"), "plea")
+        self.assertEqual(classify_intent("Hey Lenard"), "greeting")
+        self.assertEqual(classify_intent("See you around"), "farewell")
+        self.assertEqual(classify_intent("Where is the money?"), "question")
+        self.assertEqual(classify_intent("Nice jacket."), "chatter")
+
+    def test_lookup_uses_the_index(self):
+        conn = self.db._get_connection()
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT text FROM npc_barks WHERE npc = ? AND relationship IN (?, ?) AND intent IN (?, ?)",
+            ("Lenard", "Fan", NEUTRAL, "threat", "chatter"),
+        ).fetchall()
+        self.assertIn("idx_npc_barks_key", " ".join(row[-1] for row in plan))
+
+    def test_pick_prefers_the_closest_match(self):
+        self.db.add_barks([
+            ("Lenard", NEUTRAL, "chatter", "Small talk."),
+            ("Lenard", NEUTRAL, "threat", "Easy, easy."),
+            ("Lenard", "Fan", "threat", "Anything for you!"),
+            ("Judy", NEUTRAL, "threat", "Not Lenard."),
+        ])
+        barks = BarkManager(self.db, random.Random(0))
+        pick = lambda *key: asyncio.run(barks.pick(*key))
+        self.assertEqual(pick("Lenard", "Fan", "threat"), "Anything for you!")
+        self.assertEqual(pick("Lenard", None, "threat"), "Easy, easy.")
+        self.assertEqual(pick("Lenard", "Fan", "question"), "Small talk.")
+        self.assertIsNone(pick("Rogue", None, "threat"))
+
+    def test_same_line_is_not_repeated_back_to_back(self):
+        self.db.add_barks([("Lenard", NEUTRAL, "chatter", f"Line {i}.") for i in range(3)])
+        barks = BarkManager(self.db, random.Random(1))
+        picked = [asyncio.run(barks.pick("Lenard", None, "chatter")) for _ in range(20)]
+        self.assertTrue(all(a != b for a, b in zip(picked, picked[1:])))
+
+    def test_batch_uses_the_say_prompt(self):
+        async def scenario():
+            async with FakeOllamaServer(reply=BARK) as server:
+                with self.session:
+                    am = GameDependencies.initialize_game(
+                        io=ScriptedIO([]), db_path=os.path.join(self.tmp.name, "game.db")
+                    )
+                npc = am.char_mngr.npcs[0]
+                backend = OllamaBackend(host=server.url, model="fake")
+                stored = await generate_barks(backend, self.db, [npc], per_key=1)
+                self.assertEqual(stored, 2 * len(INTENTS))
+                # do_say's system prompt, addressed to a stranger instead of the player
+                player = next(iter(am.char_mngr.characters.values()))
+                say_prompt = am._conversation_with(npc, player).prefix[0]["content"]
+                self.assertEqual(
+                    server.requests[0][2]["messages"][0]["content"],
+                    say_prompt.replace(f"{player.handle} ({player.role})", "a stranger (Edgerunner)"),
+                )
+                fan = [p["messages"] for _, _, p in server.requests if len(p["messages"]) == 3]
+                self.assertEqual(len(fan), len(INTENTS))  # Fan lines carry the relationship context
+                self.assertEqual(await BarkManager(self.db).pick(npc.handle, "Fan", "threat"), BARK)
+
+                await generate_barks(backend, self.db, [npc], per_key=1, replace=True)
+                self.assertEqual(len(self.db.get_barks(npc.handle, [NEUTRAL, "Fan"], INTENTS)), 2 * len(INTENTS))
+                am.dependencies.session.close()
+
+        asyncio.run(scenario())
+
+
+class TestSayDeadline(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        for patcher in (
+            patch.object(ActionManager, "select_available_backend", lambda self: None),
+            patch.dict(AI_CONFIG, {"say_deadline": 0.2}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _conversation(self, server):
+        am = GameDependencies.initialize_game(io=ScriptedIO([]), db_path=os.path.join(self.tmp.name, "say.db"))
+        am.ai_backend = OllamaBackend(host=server.url, model="fake")
+        am.ai_service = AIService()
+        am.char_mngr.set_player(next(iter(am.char_mngr.characters.values())))
+        am.game_state = "conversation"
+        am.conversing_npc = am.char_mngr.npcs[0]
+        return am
+
+    def test_slow_model_gets_a_bark(self):
+        async def scenario():
+            async with FakeOllamaServer(delay=5.0, reply="Too late.") as server:
+                am = self._conversation(server)
+                npc = am.conversing_npc
+                am.dependencies.db.add_barks([(npc.handle, NEUTRAL, "question", BARK)])
+                sync_lookup = patch.object(am.dependencies.db, "get_barks", side_effect=AssertionError("sync query"))
+                with am.dependencies.session, sync_lookup:
+                    start = time.perf_counter()
+                    await am.do_say("Where is the money?")
+                    self.assertLess(time.perf_counter() - start, 1.0)
+                self.assertEqual(am.io.output[-1], f"\033[1;35m{npc.handle}: {BARK}\033[0m")
+                # The bark is part of the conversation from now on
+                conversation = am._conversation_with(npc, am.char_mngr.player)
+                self.assertEqual(conversation.turns[-1]["content"], BARK)
+                for _ in range(50):
+                    if server.abandoned:
+                        break
+                    await asyncio.sleep(0.01)
+                self.assertEqual(server.abandoned, 1)
+                am.dependencies.session.close()
+
+        asyncio.run(scenario())
+
+    def test_empty_library_still_reports_the_glitch(self):
+        async def scenario():
+            async with FakeOllamaServer(delay=5.0) as server:
+                am = self._conversation(server)
+                with am.dependencies.session:
+                    await am.do_say("Where is the money?")
+                self.assertIn("glitches out", am.io.output[-1])
+                am.dependencies.session.close()
+
+        asyncio.run(scenario())
+
+    def test_fast_model_is_used(self):
+        async def scenario():
+            async with FakeOllamaServer(reply="Right here.") as server:
+                am = self._conversation(server)
+                am.dependencies.db.add_barks([(am.conversing_npc.handle, NEUTRAL, "question", BARK)])
+                with am.dependencies.session:
+                    await am.do_say("Where is the money?")
+                self.assertIn("Right here.", am.io.output[-1])
+                self.assertEqual(am.barks.used, 0)
+                am.dependencies.session.close()
+
+        asyncio.run(scenario())
+
+
+if __name__ == '__main__':
+    unittest.main()
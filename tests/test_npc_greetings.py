@@ -0,0 +1,133 @@
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+# Adjust path to import NeonCore modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from NeonCore.ai_backends.fake import FakeBackend
+from NeonCore.ai_backends.service import AIService
+from NeonCore.config import AI_CONFIG
+from NeonCore.core.dependencies import GameDependencies
+from NeonCore.managers.greeting_manager import GreetingManager
+from tests.helpers import Clock, ScriptedIO
+
+
+class TestGreetingManager(unittest.TestCase):
+    def test_stale_greetings_are_not_used(self):
+        async def scenario():
+            async def generate(messages):
+                return " Yo. "
+
+            clock = Clock()
+            greetings = GreetingManager(generate, ttl=60, clock=clock)
+            messages = [{"role": "user", "content": "(V walks up to you.)"}]
+            await greetings.prefetch("Lazlo", messages)
+            self.assertIsNone(greetings.take("Lazlo", messages + [{"role": "user", "content": "more"}]))
+
+            await greetings.prefetch("Lazlo", messages)
+            clock.now = 61
+            self.assertIsNone(greetings.take("Lazlo", messages))
+            self.assertEqual(greetings.stats["stale"], 2)
+
+            await greetings.prefetch("Lazlo", messages)
+            self.assertEqual(greetings.take("Lazlo", messages), "Yo.")
+            self.assertIsNone(greetings.take("Lazlo", messages))  # Used once
+
+        asyncio.run(scenario())
+
+    def test_one_prefetch_per_npc_and_prompt(self):
+        async def scenario():
+            calls = []
+
+            async def generate(messages):
+                calls.append(messages)
+                await asyncio.sleep(0.01)
+                return "Yo."
+
+            greetings = GreetingManager(generate)
+            messages = [{"role": "user", "content": "(V walks up to you.)"}]
+            first = greetings.prefetch("Lazlo", messages)
+            self.assertIs(greetings.prefetch("Lazlo", messages), first)
+            await first
+            self.assertEqual(len(calls), 1)
+
+        asyncio.run(scenario())
+
+
+class TestGreetingPrefetch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.prompts = []
+        self.backend = FakeBackend(
+            reply=lambda messages: self.prompts.append(messages) or "Choom! Been a while.", latency="fixed:0.2"
+        )
+        with patch.dict(AI_CONFIG, {"backend": "fake"}):
+            self.am = GameDependencies.initialize_game(
+                io=ScriptedIO([]), db_path=os.path.join(self.tmp.name, "greetings.db"), ai_service=AIService()
+            )
+        self.addCleanup(self.am.dependencies.session.close)
+        self.am.ai_backend = self.backend
+        self.am.char_mngr.set_player(next(iter(self.am.char_mngr.characters.values())))
+        self.am.game_state = "before_perception_check"
+        self.am.dependencies.world.player_position = "dark_alley"
+
+    def _run(self, scenario):
+        async def in_session():
+            with self.am.dependencies.session:
+                await scenario()
+
+        asyncio.run(in_session())
+
+    def test_first_talk_is_greeted_instantly(self):
+        async def scenario():
+            await self.am.do_go("north")  # Lazlo is in the industrial zone
+            await asyncio.sleep(0.3)
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            await self.am.do_talk("lazlo")
+            self.assertLess(loop.time() - start, 0.1)
+            self.assertIn("Lazlo: Choom! Been a while.", self.am.io.output[-1])
+
+            # The conversation goes on from the greeting
+            await self.am.do_say("Got work?")
+            greeting, say = self.prompts[0], self.prompts[-1]
+            self.assertEqual(say[:len(greeting)], greeting)
+            self.assertEqual(say[len(greeting)], {"role": "assistant", "content": "Choom! Been a while."})
+            self.assertEqual(self.am.greetings.stats["used"], 1)
+
+        self._run(scenario)
+
+    def test_leaving_cancels_unused_prefetches(self):
+        async def scenario():
+            await self.am.do_go("north")
+            await asyncio.sleep(0)
+            await self.am.do_go("south")
+            await asyncio.sleep(0.3)
+            self.assertEqual(self.am.greetings.stats["cancelled"], 1)
+            # Coming straight back finds no greeting: the old one was cancelled, a new one just started
+            await self.am.do_go("north")
+            await self.am.do_talk("lazlo")
+            self.assertEqual(self.am.greetings.stats["used"], 0)
+
+        self._run(scenario)
+
+    def test_talking_before_the_greeting_is_ready_does_not_wait(self):
+        async def scenario():
+            await self.am.do_go("north")
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            await self.am.do_talk("lazlo")
+            self.assertLess(loop.time() - start, 0.1)
+            self.assertFalse(any("Choom" in line for line in self.am.io.output))
+            self.assertEqual(self.am.game_state, "conversation")
+
+        self._run(scenario)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+import unittest
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+# Adjust path to import NeonCore modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from NeonCore.ai_backends.ollama import OllamaBackend
+from NeonCore.ai_backends.service import AIService
+from NeonCore.ai_backends.structured import field_errors, parse_fields, validate
+from NeonCore.core.dependencies import GameDependencies
+from NeonCore.managers.action_manager import ActionManager
+from NeonCore.managers.trait_manager import REFLECTION_SCHEMA
+from tests.fake_ollama import FakeOllamaServer
+from tests.helpers import ScriptedIO
+
+ANALYSIS = {
+    "stress_change": -15,
+    "new_traits": ["Protective"],
+    "memory_summary": "Saved the kid, felt human again.",
+    "big5_drift": {"agreeableness": 2},
+    "dark_triad_drift": {},
+    "light_triad_drift": {"humanism": 3},
+}
+
+
+class ScriptedServer(FakeOllamaServer):
+    """Answers /api/chat with the next reply from a list."""
+
+    def __init__(self, replies):
+        super().__init__()
+        self.replies = list(replies)
+
+    def respond(self, path, payload):
+        if path != "/api/chat":
+            return super().respond(path, payload)
+        return {"message": {"role": "assistant", "content": self.replies.pop(0)}, "done": True}
+
+    def chats(self):
+        return [payload for _, path, payload in self.requests if path == "/api/chat"]
+
+
+class TestValidator(unittest.TestCase):
+    def test_valid_analysis(self):
+        self.assertEqual(validate(REFLECTION_SCHEMA, ANALYSIS), [])
+        self.assertEqual(field_errors(REFLECTION_SCHEMA, ANALYSIS), {})
+
+    def test_errors_are_per_field(self):
+        bad = dict(ANALYSIS, stress_change="lots", dark_triad_drift={"psychopathy": -4, "charm": 1})
+        del bad["memory_summary"]
+        errors = field_errors(REFLECTION_SCHEMA, bad)
+        self.assertEqual(sorted(errors), ["dark_triad_drift", "memory_summary", "stress_change"])
+        self.assertIn("psychopathy should be >= 0", errors["dark_triad_drift"])
+        self.assertIn("charm is not allowed", errors["dark_triad_drift"])
+        self.assertEqual(validate({"type": "integer"}, True), ["value should be integer"])
+
+    def test_parse_fields_salvages_broken_reply(self):
+        text = 'Sure! {"stress_change": +5, "new_traits": ["Numb"], "memory_summary": "It was the job", "big5_dr'
+        self.assertEqual(
+            parse_fields(text),
+            {"stress_change": 5, "new_traits": ["Numb"], "memory_summary": "It was the job"},
+        )
+        self.assertEqual(parse_fields(json.dumps(ANALYSIS)), ANALYSIS)
+        self.assertEqual(parse_fields("no json here"), {})
+
+
+class TestStructuredReplies(unittest.TestCase):
+    def test_valid_reply_takes_one_call(self):
+        async def scenario():
+            async with ScriptedServer([json.dumps(ANALYSIS)]) as server:
+                backend = OllamaBackend(host=server.url, model="fake")
+                data = await AIService().structured(backend, "reflect", [], REFLECTION_SCHEMA)
+                self.assertEqual(data, ANALYSIS)
+                self.assertEqual(len(server.chats()), 1)
+                self.assertEqual(server.chats()[0]["format"], REFLECTION_SCHEMA)
+
+        asyncio.run(scenario())
+
+    def test_repair_asks_only_for_invalid_fields(self):
+        async def scenario():
+            broken = dict(ANALYSIS, big5_drift={"agreeableness": "a bit"})
+            del broken["memory_summary"]
+            fix = {"big5_drift": {"agreeableness": 1}, "memory_summary": "Did it for the kid."}
+            async with ScriptedServer([json.dumps(broken), json.dumps(fix)]) as server:
+                backend = OllamaBackend(host=server.url, model="fake")
+                messages = [{"role": "user", "content": "analyze"}]
+                data = await AIService().structured(backend, "reflect", messages, REFLECTION_SCHEMA)
+
+                self.assertEqual(data, dict(ANALYSIS, **fix))
+                first, repair = server.chats()
+                self.assertEqual(sorted(repair["format"]["properties"]), ["big5_drift", "memory_summary"])
+                self.assertEqual(repair["messages"][:2], [messages[0], {"role": "assistant", "content": json.dumps(broken)}])
+                self.assertIn("big5_drift", repair["messages"][-1]["content"])
+                self.assertNotIn("stress_change", repair["messages"][-1]["content"])
+
+        asyncio.run(scenario())
+
+    def test_fields_still_invalid_are_left_out(self):
+        async def scenario():
+            broken = dict(ANALYSIS, stress_change="lots")
+            async with ScriptedServer([json.dumps(broken), '{"stress_change": "still lots"}']) as server:
+                backend = OllamaBackend(host=server.url, model="fake")
+                data = await AIService().structured(backend, "reflect", [], REFLECTION_SCHEMA, repairs=1)
+                self.assertNotIn("stress_change", data)
+                self.assertEqual(data["new_traits"], ["Protective"])
+                self.assertEqual(len(server.chats()), 2)
+
+        asyncio.run(scenario())
+
+
+class TestReflect(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = patch.object(ActionManager, "select_available_backend", lambda self: None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reflect_applies_structured_analysis(self):
+        async def scenario():
+            replies = ["Was the kid worth the bullet?", json.dumps(ANALYSIS)]
+            async with ScriptedServer(replies) as server:
+                am = GameDependencies.initialize_game(
+                    io=ScriptedIO(["yes"]), db_path=os.path.join(self.tmp.name, "reflect.db")
+                )
+                am.ai_backend = OllamaBackend(host=server.url, model="fake")
+                am.ai_service = AIService()
+                am.char_mngr.set_player(next(iter(am.char_mngr.characters.values())))
+                soul = am.char_mngr.player.digital_soul
+                soul.stress = 50
+                soul.recent_events.append("Saved a kid from a ganger")
+                await am.do_reflect("")
+
+                probe, analysis = server.chats()
+                self.assertNotIn("format", probe)
+                self.assertEqual(analysis["format"], REFLECTION_SCHEMA)
+                self.assertEqual(soul.stress, 35)
+                self.assertIn("Protective", soul.traits)
+                self.assertEqual(soul.light_triad.humanism, 3)
+                self.assertEqual(soul.recent_events, [])
+                am.dependencies.session.close()
+
+        asyncio.run(scenario())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+
+# Adjust path to import NeonCore modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from NeonCore.ai_backends.cache import ResponseCache, cache_key
+from NeonCore.ai_backends.ollama import OllamaBackend
+from NeonCore.ai_backends.service import AIService
+from tests.fake_ollama import FakeOllamaServer
+from tests.helpers import Clock
+
+MESSAGES = [
+    {"role": "system", "content": "You are Judy, a Techie."},
+    {"role": "user", "content": "Got any work?"},
+]
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "cache.db")
+        self.clock = Clock(1000.0)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _cache(self, **kwargs):
+        options = dict(db_path=self.db_path, sites={"say"}, ttl=60, max_entries=8, variants=1, clock=self.clock)
+        options.update(kwargs)
+        cache = ResponseCache(**options)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_key_normalization(self):
+        shouty = [
+            {"role": "system", "content": "You are  Judy,\na Techie. "},
+            {"role": "user", "content": "GOT ANY WORK?"},
+        ]
+        self.assertEqual(cache_key(MESSAGES, "ollama/a"), cache_key(shouty, "ollama/a"))
+        self.assertNotEqual(cache_key(MESSAGES, "ollama/a"), cache_key(MESSAGES, "ollama/b"))
+        swapped = [dict(MESSAGES[0], role="user"), MESSAGES[1]]
+        self.assertNotEqual(cache_key(MESSAGES, "ollama/a"), cache_key(swapped, "ollama/a"))
+
+    def test_hit_miss_and_counters(self):
+        cache = self._cache()
+        self.assertIsNone(cache.get("k"))
+        cache.put("k", "m", "Preem.", 2.5)
+        self.assertEqual(cache.get("k"), "Preem.")
+        self.assertEqual(cache.stats.hits, 1)
+        self.assertEqual(cache.stats.misses, 1)
+        self.assertEqual(cache.stats.hit_rate, 0.5)
+        self.assertEqual(cache.stats.saved_seconds, 2.5)
+        self.assertEqual(cache.stats.snapshot()["memory_hits"], 1)
+
+    def test_ttl_and_lru(self):
+        cache = self._cache(max_entries=2)
+        cache.put("a", "m", "A", 1.0)
+        cache.put("b", "m", "B", 1.0)
+        cache.get("a")  # "b" is now least recently used
+        cache.put("c", "m", "C", 1.0)
+        self.assertEqual(list(cache._memory), ["a", "c"])
+        # Evicted from memory, still on disk
+        self.assertEqual(cache.get("b"), "B")
+        self.assertEqual(cache.stats.disk_hits, 1)
+
+        self.clock.now += 61
+        self.assertIsNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+
+    def test_variants(self):
+        cache = self._cache(variants=3)
+        for reply in ("One.", "Two.", "Three."):
+            self.assertIsNone(cache.get("k"), "Misses until every variant is collected")
+            cache.put("k", "m", reply, 1.0)
+        seen = {cache.get("k") for _ in range(200)}
+        self.assertEqual(seen, {"One.", "Two.", "Three."})
+        cache.put("k", "m", "Four.", 1.0)
+        self.assertNotIn("Four.", {cache.get("k") for _ in range(200)})
+
+    def test_persists_across_restarts(self):
+        self._cache().put("k", "m", "Still here.", 3.0)
+        cache = self._cache()
+        self.assertEqual(cache.get("k"), "Still here.")
+        self.assertEqual(cache.stats.disk_hits, 1)
+        self.assertEqual(cache.stats.saved_seconds, 3.0)
+
+    def test_async_lookups_use_the_shared_store(self):
+        async def scenario():
+            cache = self._cache()
+            statements = []
+            cache.connection.set_trace_callback(statements.append)
+            self.assertIsNone(await cache.get_async("k"))
+            await cache.put_async("k", "m", "Preem.", 2.5)
+            cache._memory.clear()
+            self.assertEqual(await cache.get_async("k"), "Preem.")
+            self.assertEqual(statements, [])  # Not on the event loop's thread
+            self.assertEqual(cache.store.writes, 1)
+
+            self.clock.now += 61
+            cache._memory.clear()
+            self.assertIsNone(await cache.get_async("k"))  # Expired rows are skipped, not deleted
+            self.assertEqual(cache.store.writes, 1)
+            await cache.put_async("k", "m", "Fresh.", 1.0)
+            rows = await cache.store.read(lambda conn: conn.execute("SELECT response FROM llm_cache").fetchall())
+            self.assertEqual([row[0] for row in rows], ["Fresh."])
+
+        asyncio.run(scenario())
+
+    def test_call_site_opt_in(self):
+        async def scenario():
+            async with FakeOllamaServer(reply="Eddies up front.") as server:
+                backend = OllamaBackend(host=server.url, model="fake")
+                cache = self._cache()
+                service = AIService(cache)
+
+                for _ in range(3):
+                    self.assertEqual(await service.reply(backend, "say", MESSAGES), "Eddies up front.")
+                self.assertEqual(len(server.requests), 1)
+
+                # "thought" did not opt in: every call reaches the model
+                for _ in range(2):
+                    await service.reply(backend, "thought", MESSAGES)
+                self.assertEqual(len(server.requests), 3)
+
+                streamed = [c async for c in service.stream(backend, "say", MESSAGES)]
+                self.assertEqual(streamed, ["Eddies up front."])
+                self.assertEqual(len(server.requests), 3)
+                self.assertEqual(cache.stats.hits, 3)
+                self.assertGreater(cache.stats.saved_seconds, 0)
+
+        asyncio.run(scenario())
+
+    def test_stream_caches_complete_replies_only(self):
+        async def scenario():
+            async with FakeOllamaServer(reply="Eddies first, then talk.") as server:
+                backend = OllamaBackend(host=server.url, model="fake")
+                cache = self._cache()
+                service = AIService(cache)
+
+                stream = service.stream(backend, "say", MESSAGES)
+                await anext(stream)
+                await stream.aclose()  # Player left mid-reply
+                self.assertIsNone(cache.get(cache_key(MESSAGES, backend.model_name)))
+
+                chunks = [c async for c in service.stream(backend, "say", MESSAGES)]
+                self.assertGreater(len(chunks), 1)
+                self.assertEqual(
+                    cache.get(cache_key(MESSAGES, backend.model_name)), "Eddies first, then talk."
+                )
+
+        asyncio.run(scenario())
+
+
+if __name__ == '__main__':
+    unittest.main()
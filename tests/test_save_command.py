@@ -50,14 +50,16 @@ class TestSaveCommand(unittest.TestCase):
             am = ActionManager(self.mock_deps)
             
             # Setup DB return
-            self.mock_deps.world.db.save_player.return_value = True
+            uow = self.mock_deps.world.db.unit_of_work.return_value
+            uow.commit_async = AsyncMock(return_value=True)
             
             # Run Async Method
             asyncio.run(am.do_save(""))
             
             # Verify save_player called with correct structure
-            self.mock_deps.world.db.save_player.assert_called_once()
-            call_args = self.mock_deps.world.db.save_player.call_args[0]
+            uow.save_player.assert_called_once()
+            uow.commit_async.assert_awaited_once()
+            call_args = uow.save_player.call_args[0]
             
             handle, loc, full_stats, inv_ids, equip_ids = call_args
             
@@ -82,6 +84,8 @@ class TestSaveCommand(unittest.TestCase):
             
             self.mock_deps.io.send.assert_called_with("No character loaded to save.")
             self.mock_deps.world.db.save_player.assert_not_called()
+            self.mock_deps.world.db.save_player_async.assert_not_called()
+            self.mock_deps.world.db.unit_of_work.assert_not_called()
 
 if __name__ == '__main__':
     unittest.main()
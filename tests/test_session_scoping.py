@@ -0,0 +1,99 @@
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+# Adjust path to import NeonCore modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from NeonCore.core.dependencies import GameDependencies
+from NeonCore.core.session import SessionContext
+from NeonCore.game_mechanics.skill_check import SkillCheckCommand
+from NeonCore.managers.action_manager import ActionManager
+from NeonCore.managers.database_manager import DatabaseManager
+from NeonCore.managers.story_manager import StoryManager
+from tests.helpers import ScriptedIO
+
+SESSIONS = 200
+HANDLES = ["Forty", "Mover", "Torch", "Redtail"]
+
+
+class TestSessionScoping(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "sessions.db")
+        patcher = patch.object(ActionManager, "select_available_backend", lambda self: None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_singletons_are_per_session(self):
+        a = GameDependencies.initialize_game(io=ScriptedIO([]), db_path=self.db_path)
+        b = GameDependencies.initialize_game(io=ScriptedIO([]), db_path=self.db_path)
+
+        deps_a, deps_b = a.dependencies, b.dependencies
+        self.assertIsNot(deps_a.story_manager, deps_b.story_manager)
+        self.assertIsNot(deps_a.skill_check, deps_b.skill_check)
+        self.assertIsNot(deps_a.db, deps_b.db)
+        self.assertIs(deps_a.world.db, deps_a.db)
+
+        # Inside a session, constructors resolve that session's instance
+        with deps_a.session:
+            self.assertIs(StoryManager(), deps_a.story_manager)
+            self.assertIs(SkillCheckCommand(), deps_a.skill_check)
+            self.assertIs(DatabaseManager(), deps_a.db)
+
+        # Outside a session nothing leaks
+        self.assertIsNone(SessionContext.current())
+        self.assertIsNot(StoryManager(), deps_a.story_manager)
+
+        for deps in (deps_a, deps_b):
+            deps.session.close()
+            self.assertIsNone(deps.db.connection)
+
+    def test_concurrent_sessions_do_not_cross_talk(self):
+        """Run many scripted players at once on one event loop."""
+
+        async def play(i):
+            answers = i % 2 == 0
+            script = [f"choose {HANDLES[i % len(HANDLES)]}"]
+            if answers:
+                script.append("use_object burner")
+            script.append("quit")
+
+            io = ScriptedIO(script)
+            am = GameDependencies.initialize_game(io=io, db_path=self.db_path)
+            await am.cmdloop()
+            return am, answers
+
+        async def run_all():
+            return await asyncio.gather(*(play(i) for i in range(SESSIONS)))
+
+        results = asyncio.run(run_all())
+
+        story_managers = {id(am.dependencies.story_manager) for am, _ in results}
+        skill_checks = {id(am.dependencies.skill_check) for am, _ in results}
+        dbs = {id(am.dependencies.db) for am, _ in results}
+        self.assertEqual(len(story_managers), SESSIONS)
+        self.assertEqual(len(skill_checks), SESSIONS)
+        self.assertEqual(len(dbs), SESSIONS)
+
+        for am, answered in results:
+            deps = am.dependencies
+            story = deps.story_manager.current_story
+            self.assertIsNotNone(story)
+            # The story object belongs to this session's manager
+            self.assertIs(story, deps.story_manager.available_stories[story.name])
+            self.assertIs(deps.story_manager._dependencies, deps)
+            self.assertIs(deps.skill_check.char_mngr, deps.char_mngr)
+            expected = "in_call" if answered else "ringing"
+            self.assertEqual(deps.story_manager.available_stories["phone_call"].state, expected)
+            deps.session.close()
+
+
+if __name__ == '__main__':
+    unittest.main()